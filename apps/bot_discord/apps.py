@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BotDiscordConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bot_discord'
+
+    def ready(self):
+        from apps.comun.infrastructure.version_datos import registrar_dominio
+        from .infrastructure.models import DOMINIO_VERSION, MetricasGlobalesBot, EstadoBot, ServidoresBot
+
+        # Cualquier escritura invalida los ETag de las vistas del bot
+        registrar_dominio(DOMINIO_VERSION, MetricasGlobalesBot, EstadoBot, ServidoresBot)
@@ -1,5 +1,9 @@
 from django.db import models
 
+
+# Dominio de versión de datos (ETag) de las vistas del bot
+DOMINIO_VERSION = "bot"
+
 class MetricasGlobalesBot(models.Model):
     servidores_conectados = models.IntegerField(default=0)
     eventos_procesados_hoy = models.IntegerField(default=0)
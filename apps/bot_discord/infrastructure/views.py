@@ -2,6 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
+from django.utils.decorators import method_decorator
 from rest_framework.permissions import BasePermission
 from .serializers import MetricasPayloadSerializer, StatusUpdateSerializer
 from channels.layers import get_channel_layer
@@ -22,6 +23,8 @@ from .django_orm_repository import (
     DjangoORMBotEstadoRepository,
     DjangoORMServerMetricasRepository,
 )
+from .models import DOMINIO_VERSION
+from apps.comun.infrastructure.version_datos import respuesta_condicional
 
 class BotAuthentication(BasePermission):
     def has_permission(self, request, view):
@@ -73,6 +76,7 @@ class MetricasBotView(APIView):
             return Response({"message": "Métricas recibidas y emitidas"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@method_decorator(respuesta_condicional(DOMINIO_VERSION), name='get')
 class ResumenBotView(APIView):
     def get(self, request):
         metricas_repo = DjangoORMBotMetricasRepository()
@@ -88,6 +92,7 @@ class ResumenBotView(APIView):
             return Response(data)
         return Response({}, status=status.HTTP_404_NOT_FOUND)
 
+@method_decorator(respuesta_condicional(DOMINIO_VERSION), name='get')
 class EstadoBotView(APIView):
     def get(self, request):
         estado_repo = DjangoORMBotEstadoRepository()
@@ -103,6 +108,7 @@ class EstadoBotView(APIView):
             return Response(data)
         return Response({}, status=status.HTTP_404_NOT_FOUND)
 
+@method_decorator(respuesta_condicional(DOMINIO_VERSION), name='get')
 class ServidoresBotView(APIView):
     def get(self, request):
         server_repo = DjangoORMServerMetricasRepository()
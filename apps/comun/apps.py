@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ComunConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.comun'
+
+    def ready(self):
+        # Los modelos viven en infrastructure/
+        from .infrastructure import models  # noqa: F401
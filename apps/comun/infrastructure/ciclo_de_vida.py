@@ -0,0 +1,26 @@
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+
+def cerrar_conexiones() -> None:
+    """
+    Cierra las conexiones a la base de datos y, en los motores con pool propio
+    (PostgreSQL con OPTIONS['pool']), el pool compartido por todas las solicitudes
+    """
+    for conexion in connections.all():
+        conexion.close()
+        cerrar_pool = getattr(conexion, 'close_pool', None)
+        if cerrar_pool is not None:
+            cerrar_pool()
+
+
+async def lifespan(scope, receive, send):
+    """Aplicación ASGI para el protocolo lifespan: cierra las conexiones al apagar el servidor"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await sync_to_async(cerrar_conexiones)()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class VersionDatos(models.Model):
+    """Contador de versión por dominio; se incrementa en cada escritura del dominio"""
+    dominio = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "version_datos"
+
+    def __str__(self):
+        return f"{self.dominio} v{self.version}"
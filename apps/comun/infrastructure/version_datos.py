@@ -0,0 +1,118 @@
+import asyncio
+from functools import wraps
+from typing import Dict, Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .models import VersionDatos as VersionDatosModel
+
+
+def _incrementar(dominio: str) -> None:
+    if VersionDatosModel.objects.filter(dominio=dominio).update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic():
+            VersionDatosModel.objects.create(dominio=dominio, version=1)
+    except IntegrityError:
+        # Otro proceso creó la fila en paralelo
+        VersionDatosModel.objects.filter(dominio=dominio).update(version=F('version') + 1)
+
+
+def incrementar_version(dominio: str) -> None:
+    """
+    Incrementa la versión del dominio al confirmar la transacción en curso
+    (o de inmediato si no hay transacción), sin bloquear la fila durante la escritura
+    """
+    def incrementar():
+        try:
+            _incrementar(dominio)
+        except OperationalError:
+            pass
+    transaction.on_commit(incrementar)
+
+
+def obtener_versiones(dominios: Iterable[str]) -> Optional[Dict[str, int]]:
+    """Versiones actuales de los dominios en una consulta; None si la tabla no existe"""
+    dominios = tuple(dominios)
+    try:
+        versiones = dict(
+            VersionDatosModel.objects.filter(dominio__in=dominios).values_list('dominio', 'version')
+        )
+    except OperationalError:
+        return None
+    return {dominio: versiones.get(dominio, 0) for dominio in dominios}
+
+
+def registrar_dominio(dominio: str, *modelos) -> None:
+    """Incrementa la versión del dominio en cada guardado o borrado de los modelos indicados"""
+    def receptor(sender, **kwargs):
+        incrementar_version(dominio)
+
+    for modelo in modelos:
+        uid = f"version_datos:{dominio}:{modelo._meta.label}"
+        post_save.connect(receptor, sender=modelo, weak=False, dispatch_uid=uid)
+        post_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=uid)
+
+
+def calcular_etag(versiones: Dict[str, int], ventana: Optional[int] = None) -> str:
+    """
+    ETag débil a partir de las versiones y la fecha local (los datos "de hoy"
+    cambian a medianoche sin escrituras). Con `ventana` (segundos) la respuesta
+    además caduca cada ventana, para vistas que muestran tiempos relativos.
+    """
+    partes = [f"{dominio}.{version}" for dominio, version in sorted(versiones.items())]
+    partes.append(timezone.localdate().isoformat())
+    if ventana:
+        partes.append(str(int(timezone.now().timestamp()) // ventana))
+    return 'W/' + quote_etag('-'.join(partes))
+
+
+def _respuesta_304(request, versiones, ventana):
+    if versiones is None:
+        return None, None
+    etag = calcular_etag(versiones, ventana)
+    return etag, get_conditional_response(request, etag=etag)
+
+
+def _agregar_etag(response, etag):
+    if etag and response.status_code == 200 and not response.has_header('ETag'):
+        response['ETag'] = etag
+    return response
+
+
+def respuesta_condicional(*dominios: str, ventana: Optional[int] = None):
+    """
+    Decorador para vistas GET (síncronas o asíncronas): calcula el ETag desde la
+    versión de los dominios y responde 304 Not Modified si coincide con
+    If-None-Match, sin ejecutar la vista. Para métodos de APIView usar
+    method_decorator(respuesta_condicional(...), name='get').
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+                versiones = await sync_to_async(obtener_versiones)(dominios)
+                etag, no_modificado = _respuesta_304(request, versiones, ventana)
+                if no_modificado is not None:
+                    return no_modificado
+                return _agregar_etag(await view_func(request, *args, **kwargs), etag)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            etag, no_modificado = _respuesta_304(request, obtener_versiones(dominios), ventana)
+            if no_modificado is not None:
+                return no_modificado
+            return _agregar_etag(view_func(request, *args, **kwargs), etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,69 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from apps.comun.infrastructure import ciclo_de_vida
+from apps.comun.infrastructure.models import VersionDatos
+from apps.comun.infrastructure.version_datos import (
+    incrementar_version,
+    obtener_versiones,
+    respuesta_condicional
+)
+
+
+class VersionDatosTest(TestCase):
+
+    def test_incrementa_al_confirmar(self):
+        self.assertEqual(obtener_versiones(['prueba']), {'prueba': 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            incrementar_version('prueba')
+            incrementar_version('prueba')
+        self.assertEqual(VersionDatos.objects.get(dominio='prueba').version, 2)
+
+    def test_decorador_responde_304_sin_ejecutar_la_vista(self):
+        llamadas = []
+
+        @respuesta_condicional('prueba')
+        def vista(request):
+            llamadas.append(request)
+            return JsonResponse({"ok": True})
+
+        factory = RequestFactory()
+        etag = vista(factory.get('/'))['ETag']
+        response = vista(factory.get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(llamadas), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            incrementar_version('prueba')
+        response = vista(factory.get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(llamadas), 2)
+
+
+class CicloDeVidaTest(SimpleTestCase):
+
+    def test_apagado_cierra_conexiones_y_pool(self):
+        sin_pool = mock.Mock(spec=['close'])
+        con_pool = mock.Mock(spec=['close', 'close_pool'])
+        mensajes = asyncio.Queue()
+        enviados = []
+
+        async def enviar(mensaje):
+            enviados.append(mensaje['type'])
+
+        async def ciclo():
+            for tipo in ('lifespan.startup', 'lifespan.shutdown'):
+                mensajes.put_nowait({'type': tipo})
+            await ciclo_de_vida.lifespan({'type': 'lifespan'}, mensajes.get, enviar)
+
+        with mock.patch.object(ciclo_de_vida.connections, 'all', return_value=[sin_pool, con_pool]):
+            async_to_sync(ciclo)()
+
+        self.assertEqual(enviados, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        sin_pool.close.assert_called_once_with()
+        con_pool.close.assert_called_once_with()
+        con_pool.close_pool.assert_called_once_with()
@@ -1,5 +1,5 @@
-from typing import List, Dict, Optional
-from datetime import date, time
+from typing import Iterable, List, Dict, Optional, Tuple
+from datetime import date, time, timedelta
 from django.utils import timezone
 
 from ..domain.entities import (
@@ -8,7 +8,9 @@ from ..domain.entities import (
     AsistenciaRecuperacion,
     EstadoAsistenciaEnum,
     DiaSemanaEnum,
-    EstadoRecuperacionEnum
+    EstadoRecuperacionEnum,
+    ESTADOS_ASISTENCIA,
+    MAX_TICKETS_MES
 )
 from ..domain.repositories import (
     EstadoAsistenciaRepository,
@@ -48,39 +50,62 @@ class ResumenPuntualidadService:
         }
         dia_hoy = dias_semana.get(fecha.weekday())
         
-        # Obtener estados
-        estado_presente = self.estado_repo.get_or_create(EstadoAsistenciaEnum.PRESENTE)
-        estado_tardanza = self.estado_repo.get_or_create(EstadoAsistenciaEnum.TARDANZA)
-        estado_ausente_just = self.estado_repo.get_or_create(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
-        estado_ausente_sin = self.estado_repo.get_or_create(EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
-        
-        # Contar asistencias por estado
-        presentes = self.asistencia_repo.count_by_estado_and_fecha(EstadoAsistenciaEnum.PRESENTE, fecha)
-        tardanzas = self.asistencia_repo.count_by_estado_and_fecha(EstadoAsistenciaEnum.TARDANZA, fecha)
-        ausentes_justificados = self.asistencia_repo.count_by_estado_and_fecha(
-            EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, fecha
-        )
-        ausentes_sin_justificar = self.asistencia_repo.count_by_estado_and_fecha(
-            EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR, fecha
-        )
-        
-        # Obtener practicantes con clases hoy
-        if dia_hoy:
-            horarios_hoy = self.horario_repo.get_by_dia(dia_hoy)
-            con_clases = len(horarios_hoy)
-        else:
-            con_clases = 0
+        # Todos los conteos de la tarjeta en una sola consulta
+        resumen = self.asistencia_repo.get_resumen_fecha(fecha, dia_hoy)
         
-        total_deben_asistir = con_clases  # Simplificado, debería incluir practicantes activos
+        con_clases = resumen["con_clases"]
+        total_deben_asistir = resumen["activos_sin_clases"] + con_clases
         
         return {
-            "asistencias": presentes,
-            "tardanzas": tardanzas,
-            "faltas": ausentes_justificados + ausentes_sin_justificar,
+            "asistencias": resumen["presentes"],
+            "tardanzas": resumen["tardanzas"],
+            "faltas": resumen["ausentes_justificados"] + resumen["ausentes_sin_justificar"],
             "total": total_deben_asistir,
             "con_clases": con_clases,
-            "ausentes_justificados": ausentes_justificados,
-            "ausentes_sin_justificar": ausentes_sin_justificar
+            "ausentes_justificados": resumen["ausentes_justificados"],
+            "ausentes_sin_justificar": resumen["ausentes_sin_justificar"]
+        }
+
+
+MAX_DIAS_MATRIZ = 93
+CODIGO_SIN_REGISTRO = 0
+
+
+class MatrizAsistenciaService:
+    """
+    Servicio para obtener la matriz practicante x día de un rango en formato columnar:
+    listas de practicantes y fechas más un arreglo denso de códigos de estado
+    (fila por practicante), leído con una sola consulta de rango
+    """
+    
+    def __init__(self, asistencia_repo: AsistenciaRepository):
+        self.asistencia_repo = asistencia_repo
+    
+    def execute(self, fecha_inicio: date, fecha_fin: date, practicante_ids: Iterable[int] = ()) -> Dict:
+        """Ejecuta el caso de uso; `practicante_ids` agrega filas aunque no tengan registros"""
+        if fecha_fin < fecha_inicio:
+            raise ValueError("La fecha inicial no puede ser posterior a la fecha final")
+        dias = (fecha_fin - fecha_inicio).days + 1
+        if dias > MAX_DIAS_MATRIZ:
+            raise ValueError(f"El rango no puede superar {MAX_DIAS_MATRIZ} días")
+        
+        lote = self.asistencia_repo.get_batch_by_rango(fecha_inicio, fecha_fin)
+        practicantes = sorted(set(practicante_ids) | set(lote.practicante_ids))
+        fila_de = {practicante_id: fila for fila, practicante_id in enumerate(practicantes)}
+        
+        # codigos[fila * dias + columna]; 0 = sin registro, 1.. = ESTADOS_ASISTENCIA
+        codigos = bytearray(len(practicantes) * dias)
+        inicio = fecha_inicio.toordinal()
+        for practicante_id, fecha, estado in zip(lote.practicante_ids, lote.fechas, lote.estados):
+            codigos[fila_de[practicante_id] * dias + fecha - inicio] = estado + 1
+        
+        return {
+            "desde": fecha_inicio.isoformat(),
+            "hasta": fecha_fin.isoformat(),
+            "practicantes": practicantes,
+            "fechas": [(fecha_inicio + timedelta(days=i)).isoformat() for i in range(dias)],
+            "estados": [None] + [estado.value for estado in ESTADOS_ASISTENCIA],
+            "codigos": list(codigos)
         }
 
 
@@ -105,8 +130,8 @@ class AlertasPuntualidadService:
         alertas = []
         
         # Alerta 1: Tardanzas
-        asistencias_fecha = self.asistencia_repo.get_by_fecha(fecha)
-        tardanzas = [a for a in asistencias_fecha if a.es_tardanza()]
+        asistencias_fecha = self.asistencia_repo.get_batch_by_rango(fecha, fecha)
+        tardanzas = asistencias_fecha.practicantes_con_estado(EstadoAsistenciaEnum.TARDANZA)
         
         if tardanzas:
             alertas.append({
@@ -115,11 +140,11 @@ class AlertasPuntualidadService:
                 "cantidad": len(tardanzas),
                 "hora": "8:05 a.m.",
                 "descripcion": "Gracia de 5 minutos aplicada",
-                "practicantes": [f"{t.practicante_id}" for t in tardanzas[:5]]
+                "practicantes": [f"{practicante_id}" for practicante_id in tardanzas[:5]]
             })
         
         # Alerta 2: Ausencias sin clase
-        ausentes = [a for a in asistencias_fecha if a.estado == EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR]
+        ausentes = asistencias_fecha.practicantes_con_estado(EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
         
         if ausentes:
             alertas.append({
@@ -128,7 +153,7 @@ class AlertasPuntualidadService:
                 "cantidad": len(ausentes),
                 "hora": "8:30 a.m.",
                 "descripcion": "No tienen clases programadas hoy",
-                "practicantes": [f"{a.practicante_id}" for a in ausentes[:5]]
+                "practicantes": [f"{practicante_id}" for practicante_id in ausentes[:5]]
             })
         
         # Alerta 3: Practicantes en riesgo
@@ -156,18 +181,10 @@ class CrearJustificacionService:
         motivo: str,
         ticket_id: Optional[str] = None
     ) -> Dict:
-        """Ejecuta el caso de uso de crear justificación"""
-        # Validar límite de tickets (máximo 3 por mes)
-        hoy = timezone.now().date()
-        inicio_mes = hoy.replace(day=1)
-        
-        tickets_mes = self.asistencia_repo.count_tickets_mes(
-            practicante_id, inicio_mes, hoy
-        )
-        
-        if tickets_mes >= 3:
-            raise ValueError(f"Límite de tickets alcanzado. Ya has usado {tickets_mes}/3 tickets este mes.")
-        
+        """
+        Ejecuta el caso de uso de crear justificación. El límite de tickets del
+        mes se valida al guardar (lanza CupoTicketsAgotado, subclase de ValueError)
+        """
         # Verificar si ya existe asistencia para esta fecha
         asistencia_existente = self.asistencia_repo.get_by_practicante_and_fecha(
             practicante_id, fecha
@@ -183,7 +200,7 @@ class CrearJustificacionService:
             # Actualizar existente
             asistencia_existente.estado = EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO
             asistencia_existente.motivo = motivo_final
-            asistencia = self.asistencia_repo.save(asistencia_existente)
+            asistencia, tickets_mes = self.asistencia_repo.save_justificacion(asistencia_existente)
         else:
             # Crear nueva
             nueva_asistencia = Asistencia(
@@ -192,17 +209,68 @@ class CrearJustificacionService:
                 estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
                 motivo=motivo_final
             )
-            asistencia = self.asistencia_repo.save(nueva_asistencia)
+            asistencia, tickets_mes = self.asistencia_repo.save_justificacion(nueva_asistencia)
         
         return {
             "mensaje": "Justificación creada exitosamente",
             "id": asistencia.id,
-            "tickets_mes": tickets_mes + 1,
-            "tickets_max": 3,
+            "tickets_mes": tickets_mes,
+            "tickets_max": MAX_TICKETS_MES,
             "sla_horas": 24
         }
 
 
+class RegistrarAsistenciasMasivoService:
+    """Servicio para registrar varias asistencias (check-ins) en una sola operación"""
+    
+    def __init__(self, asistencia_repo: AsistenciaRepository):
+        self.asistencia_repo = asistencia_repo
+    
+    def execute(self, asistencias: List[Asistencia]) -> List[Dict]:
+        """
+        Inserta o actualiza las asistencias en una transacción y retorna un
+        resultado por cada elemento, en el mismo orden de entrada
+        """
+        # Si un practicante aparece varias veces para la misma fecha, gana el último
+        ultimo_por_par = {}
+        for indice, asistencia in enumerate(asistencias):
+            ultimo_por_par[(asistencia.practicante_id, asistencia.fecha)] = indice
+        
+        unicas = [asistencias[indice] for indice in sorted(ultimo_por_par.values())]
+        guardadas = {
+            (guardada.practicante_id, guardada.fecha): (guardada, creada)
+            for guardada, creada in self.asistencia_repo.save_many(unicas)
+        }
+        
+        resultados = []
+        for indice, asistencia in enumerate(asistencias):
+            par = (asistencia.practicante_id, asistencia.fecha)
+            resultado = {
+                "practicante_id": asistencia.practicante_id,
+                "fecha": asistencia.fecha.isoformat()
+            }
+            if ultimo_por_par[par] != indice:
+                resultado["resultado"] = "omitido"
+                resultado["detalle"] = "Registro duplicado en el lote; se aplicó el último"
+            else:
+                guardada, creada = guardadas[par]
+                resultado["id"] = guardada.id
+                resultado["resultado"] = "creado" if creada else "actualizado"
+            resultados.append(resultado)
+        
+        return resultados
+
+
+def _resultado_lote(estado: str, asistencia_ids: List[int], actualizadas: List[int], omitidas: List[int]) -> Dict:
+    procesadas = set(actualizadas) | set(omitidas)
+    return {
+        "estado": estado,
+        "actualizadas": actualizadas,
+        "omitidas": omitidas,  # existen pero no son justificaciones
+        "no_encontradas": sorted(set(asistencia_ids) - procesadas)
+    }
+
+
 class AprobarJustificacionService:
     """Servicio para aprobar una justificación"""
     
@@ -231,6 +299,13 @@ class AprobarJustificacionService:
             "id": asistencia.id,
             "estado": "aprobado"
         }
+    
+    def execute_lote(self, asistencia_ids: List[int]) -> Dict:
+        """Aprueba varias justificaciones en una sola escritura"""
+        actualizadas, omitidas = self.asistencia_repo.aprobar_justificaciones(
+            asistencia_ids, timezone.now().time()
+        )
+        return _resultado_lote("aprobado", asistencia_ids, actualizadas, omitidas)
 
 
 class RechazarJustificacionService:
@@ -265,6 +340,16 @@ class RechazarJustificacionService:
             "estado": "rechazado",
             "motivo_rechazo": motivo_rechazo
         }
+    
+    def execute_lote(self, asistencia_ids: List[int], motivo_rechazo: str) -> Dict:
+        """Rechaza varias justificaciones en una sola escritura"""
+        if not motivo_rechazo or not motivo_rechazo.strip():
+            raise ValueError("El motivo de rechazo es requerido")
+        
+        actualizadas, omitidas = self.asistencia_repo.rechazar_justificaciones(
+            asistencia_ids, motivo_rechazo.strip()
+        )
+        return _resultado_lote("rechazado", asistencia_ids, actualizadas, omitidas)
 
 
 class ListarJustificacionesService:
@@ -281,15 +366,41 @@ class ListarJustificacionesService:
             fecha_fin = hoy
         
         justificaciones = self.asistencia_repo.get_justificadas(fecha_inicio, fecha_fin)
+        return self._to_response(justificaciones, fecha_inicio, fecha_fin)
+    
+    def execute_pagina(
+        self,
+        fecha_inicio: Optional[date] = None,
+        fecha_fin: Optional[date] = None,
+        limite: int = 50,
+        cursor: Optional[Tuple[date, int]] = None
+    ) -> Dict:
+        """
+        Lista una página de justificaciones con paginación por cursor (fecha, id).
+        El costo depende del tamaño de página, no del historial almacenado.
+        """
+        justificaciones, siguiente = self.asistencia_repo.get_justificadas_paginadas(
+            fecha_inicio, fecha_fin, limite, cursor
+        )
+        
+        hoy = timezone.now().date()
+        return {
+            "results": self._to_response(justificaciones, hoy.replace(day=1), hoy),
+            "next": siguiente
+        }
+    
+    def _to_response(self, justificaciones: List[Asistencia], fecha_inicio: date, fecha_fin: date) -> List[Dict]:
+        """Convierte las justificaciones a formato de respuesta"""
+        # Tickets del mes de todos los practicantes de la página en una sola consulta
+        tickets_por_practicante = self.asistencia_repo.count_tickets_by_practicante(
+            {just.practicante_id for just in justificaciones},
+            fecha_inicio.replace(day=1),
+            fecha_fin
+        )
         
-        # Convertir a formato de respuesta
         data = []
         for just in justificaciones:
-            # Calcular tickets del mes para este practicante
-            inicio_mes = fecha_inicio.replace(day=1)
-            tickets_mes = self.asistencia_repo.count_tickets_mes(
-                just.practicante_id, inicio_mes, fecha_fin
-            )
+            tickets_mes = tickets_por_practicante.get(just.practicante_id, 0)
             
             # Determinar estado
             estado_just = 'pendiente'
@@ -315,7 +426,7 @@ class ListarJustificacionesService:
                 "motivo": just.motivo,
                 "estado": estado_just,
                 "tickets_mes": tickets_mes,
-                "tickets_max": 3,
+                "tickets_max": MAX_TICKETS_MES,
                 "sla_restante": sla_restante
             })
         
@@ -3,3 +3,18 @@ from django.apps import AppConfig
 class PuntualidadConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.puntualidad'
+
+    def ready(self):
+        # Registra las señales del registro de estados, del índice de horarios,
+        # del resumen diario, del cupo de tickets y de los eventos en tiempo real
+        from .infrastructure import (  # noqa: F401
+            estado_registry, horario_indice, resumen_diario, cupo_tickets, tiempo_real
+        )
+        from apps.comun.infrastructure.version_datos import registrar_dominio
+        from apps.practicantes.infrastructure.models import Practicante
+        from .infrastructure.models import (
+            DOMINIO_VERSION, Asistencia, AsistenciaRecuperacion, HorarioClases
+        )
+
+        # Cualquier escritura invalida los ETag de las vistas de puntualidad
+        registrar_dominio(DOMINIO_VERSION, Asistencia, AsistenciaRecuperacion, HorarioClases, Practicante)
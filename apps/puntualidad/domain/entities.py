@@ -1,7 +1,9 @@
+import re
+from array import array
 from dataclasses import dataclass
 from datetime import date, time
 from enum import Enum
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 
 
 class EstadoAsistenciaEnum(Enum):
@@ -31,7 +33,7 @@ class EstadoRecuperacionEnum(Enum):
     CANCELADO = "Cancelado"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EstadoAsistencia:
     """Entidad de dominio que representa un estado de asistencia"""
     id: Optional[int] = None
@@ -41,7 +43,7 @@ class EstadoAsistencia:
         return self.estado.value
 
 
-@dataclass
+@dataclass(slots=True)
 class HorarioClases:
     """Entidad de dominio que representa el horario de clases de un practicante"""
     practicante_id: int
@@ -54,7 +56,55 @@ class HorarioClases:
         return self.dia_clase == dia_actual
 
 
-@dataclass
+TICKET_PATTERN = re.compile(r'TKT-?\d+', re.IGNORECASE)
+
+
+def extraer_ticket_id(motivo: Optional[str]) -> Optional[str]:
+    """Extrae el ID de ticket (TKT-123) del motivo de una justificación"""
+    if not motivo:
+        return None
+    ticket_match = TICKET_PATTERN.search(motivo)
+    return ticket_match.group(0).upper() if ticket_match else None
+
+
+# Prefijo que el rechazo agrega al motivo: " [RECHAZADO: razón]"
+MARCA_RECHAZO = '[RECHAZADO'
+
+
+def motivo_rechazado(motivo: Optional[str]) -> bool:
+    """Verifica si el motivo de una justificación lleva la marca de rechazo"""
+    return bool(motivo) and MARCA_RECHAZO in motivo
+
+
+MAX_TICKETS_MES = 3
+
+MAX_MINUTOS_RECUPERACION = 12 * 60
+
+
+def calcular_duracion_minutos(hora_entrada: Optional[time], hora_salida: Optional[time]) -> int:
+    """Minutos completos entre entrada y salida del mismo día (0 si falta una o no es positiva, máximo 12 horas)"""
+    if not hora_entrada or not hora_salida:
+        return 0
+    segundos = (
+        (hora_salida.hour - hora_entrada.hour) * 3600
+        + (hora_salida.minute - hora_entrada.minute) * 60
+        + (hora_salida.second - hora_entrada.second)
+    )
+    if segundos <= 0:
+        return 0
+    return min(segundos // 60, MAX_MINUTOS_RECUPERACION)
+
+
+class CupoTicketsAgotado(ValueError):
+    """El practicante ya usó todos los tickets del mes"""
+
+    def __init__(self, usados: int, maximo: int = MAX_TICKETS_MES):
+        self.usados = usados
+        self.maximo = maximo
+        super().__init__(f"Límite de tickets alcanzado. Ya has usado {usados}/{maximo} tickets este mes.")
+
+
+@dataclass(slots=True)
 class Asistencia:
     """Entidad de dominio que representa un registro de asistencia"""
     practicante_id: int
@@ -63,6 +113,7 @@ class Asistencia:
     hora_entrada: Optional[time] = None
     hora_salida: Optional[time] = None
     motivo: Optional[str] = None
+    ticket_id: Optional[str] = None
     id: Optional[int] = None
 
     def es_justificada(self) -> bool:
@@ -81,8 +132,12 @@ class Asistencia:
         """Verifica si tiene motivo (ticket)"""
         return bool(self.motivo and self.motivo.strip())
 
+    def ocupa_ticket(self) -> bool:
+        """Verifica si consume un ticket del mes (justificada, con motivo y sin rechazar)"""
+        return self.es_justificada() and self.tiene_motivo() and not motivo_rechazado(self.motivo)
 
-@dataclass
+
+@dataclass(slots=True)
 class AsistenciaRecuperacion:
     """Entidad de dominio que representa una recuperación de horas"""
     asistencia_id: int
@@ -90,25 +145,73 @@ class AsistenciaRecuperacion:
     estado: EstadoRecuperacionEnum = EstadoRecuperacionEnum.PENDIENTE
     hora_entrada: Optional[time] = None
     hora_salida: Optional[time] = None
+    duracion_minutos: Optional[int] = None  # Persistida al guardar; None si aún no se guardó
     id: Optional[int] = None
 
     def calcular_horas_completadas(self) -> float:
-        """Calcula las horas completadas basándose en entrada y salida"""
-        if not self.hora_entrada or not self.hora_salida:
-            return 0.0
-        
-        from datetime import datetime, timedelta
-        entrada = datetime.combine(self.fecha_recuperacion, self.hora_entrada)
-        salida = datetime.combine(self.fecha_recuperacion, self.hora_salida)
-        
-        if salida <= entrada:
-            return 0.0
-        
-        diferencia = salida - entrada
-        horas = diferencia.total_seconds() / 3600
-        return min(round(horas, 2), 12.0)  # Máximo 12 horas
+        """Calcula las horas completadas a partir de la duración guardada (máximo 12 horas)"""
+        minutos = self.duracion_minutos
+        if minutos is None:
+            minutos = calcular_duracion_minutos(self.hora_entrada, self.hora_salida)
+        return round(minutos / 60, 2)
 
     def esta_completada(self) -> bool:
         """Verifica si la recuperación está completada"""
         return self.estado == EstadoRecuperacionEnum.COMPLETADO
 
+
+ESTADOS_ASISTENCIA = tuple(EstadoAsistenciaEnum)
+
+
+class AsistenciaBatch:
+    """
+    Contenedor columnar de asistencias para consultas por rango: guarda ids,
+    fechas (ordinal) y códigos de estado en arrays compactos en lugar de una
+    entidad por fila. Las entidades se construyen solo al iterar.
+    """
+
+    __slots__ = ('ids', 'practicante_ids', 'fechas', 'estados')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.practicante_ids = array('q')
+        self.fechas = array('l')
+        self.estados = bytearray()
+
+    def agregar(self, asistencia_id: int, practicante_id: int, fecha: date, estado: EstadoAsistenciaEnum) -> None:
+        """Agrega una fila al final del lote"""
+        self.ids.append(asistencia_id)
+        self.practicante_ids.append(practicante_id)
+        self.fechas.append(fecha.toordinal())
+        self.estados.append(ESTADOS_ASISTENCIA.index(estado))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def fecha(self, indice: int) -> date:
+        return date.fromordinal(self.fechas[indice])
+
+    def estado(self, indice: int) -> EstadoAsistenciaEnum:
+        return ESTADOS_ASISTENCIA[self.estados[indice]]
+
+    def contar_por_estado(self) -> Dict[EstadoAsistenciaEnum, int]:
+        """Cantidad de filas por estado, sin construir entidades"""
+        return {estado: self.estados.count(codigo) for codigo, estado in enumerate(ESTADOS_ASISTENCIA)}
+
+    def practicantes_con_estado(self, estado: EstadoAsistenciaEnum) -> List[int]:
+        """Ids de practicante de las filas con el estado dado, en el orden del lote"""
+        codigo = ESTADOS_ASISTENCIA.index(estado)
+        return [
+            practicante_id
+            for practicante_id, codigo_fila in zip(self.practicante_ids, self.estados)
+            if codigo_fila == codigo
+        ]
+
+    def __iter__(self) -> Iterator[Asistencia]:
+        for indice, asistencia_id in enumerate(self.ids):
+            yield Asistencia(
+                id=asistencia_id,
+                practicante_id=self.practicante_ids[indice],
+                fecha=self.fecha(indice),
+                estado=self.estado(indice)
+            )
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, time
 from .entities import (
     EstadoAsistencia,
     HorarioClases,
     Asistencia,
     AsistenciaRecuperacion,
+    AsistenciaBatch,
     EstadoAsistenciaEnum,
+    EstadoRecuperacionEnum,
     DiaSemanaEnum
 )
 
@@ -72,24 +74,115 @@ class AsistenciaRepository(ABC):
         """Obtiene asistencias de un practicante en un rango de fechas"""
         pass
     
+    @abstractmethod
+    def get_batch_by_rango(self, fecha_inicio: date, fecha_fin: date) -> AsistenciaBatch:
+        """Obtiene las asistencias de un rango en formato columnar, ordenadas por (fecha, id)"""
+        pass
+    
     @abstractmethod
     def get_justificadas(self, fecha_inicio: date, fecha_fin: date) -> List[Asistencia]:
         """Obtiene asistencias justificadas en un rango de fechas"""
         pass
     
+    @abstractmethod
+    def get_justificadas_paginadas(
+        self,
+        fecha_inicio: Optional[date],
+        fecha_fin: Optional[date],
+        limite: int,
+        cursor: Optional[Tuple[date, int]] = None
+    ) -> Tuple[List[Asistencia], Optional[Tuple[date, int]]]:
+        """
+        Obtiene una página de asistencias justificadas ordenadas por (-fecha, -id)
+        posteriores al cursor (fecha, id). Retorna la página y el cursor siguiente
+        (None si no hay más filas)
+        """
+        pass
+    
     @abstractmethod
     def save(self, asistencia: Asistencia) -> Asistencia:
         """Guarda una asistencia"""
         pass
     
+    @abstractmethod
+    def save_justificacion(self, asistencia: Asistencia) -> Tuple[Asistencia, int]:
+        """
+        Guarda una justificación consumiendo un ticket del mes de su fecha en la
+        misma transacción (si la asistencia aún no era un ticket). Retorna la
+        asistencia guardada y los tickets usados del mes; lanza CupoTicketsAgotado
+        si el practicante ya no tiene tickets disponibles
+        """
+        pass
+    
+    @abstractmethod
+    def save_many(self, asistencias: List[Asistencia]) -> List[Tuple[Asistencia, bool]]:
+        """
+        Inserta o actualiza (por practicante y fecha) varias asistencias en una
+        sola transacción. En las existentes solo se actualizan hora_entrada y estado.
+        Retorna cada asistencia tal como quedó guardada junto con un indicador
+        de si fue creada (True) o actualizada (False)
+        """
+        pass
+    
+    @abstractmethod
+    def aprobar_justificaciones(self, asistencia_ids: Iterable[int], hora: time) -> Tuple[List[int], List[int]]:
+        """
+        Aprueba en una sola escritura las justificaciones indicadas (entrada y salida = hora).
+        Retorna (ids actualizados, ids existentes omitidos por no estar justificados)
+        """
+        pass
+    
+    @abstractmethod
+    def rechazar_justificaciones(self, asistencia_ids: Iterable[int], motivo_rechazo: str) -> Tuple[List[int], List[int]]:
+        """
+        Rechaza en una sola escritura las justificaciones indicadas agregando
+        " [RECHAZADO: motivo]" al motivo. Retorna (ids actualizados, ids omitidos por no estar justificados)
+        """
+        pass
+    
     @abstractmethod
     def count_by_estado_and_fecha(self, estado: EstadoAsistenciaEnum, fecha: date) -> int:
         """Cuenta asistencias por estado y fecha"""
         pass
     
+    @abstractmethod
+    def get_horas_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, float]:
+        """
+        Suma las horas trabajadas (hora_salida - hora_entrada) de los practicantes
+        activos en un rango de fechas, agrupadas por practicante en una sola consulta
+        """
+        pass
+    
     @abstractmethod
     def count_tickets_mes(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> int:
-        """Cuenta tickets (justificaciones) de un practicante en un mes"""
+        """Tickets (justificaciones) usados por un practicante en los meses del rango"""
+        pass
+    
+    @abstractmethod
+    def count_tickets_by_practicante(
+        self,
+        practicante_ids: Iterable[int],
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> Dict[int, int]:
+        """
+        Tickets usados en los meses del rango por varios practicantes en una sola
+        consulta agrupada; los practicantes sin tickets no aparecen en el resultado
+        """
+        pass
+    
+    @abstractmethod
+    def counts_by_estado_for_fecha(self, fecha: date) -> Dict[EstadoAsistenciaEnum, int]:
+        """Cuenta asistencias de una fecha agrupadas por estado en una sola consulta"""
+        pass
+    
+    @abstractmethod
+    def get_resumen_fecha(self, fecha: date, dia: DiaSemanaEnum) -> Dict[str, int]:
+        """
+        Obtiene todos los conteos del resumen diario en una sola consulta:
+        presentes, tardanzas, ausentes_justificados, ausentes_sin_justificar,
+        con_clases y activos_sin_clases
+        """
         pass
 
 
@@ -111,6 +204,16 @@ class AsistenciaRecuperacionRepository(ABC):
         """Obtiene todas las recuperaciones"""
         pass
     
+    @abstractmethod
+    def get_minutos_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, int]:
+        """Minutos recuperados por practicante en un rango de fechas (inclusive)"""
+        pass
+    
+    @abstractmethod
+    def get_minutos_por_estado(self, fecha_inicio: date, fecha_fin: date) -> Dict[EstadoRecuperacionEnum, int]:
+        """Minutos recuperados por estado de la recuperación en un rango de fechas (inclusive)"""
+        pass
+    
     @abstractmethod
     def save(self, recuperacion: AsistenciaRecuperacion) -> AsistenciaRecuperacion:
         """Guarda una recuperación"""
@@ -0,0 +1,62 @@
+import json
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.utils import timezone
+
+from ..application.services import ResumenPuntualidadService
+from .django_orm_repository import (
+    DjangoEstadoAsistenciaRepository,
+    DjangoHorarioClasesRepository,
+    DjangoAsistenciaRepository
+)
+from .tiempo_real import GRUPO_PUNTUALIDAD
+
+
+@database_sync_to_async
+def obtener_snapshot():
+    """Estado inicial del tablero: el mismo resumen del endpoint REST"""
+    hoy = timezone.now().date()
+    service = ResumenPuntualidadService(
+        DjangoEstadoAsistenciaRepository(),
+        DjangoAsistenciaRepository(),
+        DjangoHorarioClasesRepository()
+    )
+    return {
+        'tipo': 'snapshot',
+        'fecha': hoy.isoformat(),
+        'resumen': service.execute(hoy)
+    }
+
+
+class PuntualidadConsumer(AsyncWebsocketConsumer):
+    """
+    Envía un snapshot al conectar y luego los eventos del grupo de puntualidad
+    (asistencia_changed, justificacion_changed, resumen_delta) emitidos al escribir
+    """
+
+    async def connect(self):
+        self.room_group_name = GRUPO_PUNTUALIDAD
+
+        # Unirse al grupo antes del snapshot para no perder eventos intermedios
+        await self.channel_layer.group_add(
+            self.room_group_name,
+            self.channel_name
+        )
+
+        await self.accept()
+        await self.send(text_data=json.dumps(await obtener_snapshot()))
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(
+            self.room_group_name,
+            self.channel_name
+        )
+
+    # Recibir mensaje del WebSocket (no se usa en este caso)
+    async def receive(self, text_data):
+        pass
+
+    # Recibir evento del grupo y reenviarlo al WebSocket
+    async def puntualidad_evento(self, event):
+        await self.send(text_data=json.dumps(event['message']))
@@ -0,0 +1,138 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from ..domain.entities import EstadoAsistenciaEnum, MAX_TICKETS_MES, CupoTicketsAgotado, motivo_rechazado
+from .estado_registry import estado_registry
+from .models import Asistencia as AsistenciaModel, TicketQuota as TicketQuotaModel
+from .senales import valores_guardados
+
+
+def mes_de(fecha: date) -> str:
+    """Clave year_month (YYYY-MM) del mes de una fecha"""
+    return f"{fecha.year:04d}-{fecha.month:02d}"
+
+
+def meses_entre(fecha_inicio: date, fecha_fin: date) -> List[str]:
+    """Claves year_month de todos los meses del rango (inclusive)"""
+    meses = []
+    anio, mes = fecha_inicio.year, fecha_inicio.month
+    while (anio, mes) <= (fecha_fin.year, fecha_fin.month):
+        meses.append(f"{anio:04d}-{mes:02d}")
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return meses
+
+
+def es_ticket(estado_id: int, motivo) -> bool:
+    """Una asistencia cuenta como ticket si está justificada, tiene motivo y no fue rechazada"""
+    return (
+        estado_id == estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+        and bool(motivo)
+        and not motivo_rechazado(motivo)
+    )
+
+
+def consumir_ticket(practicante_id: int, fecha: date, maximo: int = MAX_TICKETS_MES) -> int:
+    """
+    Consume un ticket del mes de `fecha` con UPDATE ... WHERE used < maximo.
+    Debe llamarse dentro de la transacción que guarda la justificación.
+    Retorna los tickets usados tras el consumo; lanza CupoTicketsAgotado si no quedan.
+    """
+    cupo = TicketQuotaModel.objects.filter(practicante_id=practicante_id, year_month=mes_de(fecha))
+    if not cupo.filter(used__lt=maximo).update(used=F('used') + 1):
+        try:
+            with transaction.atomic():
+                TicketQuotaModel.objects.create(practicante_id=practicante_id, year_month=mes_de(fecha), used=1)
+            return 1
+        except IntegrityError:
+            # La fila ya existe: está agotada o se creó en paralelo
+            if not cupo.filter(used__lt=maximo).update(used=F('used') + 1):
+                raise CupoTicketsAgotado(maximo, maximo)
+    return cupo.values_list('used', flat=True).get()
+
+
+def _liberar(practicante_id: int, year_month: str, cantidad: int) -> None:
+    cupo = TicketQuotaModel.objects.filter(practicante_id=practicante_id, year_month=year_month)
+    if not cupo.filter(used__gte=cantidad).update(used=F('used') - cantidad):
+        # Contador desfasado (cargado antes de que existiera el cupo): nunca baja de cero
+        cupo.filter(used__gt=0).update(used=0)
+
+
+def liberar_ticket(practicante_id: int, fecha: date, cantidad: int = 1) -> None:
+    """
+    Devuelve `cantidad` tickets del mes de `fecha` con UPDATE ... WHERE used >= cantidad.
+    Debe llamarse dentro de la transacción que borra, rechaza o cambia de estado la justificación.
+    """
+    _liberar(practicante_id, mes_de(fecha), cantidad)
+
+
+def liberar_tickets(pares: Iterable[Tuple[int, date]]) -> None:
+    """Libera un ticket por cada (practicante_id, fecha) con un UPDATE por practicante y mes"""
+    for (practicante_id, year_month), cantidad in Counter(
+        (practicante_id, mes_de(fecha)) for practicante_id, fecha in pares
+    ).items():
+        _liberar(practicante_id, year_month, cantidad)
+
+
+def tickets_usados(practicante_id: int, fecha_inicio: date, fecha_fin: date) -> int:
+    """Tickets usados en los meses del rango, leídos del contador"""
+    total = TicketQuotaModel.objects.filter(
+        practicante_id=practicante_id,
+        year_month__in=meses_entre(fecha_inicio, fecha_fin)
+    ).aggregate(total=Sum('used'))['total']
+    return total or 0
+
+
+def tickets_usados_por_practicante(
+    practicante_ids: Iterable[int],
+    fecha_inicio: date,
+    fecha_fin: date
+) -> Dict[int, int]:
+    """Tickets usados en los meses del rango por varios practicantes, en una consulta agrupada"""
+    return dict(TicketQuotaModel.objects.filter(
+        practicante_id__in=set(practicante_ids),
+        year_month__in=meses_entre(fecha_inicio, fecha_fin)
+    ).values('practicante_id').annotate(
+        total=Sum('used')
+    ).values_list('practicante_id', 'total'))
+
+
+def _cupo_ocupado(practicante_id: int, fecha: date, estado_id: int, motivo) -> Optional[Tuple[int, str]]:
+    """(practicante, year_month) del ticket que ocupa una asistencia; None si no es ticket"""
+    return (practicante_id, mes_de(fecha)) if es_ticket(estado_id, motivo) else None
+
+
+def _cupos_del_save(instance: AsistenciaModel) -> Tuple[Optional[Tuple[int, str]], Optional[Tuple[int, str]]]:
+    anterior = valores_guardados(instance)
+    return (
+        _cupo_ocupado(*anterior) if anterior else None,
+        _cupo_ocupado(instance.practicante_id, instance.fecha, instance.estado_id, instance.motivo)
+    )
+
+
+# Cualquier save() mantiene el cupo (repositorio, vistas, admin o scripts): la
+# justificación nueva consume antes de escribirse, así CupoTicketsAgotado evita la
+# escritura; la que deja de ser ticket (rechazo, otro estado) lo devuelve al escribirse
+@receiver(pre_save, sender=AsistenciaModel)
+def _consumir_ticket_guardado(sender, instance, **kwargs):
+    ocupado, nuevo = _cupos_del_save(instance)
+    if nuevo is not None and nuevo != ocupado:
+        consumir_ticket(instance.practicante_id, instance.fecha)
+
+
+@receiver(post_save, sender=AsistenciaModel)
+def _liberar_ticket_guardado(sender, instance, **kwargs):
+    ocupado, nuevo = _cupos_del_save(instance)
+    if ocupado is not None and ocupado != nuevo:
+        _liberar(*ocupado, 1)
+
+
+@receiver(post_delete, sender=AsistenciaModel)
+def _liberar_ticket_eliminado(sender, instance, **kwargs):
+    if es_ticket(instance.estado_id, instance.motivo):
+        liberar_ticket(instance.practicante_id, instance.fecha)
@@ -1,16 +1,19 @@
-from typing import List, Optional
-from datetime import date
-from django.db.models import Count, Q
-from django.db import OperationalError
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, time
+from django.db.models import CharField, Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, Concat
+from django.db import OperationalError, connections, router, transaction
 
 from ..domain.entities import (
     EstadoAsistencia,
     HorarioClases,
     Asistencia,
     AsistenciaRecuperacion,
+    AsistenciaBatch,
     EstadoAsistenciaEnum,
     DiaSemanaEnum,
-    EstadoRecuperacionEnum
+    EstadoRecuperacionEnum,
+    extraer_ticket_id
 )
 from ..domain.repositories import (
     EstadoAsistenciaRepository,
@@ -22,8 +25,27 @@ from .models import (
     EstadoAsistencia as EstadoAsistenciaModel,
     HorarioClases as HorarioClasesModel,
     Asistencia as AsistenciaModel,
-    AsistenciaRecuperacion as AsistenciaRecuperacionModel
+    AsistenciaRecuperacion as AsistenciaRecuperacionModel,
+    DOMINIO_VERSION
 )
+from apps.comun.infrastructure.version_datos import incrementar_version
+from .estado_registry import estado_registry
+from .horario_indice import horario_indice, COLUMNAS_HORARIO
+from . import resumen_diario, cupo_tickets, tiempo_real
+from .paginacion import filtro_despues_de
+from .expresiones import segundos_entre
+from .senales import asistencias_escritas_en_lote
+
+
+def opciones_upsert_asistencia(conexion) -> Dict:
+    """
+    Opciones de bulk_create para el upsert por (practicante, fecha). MySQL no acepta
+    columnas de conflicto (ON DUPLICATE KEY UPDATE salta con cualquier clave única):
+    ahí decide el unique_together(practicante, fecha) de la tabla
+    """
+    if conexion.features.supports_update_conflicts_with_target:
+        return {'unique_fields': ['practicante', 'fecha']}
+    return {}
 
 
 class DjangoEstadoAsistenciaRepository(EstadoAsistenciaRepository):
@@ -42,15 +64,8 @@ class DjangoEstadoAsistenciaRepository(EstadoAsistenciaRepository):
             return None
     
     def get_or_create(self, estado: EstadoAsistenciaEnum) -> EstadoAsistencia:
-        try:
-            model, _ = EstadoAsistenciaModel.objects.get_or_create(
-                estado=estado.value,
-                defaults={'estado': estado.value}
-            )
-            return self._to_domain(model)
-        except OperationalError:
-            # Si la tabla no existe, retornar entidad sin ID
-            return EstadoAsistencia(estado=estado)
+        # Si la tabla no existe el registro no tiene ids: se retorna entidad sin ID
+        return EstadoAsistencia(id=estado_registry.get_id(estado), estado=estado)
     
     def get_all(self) -> List[EstadoAsistencia]:
         try:
@@ -62,6 +77,19 @@ class DjangoEstadoAsistenciaRepository(EstadoAsistenciaRepository):
 class DjangoHorarioClasesRepository(HorarioClasesRepository):
     """Implementación del repositorio de horarios usando Django ORM"""
     
+    # Columnas leídas por el mapper: las lecturas proyectan solo estas
+    COLUMNAS = COLUMNAS_HORARIO
+    
+    def _from_row(self, row: tuple) -> HorarioClases:
+        """Construye la entidad desde una fila de COLUMNAS, sin instanciar el modelo"""
+        horario_id, practicante_id, dia_clase, dia_recuperacion = row
+        return HorarioClases(
+            id=horario_id,
+            practicante_id=practicante_id,
+            dia_clase=DiaSemanaEnum(dia_clase) if dia_clase else None,
+            dia_recuperacion=DiaSemanaEnum(dia_recuperacion) if dia_recuperacion else None
+        )
+    
     def _to_domain(self, model: HorarioClasesModel) -> HorarioClases:
         """Convierte modelo a entidad de dominio"""
         dia_clase = DiaSemanaEnum(model.dia_clase) if model.dia_clase else None
@@ -76,15 +104,15 @@ class DjangoHorarioClasesRepository(HorarioClasesRepository):
     
     def get_by_practicante(self, practicante_id: int) -> Optional[HorarioClases]:
         try:
-            model = HorarioClasesModel.objects.filter(practicante_id=practicante_id).first()
-            return self._to_domain(model) if model else None
+            row = HorarioClasesModel.objects.filter(practicante_id=practicante_id).values_list(*self.COLUMNAS).first()
+            return self._from_row(row) if row else None
         except OperationalError:
             return None
     
     def get_by_dia(self, dia: DiaSemanaEnum) -> List[HorarioClases]:
         try:
-            models = HorarioClasesModel.objects.filter(dia_clase=dia.value)
-            return [self._to_domain(m) for m in models]
+            # Se sirve desde el índice en memoria: sin consultas mientras no cambien los horarios
+            return [self._from_row(row) for row in horario_indice.get_filas(dia)]
         except OperationalError:
             return []
     
@@ -108,132 +136,411 @@ class DjangoHorarioClasesRepository(HorarioClasesRepository):
 class DjangoAsistenciaRepository(AsistenciaRepository):
     """Implementación del repositorio de asistencias usando Django ORM"""
     
+    # Columnas leídas por el mapper: las lecturas proyectan solo estas
+    COLUMNAS = (
+        'id', 'practicante_id', 'fecha', 'estado_id',
+        'hora_entrada', 'hora_salida', 'motivo', 'ticket_id'
+    )
+    
+    def _estado_enum(self, estado_id: int) -> EstadoAsistenciaEnum:
+        estado_enum = estado_registry.get_enum(estado_id)
+        if estado_enum is None:
+            estado_enum = EstadoAsistenciaEnum(
+                EstadoAsistenciaModel.objects.values_list('estado', flat=True).get(id=estado_id)
+            )
+        return estado_enum
+    
+    def _from_row(self, row: tuple) -> Asistencia:
+        """Construye la entidad desde una fila de COLUMNAS, sin instanciar el modelo"""
+        asistencia_id, practicante_id, fecha, estado_id, hora_entrada, hora_salida, motivo, ticket_id = row
+        return Asistencia(
+            id=asistencia_id,
+            practicante_id=practicante_id,
+            fecha=fecha,
+            estado=self._estado_enum(estado_id),
+            hora_entrada=hora_entrada,
+            hora_salida=hora_salida,
+            motivo=motivo,
+            ticket_id=ticket_id
+        )
+    
+    def _listar(self, queryset) -> List[Asistencia]:
+        return [self._from_row(row) for row in queryset.values_list(*self.COLUMNAS)]
+    
+    def _primera(self, queryset) -> Optional[Asistencia]:
+        row = queryset.values_list(*self.COLUMNAS).first()
+        return self._from_row(row) if row else None
+    
     def _to_domain(self, model: AsistenciaModel) -> Asistencia:
         """Convierte modelo a entidad de dominio"""
-        estado_enum = EstadoAsistenciaEnum(model.estado.estado)
-        
         return Asistencia(
             id=model.id,
             practicante_id=model.practicante_id,
             fecha=model.fecha,
-            estado=estado_enum,
+            estado=self._estado_enum(model.estado_id),
             hora_entrada=model.hora_entrada,
             hora_salida=model.hora_salida,
-            motivo=model.motivo
+            motivo=model.motivo,
+            ticket_id=model.ticket_id
         )
     
     def get_by_id(self, asistencia_id: int) -> Optional[Asistencia]:
         try:
-            model = AsistenciaModel.objects.filter(id=asistencia_id).select_related('estado', 'practicante').first()
-            return self._to_domain(model) if model else None
+            return self._primera(AsistenciaModel.objects.filter(id=asistencia_id))
         except OperationalError:
             return None
     
     def get_by_practicante_and_fecha(self, practicante_id: int, fecha: date) -> Optional[Asistencia]:
         try:
-            model = AsistenciaModel.objects.filter(
+            return self._primera(AsistenciaModel.objects.filter(
                 practicante_id=practicante_id,
                 fecha=fecha
-            ).select_related('estado').first()
-            return self._to_domain(model) if model else None
+            ))
         except OperationalError:
             return None
     
     def get_by_fecha(self, fecha: date) -> List[Asistencia]:
         try:
-            models = AsistenciaModel.objects.filter(fecha=fecha).select_related('estado', 'practicante')
-            return [self._to_domain(m) for m in models]
+            return self._listar(AsistenciaModel.objects.filter(fecha=fecha))
         except OperationalError:
             return []
     
     def get_by_practicante_and_rango(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> List[Asistencia]:
         try:
-            models = AsistenciaModel.objects.filter(
+            return self._listar(AsistenciaModel.objects.filter(
                 practicante_id=practicante_id,
                 fecha__gte=fecha_inicio,
                 fecha__lte=fecha_fin
-            ).select_related('estado')
-            return [self._to_domain(m) for m in models]
+            ))
         except OperationalError:
             return []
     
+    def get_batch_by_rango(self, fecha_inicio: date, fecha_fin: date) -> AsistenciaBatch:
+        lote = AsistenciaBatch()
+        try:
+            filas = AsistenciaModel.objects.filter(
+                fecha__gte=fecha_inicio,
+                fecha__lte=fecha_fin
+            ).order_by('fecha', 'id').values_list('id', 'practicante_id', 'fecha', 'estado_id')
+            for asistencia_id, practicante_id, fecha, estado_id in filas.iterator(chunk_size=2000):
+                lote.agregar(asistencia_id, practicante_id, fecha, self._estado_enum(estado_id))
+        except OperationalError:
+            return AsistenciaBatch()
+        return lote
+    
     def get_justificadas(self, fecha_inicio: date, fecha_fin: date) -> List[Asistencia]:
         try:
-            estado_just = EstadoAsistenciaModel.objects.filter(estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO.value).first()
-            if not estado_just:
+            estado_just_id = estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+            if not estado_just_id:
                 return []
             
-            models = AsistenciaModel.objects.filter(
-                estado=estado_just,
+            return self._listar(AsistenciaModel.objects.filter(
+                estado_id=estado_just_id,
                 motivo__isnull=False,
                 fecha__gte=fecha_inicio,
                 fecha__lte=fecha_fin
-            ).exclude(motivo='').select_related('practicante', 'estado')
-            
-            return [self._to_domain(m) for m in models]
+            ).exclude(motivo=''))
         except OperationalError:
             return []
     
-    def save(self, asistencia: Asistencia) -> Asistencia:
+    def get_justificadas_paginadas(
+        self,
+        fecha_inicio: Optional[date],
+        fecha_fin: Optional[date],
+        limite: int,
+        cursor: Optional[Tuple[date, int]] = None
+    ) -> Tuple[List[Asistencia], Optional[Tuple[date, int]]]:
         try:
-            if asistencia.id:
-                model = AsistenciaModel.objects.get(id=asistencia.id)
-            else:
-                model = AsistenciaModel()
+            estado_just_id = estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+            if not estado_just_id:
+                return [], None
             
-            model.practicante_id = asistencia.practicante_id
-            model.fecha = asistencia.fecha
-            model.hora_entrada = asistencia.hora_entrada
-            model.hora_salida = asistencia.hora_salida
-            model.motivo = asistencia.motivo
+            queryset = AsistenciaModel.objects.filter(
+                estado_id=estado_just_id,
+                motivo__isnull=False
+            ).exclude(motivo='')
+            if fecha_inicio:
+                queryset = queryset.filter(fecha__gte=fecha_inicio)
+            if fecha_fin:
+                queryset = queryset.filter(fecha__lte=fecha_fin)
             
-            # Obtener o crear estado
-            estado_model = EstadoAsistenciaModel.objects.get_or_create(
-                estado=asistencia.estado.value,
-                defaults={'estado': asistencia.estado.value}
-            )[0]
-            model.estado = estado_model
+            # Se pide una fila extra para saber si existe una página siguiente
+            asistencias = self._listar(queryset.filter(filtro_despues_de(cursor)).order_by('-fecha', '-id')[:limite + 1])
+            siguiente = None
+            if len(asistencias) > limite:
+                asistencias = asistencias[:limite]
+                siguiente = (asistencias[-1].fecha, asistencias[-1].id)
             
-            model.save()
-            return self._to_domain(model)
+            return asistencias, siguiente
+        except OperationalError:
+            return [], None
+    
+    def save(self, asistencia: Asistencia) -> Asistencia:
+        try:
+            with transaction.atomic():
+                return self._save(asistencia)
         except OperationalError as e:
             raise ValueError(f"Error al guardar asistencia: {str(e)}")
     
+    def save_justificacion(self, asistencia: Asistencia) -> Tuple[Asistencia, int]:
+        try:
+            with transaction.atomic():
+                actual_id = AsistenciaModel.objects.select_for_update().filter(
+                    practicante_id=asistencia.practicante_id,
+                    fecha=asistencia.fecha
+                ).values_list('id', flat=True).first()
+                if actual_id is not None:
+                    asistencia.id = actual_id
+                
+                # El save() consume el ticket si la asistencia aún no lo ocupaba
+                guardada = self._save(asistencia)
+                return guardada, cupo_tickets.tickets_usados(
+                    asistencia.practicante_id, asistencia.fecha, asistencia.fecha
+                )
+        except OperationalError as e:
+            raise ValueError(f"Error al guardar justificación: {str(e)}")
+    
+    def _save(self, asistencia: Asistencia) -> Asistencia:
+        """Escribe la asistencia; las señales de save() ajustan el resumen diario y el cupo de tickets"""
+        if asistencia.id:
+            model = AsistenciaModel.objects.get(id=asistencia.id)
+        else:
+            model = AsistenciaModel()
+        
+        model.practicante_id = asistencia.practicante_id
+        model.fecha = asistencia.fecha
+        model.hora_entrada = asistencia.hora_entrada
+        model.hora_salida = asistencia.hora_salida
+        model.motivo = asistencia.motivo
+        
+        estado_id = estado_registry.get_id(asistencia.estado)
+        if not estado_id:
+            raise ValueError("Error al guardar asistencia: estados de asistencia no disponibles")
+        model.estado_id = estado_id
+        
+        model.save()
+        return self._to_domain(model)
+    
+    def save_many(self, asistencias: List[Asistencia]) -> List[Tuple[Asistencia, bool]]:
+        if not asistencias:
+            return []
+        
+        ids = estado_registry.get_ids()
+        if not ids:
+            raise ValueError("Error al guardar asistencias: estados de asistencia no disponibles")
+        
+        try:
+            with transaction.atomic():
+                pares = {(a.practicante_id, a.fecha) for a in asistencias}
+                # Estado y motivo de las filas existentes, para devolver tickets al cambiar de estado
+                anteriores = {
+                    (practicante_id, fecha): (estado_id, motivo)
+                    for practicante_id, fecha, estado_id, motivo in AsistenciaModel.objects.filter(
+                        practicante_id__in={practicante_id for practicante_id, _ in pares},
+                        fecha__in={fecha for _, fecha in pares}
+                    ).values_list('practicante_id', 'fecha', 'estado_id', 'motivo')
+                    if (practicante_id, fecha) in pares
+                }
+                existentes = set(anteriores)
+                
+                models = [
+                    AsistenciaModel(
+                        practicante_id=a.practicante_id,
+                        fecha=a.fecha,
+                        hora_entrada=a.hora_entrada,
+                        hora_salida=a.hora_salida,
+                        estado_id=ids[a.estado],
+                        motivo=a.motivo,
+                        ticket_id=extraer_ticket_id(a.motivo)
+                    )
+                    for a in asistencias
+                ]
+                # Un solo INSERT ... ON CONFLICT (ON DUPLICATE KEY en MySQL) sobre
+                # unique_together(practicante, fecha). Es el upsert de la marcación: en filas
+                # existentes solo cambian hora_entrada y estado; motivo, hora_salida y
+                # ticket_id se conservan
+                AsistenciaModel.objects.bulk_create(
+                    models,
+                    update_conflicts=True,
+                    update_fields=['hora_entrada', 'estado'],
+                    **opciones_upsert_asistencia(connections[router.db_for_write(AsistenciaModel)])
+                )
+                
+                # Se releen las filas guardadas: las instancias enviadas traen motivo y
+                # hora_salida que el upsert no escribió, y algunos motores (MySQL) no
+                # retornan las claves de las filas actualizadas
+                guardadas = {
+                    (m.practicante_id, m.fecha): m
+                    for m in AsistenciaModel.objects.filter(
+                        practicante_id__in={practicante_id for practicante_id, _ in pares},
+                        fecha__in={fecha for _, fecha in pares}
+                    )
+                    if (m.practicante_id, m.fecha) in pares
+                }
+                models = [guardadas[(m.practicante_id, m.fecha)] for m in models]
+                
+                resumen_diario.reconstruir_fechas(fecha for _, fecha in pares)
+                # Justificaciones que el upsert cambió de estado devuelven su ticket
+                # (el upsert no toca el motivo: se evalúa con el guardado)
+                estados_nuevos = {(m.practicante_id, m.fecha): m.estado_id for m in models}
+                cupo_tickets.liberar_tickets(
+                    par for par, (estado_id, motivo) in anteriores.items()
+                    if cupo_tickets.es_ticket(estado_id, motivo)
+                    and not cupo_tickets.es_ticket(estados_nuevos[par], motivo)
+                )
+                # bulk_create no emite post_save
+                incrementar_version(DOMINIO_VERSION)
+                tiempo_real.emitir_asistencias(models)
+                asistencias_escritas_en_lote.send(sender=AsistenciaModel, fechas={m.fecha for m in models})
+            
+            return [
+                (self._to_domain(m), (m.practicante_id, m.fecha) not in existentes)
+                for m in models
+            ]
+        except OperationalError as e:
+            raise ValueError(f"Error al guardar asistencias: {str(e)}")
+    
+    def _actualizar_justificaciones(self, asistencia_ids: Iterable[int], **valores) -> Tuple[List[int], List[int]]:
+        """Aplica `valores` con un solo UPDATE a las asistencias justificadas entre los ids dados"""
+        asistencia_ids = set(asistencia_ids)
+        if not asistencia_ids:
+            return [], []
+        
+        estado_just_id = estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+        if not estado_just_id:
+            raise ValueError("Error al actualizar justificaciones: estados de asistencia no disponibles")
+        
+        try:
+            with transaction.atomic():
+                existentes = AsistenciaModel.objects.select_for_update().filter(
+                    id__in=asistencia_ids
+                ).values_list('id', 'estado_id', 'motivo')
+                actualizadas, omitidas, tickets = [], [], set()
+                for asistencia_id, estado_id, motivo in sorted(existentes):
+                    (actualizadas if estado_id == estado_just_id else omitidas).append(asistencia_id)
+                    if cupo_tickets.es_ticket(estado_id, motivo):
+                        tickets.add(asistencia_id)
+                
+                if actualizadas:
+                    AsistenciaModel.objects.filter(id__in=actualizadas).update(**valores)
+                    # update() no emite post_save
+                    incrementar_version(DOMINIO_VERSION)
+                    escritas = list(AsistenciaModel.objects.filter(id__in=actualizadas))
+                    # Las rechazadas devuelven su ticket al cupo del mes
+                    cupo_tickets.liberar_tickets(
+                        (m.practicante_id, m.fecha) for m in escritas
+                        if m.id in tickets and not cupo_tickets.es_ticket(m.estado_id, m.motivo)
+                    )
+                    tiempo_real.emitir_asistencias(escritas)
+                    asistencias_escritas_en_lote.send(sender=AsistenciaModel, fechas={m.fecha for m in escritas})
+            return actualizadas, omitidas
+        except OperationalError as e:
+            raise ValueError(f"Error al actualizar justificaciones: {str(e)}")
+    
+    def aprobar_justificaciones(self, asistencia_ids: Iterable[int], hora: time) -> Tuple[List[int], List[int]]:
+        return self._actualizar_justificaciones(asistencia_ids, hora_entrada=hora, hora_salida=hora)
+    
+    def rechazar_justificaciones(self, asistencia_ids: Iterable[int], motivo_rechazo: str) -> Tuple[List[int], List[int]]:
+        sufijo = f" [RECHAZADO: {motivo_rechazo}]"
+        valores = {
+            'motivo': Concat(Coalesce('motivo', Value('')), Value(sufijo), output_field=CharField())
+        }
+        # Igual que AsistenciaModel.save(): el primer ticket del motivo completo gana
+        ticket_sufijo = extraer_ticket_id(sufijo)
+        if ticket_sufijo:
+            valores['ticket_id'] = Coalesce('ticket_id', Value(ticket_sufijo), output_field=CharField())
+        return self._actualizar_justificaciones(asistencia_ids, **valores)
+    
     def count_by_estado_and_fecha(self, estado: EstadoAsistenciaEnum, fecha: date) -> int:
         try:
-            estado_model = EstadoAsistenciaModel.objects.filter(estado=estado.value).first()
-            if not estado_model:
+            estado_id = estado_registry.get_id(estado)
+            if not estado_id:
                 return 0
             
             return AsistenciaModel.objects.filter(
-                estado=estado_model,
+                estado_id=estado_id,
                 fecha=fecha
             ).count()
         except OperationalError:
             return 0
     
-    def count_tickets_mes(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> int:
+    def get_horas_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, float]:
         try:
-            estado_just = EstadoAsistenciaModel.objects.filter(
-                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO.value
-            ).first()
-            if not estado_just:
-                return 0
-            
-            return AsistenciaModel.objects.filter(
-                practicante_id=practicante_id,
-                estado=estado_just,
-                motivo__isnull=False,
+            filas = AsistenciaModel.objects.filter(
+                practicante__estado='activo',
                 fecha__gte=fecha_inicio,
-                fecha__lte=fecha_fin
-            ).exclude(motivo='').count()
+                fecha__lte=fecha_fin,
+                hora_entrada__isnull=False,
+                hora_salida__gt=F('hora_entrada')
+            ).values('practicante_id').annotate(
+                segundos=Sum(segundos_entre('hora_entrada', 'hora_salida'))
+            ).values_list('practicante_id', 'segundos')
+            return {practicante_id: round((segundos or 0) / 3600, 2) for practicante_id, segundos in filas}
+        except OperationalError:
+            return {}
+    
+    def count_tickets_mes(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> int:
+        try:
+            return cupo_tickets.tickets_usados(practicante_id, fecha_inicio, fecha_fin)
         except OperationalError:
             return 0
+    
+    def count_tickets_by_practicante(
+        self,
+        practicante_ids: Iterable[int],
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> Dict[int, int]:
+        practicante_ids = set(practicante_ids)
+        if not practicante_ids:
+            return {}
+        try:
+            return cupo_tickets.tickets_usados_por_practicante(practicante_ids, fecha_inicio, fecha_fin)
+        except OperationalError:
+            return {}
+    
+    def counts_by_estado_for_fecha(self, fecha: date) -> Dict[EstadoAsistenciaEnum, int]:
+        conteos_vacios = {estado: 0 for estado in EstadoAsistenciaEnum}
+        try:
+            ids = estado_registry.get_ids()
+            if not ids:
+                return conteos_vacios
+            
+            conteos = AsistenciaModel.objects.filter(fecha=fecha).aggregate(**{
+                estado.name: Count('id', filter=Q(estado_id=ids[estado]))
+                for estado in EstadoAsistenciaEnum
+            })
+            return {estado: conteos[estado.name] or 0 for estado in EstadoAsistenciaEnum}
+        except OperationalError:
+            return conteos_vacios
+    
+    def get_resumen_fecha(self, fecha: date, dia: DiaSemanaEnum) -> Dict[str, int]:
+        try:
+            # Lectura por clave primaria de la tabla asistencia_resumen_diario
+            return resumen_diario.obtener_resumen(fecha)
+        except OperationalError:
+            return resumen_diario.resumen_vacio()
 
 
 class DjangoAsistenciaRecuperacionRepository(AsistenciaRecuperacionRepository):
     """Implementación del repositorio de recuperaciones usando Django ORM"""
     
+    # Columnas leídas por el mapper: las lecturas proyectan solo estas
+    COLUMNAS = ('id', 'asistencia_id', 'fecha_recuperacion', 'estado', 'hora_entrada', 'hora_salida', 'duracion_minutos')
+    
+    def _from_row(self, row: tuple) -> AsistenciaRecuperacion:
+        """Construye la entidad desde una fila de COLUMNAS, sin instanciar el modelo"""
+        recuperacion_id, asistencia_id, fecha_recuperacion, estado, hora_entrada, hora_salida, duracion_minutos = row
+        return AsistenciaRecuperacion(
+            id=recuperacion_id,
+            asistencia_id=asistencia_id,
+            fecha_recuperacion=fecha_recuperacion,
+            estado=EstadoRecuperacionEnum(estado),
+            hora_entrada=hora_entrada,
+            hora_salida=hora_salida,
+            duracion_minutos=duracion_minutos
+        )
+    
     def _to_domain(self, model: AsistenciaRecuperacionModel) -> AsistenciaRecuperacion:
         """Convierte modelo a entidad de dominio"""
         estado_enum = EstadoRecuperacionEnum(model.estado)
@@ -244,33 +551,57 @@ class DjangoAsistenciaRecuperacionRepository(AsistenciaRecuperacionRepository):
             fecha_recuperacion=model.fecha_recuperacion,
             estado=estado_enum,
             hora_entrada=model.hora_entrada,
-            hora_salida=model.hora_salida
+            hora_salida=model.hora_salida,
+            duracion_minutos=model.duracion_minutos
         )
     
     def get_by_id(self, recuperacion_id: int) -> Optional[AsistenciaRecuperacion]:
         try:
-            model = AsistenciaRecuperacionModel.objects.filter(id=recuperacion_id).select_related('asistencia').first()
-            return self._to_domain(model) if model else None
+            row = AsistenciaRecuperacionModel.objects.filter(id=recuperacion_id).values_list(*self.COLUMNAS).first()
+            return self._from_row(row) if row else None
         except OperationalError:
             return None
     
     def get_by_asistencia(self, asistencia_id: int) -> List[AsistenciaRecuperacion]:
         try:
-            models = AsistenciaRecuperacionModel.objects.filter(asistencia_id=asistencia_id)
-            return [self._to_domain(m) for m in models]
+            rows = AsistenciaRecuperacionModel.objects.filter(asistencia_id=asistencia_id).values_list(*self.COLUMNAS)
+            return [self._from_row(row) for row in rows]
         except OperationalError:
             return []
     
     def get_all(self, limit: int = 100) -> List[AsistenciaRecuperacion]:
         try:
-            models = AsistenciaRecuperacionModel.objects.select_related(
-                'asistencia',
-                'asistencia__practicante'
-            ).filter(asistencia__isnull=False)[:limit]
-            return [self._to_domain(m) for m in models]
+            rows = AsistenciaRecuperacionModel.objects.filter(
+                asistencia__isnull=False
+            ).order_by('-fecha_recuperacion', '-id').values_list(*self.COLUMNAS)[:limit]
+            return [self._from_row(row) for row in rows]
         except OperationalError:
             return []
     
+    def get_minutos_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, int]:
+        try:
+            filas = AsistenciaRecuperacionModel.objects.filter(
+                fecha_recuperacion__gte=fecha_inicio,
+                fecha_recuperacion__lte=fecha_fin
+            ).values('asistencia__practicante_id').annotate(
+                minutos=Sum('duracion_minutos')
+            ).values_list('asistencia__practicante_id', 'minutos')
+            return dict(filas)
+        except OperationalError:
+            return {}
+    
+    def get_minutos_por_estado(self, fecha_inicio: date, fecha_fin: date) -> Dict[EstadoRecuperacionEnum, int]:
+        try:
+            filas = AsistenciaRecuperacionModel.objects.filter(
+                fecha_recuperacion__gte=fecha_inicio,
+                fecha_recuperacion__lte=fecha_fin
+            ).values('estado').annotate(
+                minutos=Sum('duracion_minutos')
+            ).values_list('estado', 'minutos')
+            return {EstadoRecuperacionEnum(estado): minutos for estado, minutos in filas}
+        except OperationalError:
+            return {}
+    
     def save(self, recuperacion: AsistenciaRecuperacion) -> AsistenciaRecuperacion:
         try:
             if recuperacion.id:
@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import OperationalError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ..domain.entities import EstadoAsistenciaEnum
+from .models import EstadoAsistencia as EstadoAsistenciaModel
+
+
+class EstadoAsistenciaRegistry:
+    """
+    Registro en memoria (por proceso) de EstadoAsistenciaEnum -> id.
+    Se carga una sola vez y se invalida cuando cambian las filas de estado_asistencia,
+    de modo que vistas y repositorios filtran por estado_id sin consultar la tabla.
+    """
+
+    def __init__(self):
+        self._ids: Optional[Dict[EstadoAsistenciaEnum, int]] = None
+        self._enums: Dict[int, EstadoAsistenciaEnum] = {}
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[EstadoAsistenciaEnum, int]:
+        """Carga los ids en una consulta y crea los estados que falten"""
+        filas = dict(EstadoAsistenciaModel.objects.values_list('estado', 'id'))
+        for estado in EstadoAsistenciaEnum:
+            if estado.value not in filas:
+                model, _ = EstadoAsistenciaModel.objects.get_or_create(estado=estado.value)
+                filas[estado.value] = model.id
+        return {estado: filas[estado.value] for estado in EstadoAsistenciaEnum}
+
+    def get_ids(self) -> Dict[EstadoAsistenciaEnum, int]:
+        """Retorna el mapa completo; vacío si las tablas aún no existen"""
+        ids = self._ids
+        if ids is not None:
+            return ids
+
+        with self._lock:
+            if self._ids is None:
+                try:
+                    ids = self._load()
+                except OperationalError:
+                    # No se cachea: se reintenta cuando existan las tablas
+                    return {}
+                self._enums = {pk: estado for estado, pk in ids.items()}
+                self._ids = ids
+            return self._ids
+
+    async def aget_ids(self) -> Dict[EstadoAsistenciaEnum, int]:
+        """Versión asíncrona de get_ids: solo consulta la base si el registro no está cargado"""
+        ids = self._ids
+        if ids is not None:
+            return ids
+        return await sync_to_async(self.get_ids)()
+
+    def get_id(self, estado: EstadoAsistenciaEnum) -> Optional[int]:
+        """Obtiene el id de un estado"""
+        return self.get_ids().get(estado)
+
+    def get_enum(self, estado_id: int) -> Optional[EstadoAsistenciaEnum]:
+        """Obtiene el estado correspondiente a un id"""
+        self.get_ids()
+        return self._enums.get(estado_id)
+
+    def invalidate(self) -> None:
+        """Descarta el registro para que se recargue en el siguiente acceso"""
+        with self._lock:
+            self._ids = None
+            self._enums = {}
+
+
+estado_registry = EstadoAsistenciaRegistry()
+
+
+@receiver(post_save, sender=EstadoAsistenciaModel)
+@receiver(post_delete, sender=EstadoAsistenciaModel)
+def _invalidar_estado_registry(sender, **kwargs):
+    estado_registry.invalidate()
@@ -0,0 +1,22 @@
+from django.db.models import IntegerField, ExpressionWrapper
+from django.db.models.functions import ExtractHour, ExtractMinute, ExtractSecond
+
+
+def segundos_del_dia(campo: str):
+    """Segundos desde medianoche de un TimeField, portable entre SQLite, MySQL y PostgreSQL"""
+    return ExpressionWrapper(
+        ExtractHour(campo) * 3600 + ExtractMinute(campo) * 60 + ExtractSecond(campo),
+        output_field=IntegerField()
+    )
+
+
+def segundos_entre(campo_inicio: str, campo_fin: str):
+    """
+    Diferencia en segundos entre dos TimeField de la misma fila (o de una
+    relación, p. ej. 'asistencias__hora_entrada'). Negativa si el fin es
+    anterior al inicio: quien suma debe filtrar hora_salida > hora_entrada.
+    """
+    return ExpressionWrapper(
+        segundos_del_dia(campo_fin) - segundos_del_dia(campo_inicio),
+        output_field=IntegerField()
+    )
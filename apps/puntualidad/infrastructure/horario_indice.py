@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import OperationalError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.comun.infrastructure.version_datos import obtener_versiones
+from ..domain.entities import DiaSemanaEnum
+from .models import HorarioClases as HorarioClasesModel, DOMINIO_VERSION
+
+
+# Columnas de cada fila del índice (mismo orden que el mapper del repositorio)
+COLUMNAS_HORARIO = ('id', 'practicante_id', 'dia_clase', 'dia_recuperacion')
+
+# Cada cuántos segundos se compara la versión de datos para ver cambios de otros procesos
+INTERVALO_VERIFICACION = 60
+
+
+class HorarioIndice:
+    """
+    Índice en memoria (por proceso) de día de clase -> horarios y practicantes.
+    Se construye en una consulta y se invalida con las señales de HorarioClases;
+    los cambios hechos por otros procesos se detectan comparando la versión de
+    datos del dominio como máximo cada INTERVALO_VERIFICACION segundos.
+    """
+
+    def __init__(self):
+        # (día -> filas, día -> practicantes); se reemplaza completo en cada carga
+        self._indice: Optional[Tuple[Dict[str, Tuple[tuple, ...]], Dict[str, FrozenSet[int]]]] = None
+        self._version: Optional[int] = None
+        self._verificado_en = 0.0
+        self._lock = threading.RLock()
+
+    def _version_actual(self) -> Optional[int]:
+        versiones = obtener_versiones([DOMINIO_VERSION])
+        return versiones[DOMINIO_VERSION] if versiones is not None else None
+
+    def _load(self):
+        filas: Dict[str, list] = {}
+        for fila in HorarioClasesModel.objects.exclude(dia_clase=None).values_list(*COLUMNAS_HORARIO):
+            filas.setdefault(fila[2], []).append(fila)
+        return (
+            {dia: tuple(filas_dia) for dia, filas_dia in filas.items()},
+            {dia: frozenset(fila[1] for fila in filas_dia) for dia, filas_dia in filas.items()}
+        )
+
+    def _reciente(self) -> bool:
+        return time.monotonic() - self._verificado_en < INTERVALO_VERIFICACION
+
+    def _get_indice(self):
+        indice = self._indice
+        if indice is not None and self._reciente():
+            return indice
+
+        with self._lock:
+            if self._indice is not None and not self._reciente():
+                self._verificado_en = time.monotonic()
+                try:
+                    if self._version_actual() != self._version:
+                        self._indice = None
+                except OperationalError:
+                    self._indice = None
+            if self._indice is None:
+                try:
+                    version = self._version_actual()
+                    indice = self._load()
+                except OperationalError:
+                    # No se cachea: se reintenta cuando existan las tablas
+                    return {}, {}
+                self._version = version
+                self._verificado_en = time.monotonic()
+                self._indice = indice
+            return self._indice
+
+    def get_filas(self, dia: DiaSemanaEnum) -> Tuple[tuple, ...]:
+        """Filas (COLUMNAS_HORARIO) de los horarios con clase el día indicado"""
+        return self._get_indice()[0].get(dia.value, ())
+
+    def get_practicantes(self, dia: DiaSemanaEnum) -> FrozenSet[int]:
+        """Ids de los practicantes con clase el día indicado"""
+        return self._get_indice()[1].get(dia.value, frozenset())
+
+    async def aget_practicantes(self, dia: DiaSemanaEnum) -> FrozenSet[int]:
+        """Versión asíncrona de get_practicantes: solo consulta la base si hay que recargar o verificar"""
+        indice = self._indice
+        if indice is not None and self._reciente():
+            return indice[1].get(dia.value, frozenset())
+        return await sync_to_async(self.get_practicantes)(dia)
+
+    def invalidate(self) -> None:
+        """Descarta el índice para que se reconstruya en el siguiente acceso"""
+        with self._lock:
+            self._indice = None
+            self._version = None
+
+
+horario_indice = HorarioIndice()
+
+
+@receiver(post_save, sender=HorarioClasesModel)
+@receiver(post_delete, sender=HorarioClasesModel)
+def _invalidar_horario_indice(sender, **kwargs):
+    horario_indice.invalidate()
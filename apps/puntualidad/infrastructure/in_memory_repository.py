@@ -0,0 +1,320 @@
+from collections import Counter
+from dataclasses import replace
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..domain.entities import (
+    EstadoAsistencia,
+    HorarioClases,
+    Asistencia,
+    AsistenciaRecuperacion,
+    AsistenciaBatch,
+    EstadoAsistenciaEnum,
+    EstadoRecuperacionEnum,
+    DiaSemanaEnum,
+    MAX_TICKETS_MES,
+    CupoTicketsAgotado,
+    calcular_duracion_minutos
+)
+from ..domain.repositories import (
+    EstadoAsistenciaRepository,
+    HorarioClasesRepository,
+    AsistenciaRepository,
+    AsistenciaRecuperacionRepository
+)
+
+
+def _mes_de(fecha: date) -> Tuple[int, int]:
+    return fecha.year, fecha.month
+
+
+def _es_ticket(asistencia: Optional[Asistencia]) -> bool:
+    return asistencia is not None and asistencia.es_justificada() and asistencia.tiene_motivo()
+
+
+# Implementaciones de repositorios en memoria para los tests
+class InMemoryEstadoAsistenciaRepository(EstadoAsistenciaRepository):
+
+    def __init__(self):
+        self._estados: Dict[EstadoAsistenciaEnum, EstadoAsistencia] = {}
+
+    def get_by_nombre(self, nombre: str) -> Optional[EstadoAsistencia]:
+        for estado in self._estados.values():
+            if estado.estado.value == nombre:
+                return estado
+        return None
+
+    def get_or_create(self, estado: EstadoAsistenciaEnum) -> EstadoAsistencia:
+        if estado not in self._estados:
+            self._estados[estado] = EstadoAsistencia(id=len(self._estados) + 1, estado=estado)
+        return self._estados[estado]
+
+    def get_all(self) -> List[EstadoAsistencia]:
+        return list(self._estados.values())
+
+
+class InMemoryHorarioClasesRepository(HorarioClasesRepository):
+
+    def __init__(self):
+        self._horarios: Dict[int, HorarioClases] = {}
+        self._next_id = 1
+
+    def get_by_practicante(self, practicante_id: int) -> Optional[HorarioClases]:
+        for horario in self._horarios.values():
+            if horario.practicante_id == practicante_id:
+                return horario
+        return None
+
+    def get_by_dia(self, dia: DiaSemanaEnum) -> List[HorarioClases]:
+        return [h for h in self._horarios.values() if h.dia_clase == dia]
+
+    def save(self, horario: HorarioClases) -> HorarioClases:
+        if not horario.id:
+            horario.id = self._next_id
+            self._next_id += 1
+        self._horarios[horario.id] = horario
+        return horario
+
+
+class InMemoryAsistenciaRepository(AsistenciaRepository):
+    """
+    Repositorio de asistencias en memoria. Opcionalmente recibe el repositorio de
+    horarios y los ids de practicantes activos para calcular el resumen diario.
+    """
+
+    def __init__(
+        self,
+        horario_repo: Optional[HorarioClasesRepository] = None,
+        practicantes_activos: Iterable[int] = ()
+    ):
+        self._asistencias: Dict[int, Asistencia] = {}
+        self._tickets: Counter = Counter()
+        # Asistencia -> (practicante, mes) del ticket que consumió
+        self._ticket_de: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+        self._next_id = 1
+        self.horario_repo = horario_repo
+        self.practicantes_activos: Set[int] = set(practicantes_activos)
+
+    def get_by_id(self, asistencia_id: int) -> Optional[Asistencia]:
+        return self._asistencias.get(asistencia_id)
+
+    def get_by_practicante_and_fecha(self, practicante_id: int, fecha: date) -> Optional[Asistencia]:
+        for asistencia in self._asistencias.values():
+            if asistencia.practicante_id == practicante_id and asistencia.fecha == fecha:
+                return asistencia
+        return None
+
+    def get_by_fecha(self, fecha: date) -> List[Asistencia]:
+        return [a for a in self._asistencias.values() if a.fecha == fecha]
+
+    def get_by_practicante_and_rango(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> List[Asistencia]:
+        return sorted(
+            (
+                a for a in self._asistencias.values()
+                if a.practicante_id == practicante_id and fecha_inicio <= a.fecha <= fecha_fin
+            ),
+            key=lambda a: a.fecha
+        )
+
+    def get_batch_by_rango(self, fecha_inicio: date, fecha_fin: date) -> AsistenciaBatch:
+        lote = AsistenciaBatch()
+        for a in sorted(self._asistencias.values(), key=lambda a: (a.fecha, a.id)):
+            if fecha_inicio <= a.fecha <= fecha_fin:
+                lote.agregar(a.id, a.practicante_id, a.fecha, a.estado)
+        return lote
+
+    def get_justificadas(self, fecha_inicio: date, fecha_fin: date) -> List[Asistencia]:
+        return [
+            a for a in self._asistencias.values()
+            if _es_ticket(a) and fecha_inicio <= a.fecha <= fecha_fin
+        ]
+
+    def get_justificadas_paginadas(
+        self,
+        fecha_inicio: Optional[date],
+        fecha_fin: Optional[date],
+        limite: int,
+        cursor: Optional[Tuple[date, int]] = None
+    ) -> Tuple[List[Asistencia], Optional[Tuple[date, int]]]:
+        filas = sorted(
+            (
+                a for a in self._asistencias.values()
+                if _es_ticket(a)
+                and (fecha_inicio is None or a.fecha >= fecha_inicio)
+                and (fecha_fin is None or a.fecha <= fecha_fin)
+                and (cursor is None or (a.fecha, a.id) < cursor)
+            ),
+            key=lambda a: (a.fecha, a.id),
+            reverse=True
+        )
+        pagina = filas[:limite]
+        siguiente = (pagina[-1].fecha, pagina[-1].id) if len(filas) > limite else None
+        return pagina, siguiente
+
+    def save(self, asistencia: Asistencia) -> Asistencia:
+        if not asistencia.id:
+            asistencia.id = self._next_id
+            self._next_id += 1
+        self._asistencias[asistencia.id] = asistencia
+        self._devolver_ticket(asistencia)
+        return asistencia
+
+    def _devolver_ticket(self, asistencia: Asistencia) -> None:
+        # Rechazada o con otro estado: el ticket vuelve al cupo del mes
+        if asistencia.id in self._ticket_de and not asistencia.ocupa_ticket():
+            self._tickets[self._ticket_de.pop(asistencia.id)] -= 1
+
+    def save_justificacion(self, asistencia: Asistencia) -> Tuple[Asistencia, int]:
+        actual = self.get_by_practicante_and_fecha(asistencia.practicante_id, asistencia.fecha)
+        clave = (asistencia.practicante_id, _mes_de(asistencia.fecha))
+        consume = actual is None or not actual.ocupa_ticket()
+        if consume:
+            if self._tickets[clave] >= MAX_TICKETS_MES:
+                raise CupoTicketsAgotado(self._tickets[clave])
+            self._tickets[clave] += 1
+        if actual is not None:
+            asistencia.id = actual.id
+        guardada = self.save(asistencia)
+        if consume:
+            self._ticket_de[guardada.id] = clave
+        return guardada, self._tickets[clave]
+
+    def save_many(self, asistencias: List[Asistencia]) -> List[Tuple[Asistencia, bool]]:
+        resultados = []
+        for asistencia in asistencias:
+            actual = self.get_by_practicante_and_fecha(asistencia.practicante_id, asistencia.fecha)
+            if actual is not None:
+                # Como el upsert de Django: solo se actualizan hora_entrada y estado,
+                # y se retorna la fila guardada
+                guardada = self.save(replace(actual, hora_entrada=asistencia.hora_entrada, estado=asistencia.estado))
+            else:
+                guardada = self.save(asistencia)
+            resultados.append((guardada, actual is None))
+        return resultados
+
+    def _actualizar_justificaciones(self, asistencia_ids: Iterable[int], actualizar) -> Tuple[List[int], List[int]]:
+        actualizadas, omitidas = [], []
+        for asistencia_id in sorted(set(asistencia_ids)):
+            asistencia = self._asistencias.get(asistencia_id)
+            if asistencia is None:
+                continue
+            if asistencia.es_justificada():
+                actualizar(asistencia)
+                self._devolver_ticket(asistencia)
+                actualizadas.append(asistencia_id)
+            else:
+                omitidas.append(asistencia_id)
+        return actualizadas, omitidas
+
+    def aprobar_justificaciones(self, asistencia_ids: Iterable[int], hora: time) -> Tuple[List[int], List[int]]:
+        def aprobar(asistencia: Asistencia):
+            asistencia.hora_entrada = hora
+            asistencia.hora_salida = hora
+        return self._actualizar_justificaciones(asistencia_ids, aprobar)
+
+    def rechazar_justificaciones(self, asistencia_ids: Iterable[int], motivo_rechazo: str) -> Tuple[List[int], List[int]]:
+        def rechazar(asistencia: Asistencia):
+            asistencia.motivo = f"{asistencia.motivo or ''} [RECHAZADO: {motivo_rechazo}]"
+        return self._actualizar_justificaciones(asistencia_ids, rechazar)
+
+    def count_by_estado_and_fecha(self, estado: EstadoAsistenciaEnum, fecha: date) -> int:
+        return sum(1 for a in self._asistencias.values() if a.estado == estado and a.fecha == fecha)
+
+    def get_horas_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, float]:
+        segundos: Counter = Counter()
+        for a in self._asistencias.values():
+            if not (fecha_inicio <= a.fecha <= fecha_fin and a.hora_entrada and a.hora_salida):
+                continue
+            if self.practicantes_activos and a.practicante_id not in self.practicantes_activos:
+                continue
+            diferencia = datetime.combine(a.fecha, a.hora_salida) - datetime.combine(a.fecha, a.hora_entrada)
+            if diferencia.total_seconds() > 0:
+                segundos[a.practicante_id] += diferencia.total_seconds()
+        return {practicante_id: round(total / 3600, 2) for practicante_id, total in segundos.items()}
+
+    def count_tickets_mes(self, practicante_id: int, fecha_inicio: date, fecha_fin: date) -> int:
+        return self.count_tickets_by_practicante([practicante_id], fecha_inicio, fecha_fin).get(practicante_id, 0)
+
+    def count_tickets_by_practicante(
+        self,
+        practicante_ids: Iterable[int],
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> Dict[int, int]:
+        practicante_ids = set(practicante_ids)
+        desde, hasta = _mes_de(fecha_inicio), _mes_de(fecha_fin)
+        totales: Counter = Counter()
+        for (practicante_id, mes), usados in self._tickets.items():
+            if practicante_id in practicante_ids and desde <= mes <= hasta and usados:
+                totales[practicante_id] += usados
+        return dict(totales)
+
+    def counts_by_estado_for_fecha(self, fecha: date) -> Dict[EstadoAsistenciaEnum, int]:
+        conteos = {estado: 0 for estado in EstadoAsistenciaEnum}
+        for asistencia in self.get_by_fecha(fecha):
+            conteos[asistencia.estado] += 1
+        return conteos
+
+    def get_resumen_fecha(self, fecha: date, dia: DiaSemanaEnum) -> Dict[str, int]:
+        conteos = self.counts_by_estado_for_fecha(fecha)
+        con_clase = set()
+        if self.horario_repo is not None:
+            con_clase = {h.practicante_id for h in self.horario_repo.get_by_dia(dia)}
+        return {
+            'presentes': conteos[EstadoAsistenciaEnum.PRESENTE],
+            'tardanzas': conteos[EstadoAsistenciaEnum.TARDANZA],
+            'ausentes_justificados': conteos[EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO],
+            'ausentes_sin_justificar': conteos[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR],
+            'con_clases': len(con_clase),
+            'activos_sin_clases': len(self.practicantes_activos - con_clase)
+        }
+
+
+class InMemoryAsistenciaRecuperacionRepository(AsistenciaRecuperacionRepository):
+    """
+    Repositorio de recuperaciones en memoria. Recibe opcionalmente el repositorio
+    de asistencias para agrupar minutos por practicante.
+    """
+
+    def __init__(self, asistencia_repo: Optional[AsistenciaRepository] = None):
+        self._recuperaciones: Dict[int, AsistenciaRecuperacion] = {}
+        self._next_id = 1
+        self.asistencia_repo = asistencia_repo
+
+    def get_by_id(self, recuperacion_id: int) -> Optional[AsistenciaRecuperacion]:
+        return self._recuperaciones.get(recuperacion_id)
+
+    def get_by_asistencia(self, asistencia_id: int) -> List[AsistenciaRecuperacion]:
+        return [r for r in self._recuperaciones.values() if r.asistencia_id == asistencia_id]
+
+    def get_all(self, limit: int = 100) -> List[AsistenciaRecuperacion]:
+        return sorted(
+            self._recuperaciones.values(),
+            key=lambda r: (r.fecha_recuperacion, r.id),
+            reverse=True
+        )[:limit]
+
+    def _en_rango(self, fecha_inicio: date, fecha_fin: date) -> List[AsistenciaRecuperacion]:
+        return [r for r in self._recuperaciones.values() if fecha_inicio <= r.fecha_recuperacion <= fecha_fin]
+
+    def get_minutos_por_practicante(self, fecha_inicio: date, fecha_fin: date) -> Dict[int, int]:
+        minutos: Counter = Counter()
+        for r in self._en_rango(fecha_inicio, fecha_fin):
+            asistencia = self.asistencia_repo.get_by_id(r.asistencia_id) if self.asistencia_repo else None
+            if asistencia is not None:
+                minutos[asistencia.practicante_id] += r.duracion_minutos
+        return dict(minutos)
+
+    def get_minutos_por_estado(self, fecha_inicio: date, fecha_fin: date) -> Dict[EstadoRecuperacionEnum, int]:
+        minutos: Counter = Counter()
+        for r in self._en_rango(fecha_inicio, fecha_fin):
+            minutos[r.estado] += r.duracion_minutos
+        return dict(minutos)
+
+    def save(self, recuperacion: AsistenciaRecuperacion) -> AsistenciaRecuperacion:
+        recuperacion.duracion_minutos = calcular_duracion_minutos(recuperacion.hora_entrada, recuperacion.hora_salida)
+        if not recuperacion.id:
+            recuperacion.id = self._next_id
+            self._next_id += 1
+        self._recuperaciones[recuperacion.id] = recuperacion
+        return recuperacion
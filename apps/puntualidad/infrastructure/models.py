@@ -1,5 +1,11 @@
 from django.db import models
+from django.db.models import Q
 from apps.practicantes.infrastructure.models import Practicante
+from apps.puntualidad.domain.entities import extraer_ticket_id, calcular_duracion_minutos
+
+
+# Dominio de versión de datos (ETag) de las vistas de puntualidad
+DOMINIO_VERSION = "puntualidad"
 
 
 class EstadoAsistencia(models.Model):
@@ -74,6 +80,14 @@ class Asistencia(models.Model):
         db_column='estado_id'
     )
     motivo = models.CharField(max_length=255, null=True, blank=True)
+    ticket_id = models.CharField(
+        max_length=50,
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="ID de ticket extraído del motivo al guardar"
+    )
     
     class Meta:
         db_table = "asistencia"
@@ -83,10 +97,28 @@ class Asistencia(models.Model):
         indexes = [
             models.Index(fields=['fecha']),
             models.Index(fields=['practicante', 'fecha']),
+            # Conteos y alertas por estado en una fecha o rango
+            models.Index(fields=['estado', 'fecha'], name='asistencia_estado_fecha_idx'),
+            # Listado de justificaciones (estado + motivo) ordenado por (-fecha, -id);
+            # parcial donde el motor lo soporta. MySQL no admite la condición: Django lo
+            # omite (aviso models.W037) y la migración 0008 crea ahí la versión completa
+            models.Index(
+                fields=['estado', '-fecha', '-id'],
+                name='asistencia_justif_orden_idx',
+                condition=Q(motivo__isnull=False) & ~Q(motivo='')
+            ),
         ]
     
     def __str__(self):
         return f"{self.practicante} - {self.fecha} - {self.estado}"
+    
+    def save(self, *args, **kwargs):
+        # El ticket se deriva del motivo en cada escritura para filtrarlo por índice
+        self.ticket_id = extraer_ticket_id(self.motivo)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'motivo' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'ticket_id'}
+        super().save(*args, **kwargs)
 
 
 class AsistenciaRecuperacion(models.Model):
@@ -111,6 +143,11 @@ class AsistenciaRecuperacion(models.Model):
         choices=EstadoRecuperacion.choices,
         default=EstadoRecuperacion.PENDIENTE
     )
+    duracion_minutos = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Minutos entre hora_entrada y hora_salida, calculados al guardar"
+    )
     
     class Meta:
         db_table = "asistencia_recuperacion"
@@ -123,3 +160,57 @@ class AsistenciaRecuperacion(models.Model):
     
     def __str__(self):
         return f"Recuperación de {self.asistencia} - {self.fecha_recuperacion}"
+    
+    def save(self, *args, **kwargs):
+        # La duración se persiste para sumar horas con agregados en SQL
+        self.duracion_minutos = calcular_duracion_minutos(self.hora_entrada, self.hora_salida)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'hora_entrada', 'hora_salida'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'duracion_minutos'}
+        super().save(*args, **kwargs)
+
+
+class AsistenciaResumenDiario(models.Model):
+    """
+    Resumen diario de asistencia mantenido incrementalmente en cada escritura
+    de Asistencia, para que el resumen del día sea una búsqueda por clave primaria
+    """
+    fecha = models.DateField(primary_key=True)
+    presentes = models.PositiveIntegerField(default=0)
+    tardanzas = models.PositiveIntegerField(default=0)
+    ausentes_justificados = models.PositiveIntegerField(default=0)
+    ausentes_sin_justificar = models.PositiveIntegerField(default=0)
+    con_clases = models.PositiveIntegerField(default=0)
+    activos_sin_clases = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = "asistencia_resumen_diario"
+        verbose_name = "Resumen Diario de Asistencia"
+        verbose_name_plural = "Resúmenes Diarios de Asistencia"
+    
+    def __str__(self):
+        return f"Resumen {self.fecha}"
+
+
+class TicketQuota(models.Model):
+    """
+    Tickets (justificaciones) usados por practicante y mes. Se incrementa con un
+    UPDATE condicional en la misma transacción que la justificación, de modo que
+    el límite mensual se valida sin contar asistencias y sin carreras
+    """
+    practicante = models.ForeignKey(
+        Practicante,
+        on_delete=models.CASCADE,
+        related_name='ticket_quotas'
+    )
+    year_month = models.CharField(max_length=7, help_text="Mes en formato YYYY-MM")
+    used = models.PositiveSmallIntegerField(default=0)
+    
+    class Meta:
+        db_table = "ticket_quota"
+        verbose_name = "Cupo de Tickets"
+        verbose_name_plural = "Cupos de Tickets"
+        unique_together = [['practicante', 'year_month']]
+    
+    def __str__(self):
+        return f"{self.practicante_id} - {self.year_month}: {self.used}"
@@ -0,0 +1,43 @@
+import base64
+import binascii
+from datetime import date
+from typing import Optional, Tuple
+
+from django.db.models import Q
+
+
+TAMANO_PAGINA_DEFECTO = 50
+TAMANO_PAGINA_MAXIMO = 200
+
+CursorFechaId = Tuple[date, int]
+
+
+def codificar_cursor(fecha: date, asistencia_id: int) -> str:
+    """Genera un cursor opaco a partir de la última fila (fecha, id) de la página"""
+    valor = f"{fecha.isoformat()}:{asistencia_id}".encode()
+    return base64.urlsafe_b64encode(valor).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> CursorFechaId:
+    """Obtiene (fecha, id) de un cursor; lanza ValueError si no es válido"""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        fecha_str, id_str = base64.urlsafe_b64decode(cursor + relleno).decode().split(':')
+        return date.fromisoformat(fecha_str), int(id_str)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Cursor inválido")
+
+
+def filtro_despues_de(cursor: Optional[CursorFechaId]) -> Q:
+    """Condición keyset para el orden (-fecha, -id): filas posteriores al cursor"""
+    if cursor is None:
+        return Q()
+    fecha, asistencia_id = cursor
+    return Q(fecha__lt=fecha) | Q(fecha=fecha, id__lt=asistencia_id)
+
+
+def obtener_limite(valor: Optional[str]) -> int:
+    """Normaliza el tamaño de página solicitado; lanza ValueError si no es numérico"""
+    if not valor:
+        return TAMANO_PAGINA_DEFECTO
+    return max(1, min(int(valor), TAMANO_PAGINA_MAXIMO))
@@ -0,0 +1,205 @@
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, FilteredRelation, OuterRef, Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.practicantes.infrastructure.models import Practicante as PracticanteModel
+from ..domain.entities import EstadoAsistenciaEnum, DiaSemanaEnum
+from .models import (
+    HorarioClases as HorarioClasesModel,
+    Asistencia as AsistenciaModel,
+    AsistenciaResumenDiario as AsistenciaResumenDiarioModel
+)
+from .estado_registry import estado_registry
+from .senales import valores_guardados
+from . import tiempo_real
+
+
+DIAS_SEMANA = (
+    DiaSemanaEnum.LUNES,
+    DiaSemanaEnum.MARTES,
+    DiaSemanaEnum.MIERCOLES,
+    DiaSemanaEnum.JUEVES,
+    DiaSemanaEnum.VIERNES,
+    DiaSemanaEnum.SABADO,
+    DiaSemanaEnum.DOMINGO
+)
+
+COLUMNAS_POR_ESTADO = {
+    EstadoAsistenciaEnum.PRESENTE: 'presentes',
+    EstadoAsistenciaEnum.TARDANZA: 'tardanzas',
+    EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO: 'ausentes_justificados',
+    EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR: 'ausentes_sin_justificar'
+}
+
+CAMPOS_RESUMEN = (
+    'presentes',
+    'tardanzas',
+    'ausentes_justificados',
+    'ausentes_sin_justificar',
+    'con_clases',
+    'activos_sin_clases'
+)
+
+
+def resumen_vacio() -> Dict[str, int]:
+    return {campo: 0 for campo in CAMPOS_RESUMEN}
+
+
+def calcular_resumen(fecha: date) -> Optional[Dict[str, int]]:
+    """
+    Calcula todos los conteos del día en una sola consulta sobre practicante:
+    LEFT JOIN con la asistencia del día (única por practicante y fecha) y
+    EXISTS sobre el horario del día. Retorna None si no hay estados cargados.
+    """
+    ids = estado_registry.get_ids()
+    if not ids:
+        return None
+
+    horario_dia = HorarioClasesModel.objects.filter(
+        practicante_id=OuterRef('pk'),
+        dia_clase=DIAS_SEMANA[fecha.weekday()].value
+    )
+    conteos_estado = {
+        columna: Count('asistencia_dia', filter=Q(asistencia_dia__estado_id=ids[estado]))
+        for estado, columna in COLUMNAS_POR_ESTADO.items()
+    }
+    conteos = PracticanteModel.objects.annotate(
+        asistencia_dia=FilteredRelation('asistencias', condition=Q(asistencias__fecha=fecha)),
+        tiene_clase=Exists(horario_dia)
+    ).aggregate(
+        con_clases=Count('id', filter=Q(tiene_clase=True)),
+        activos_sin_clases=Count('id', filter=Q(estado='activo', tiene_clase=False)),
+        **conteos_estado
+    )
+    return {campo: conteos[campo] or 0 for campo in CAMPOS_RESUMEN}
+
+
+def reconstruir_resumen(fecha: date) -> Dict[str, int]:
+    """Recalcula y guarda la fila de resumen de una fecha"""
+    valores = calcular_resumen(fecha)
+    if valores is None:
+        return resumen_vacio()
+
+    if AsistenciaResumenDiarioModel.objects.filter(fecha=fecha).update(**valores):
+        return valores
+    try:
+        with transaction.atomic():
+            AsistenciaResumenDiarioModel.objects.create(fecha=fecha, **valores)
+    except IntegrityError:
+        # Otra escritura creó la fila en paralelo y ninguno de los dos cálculos vio la
+        # escritura del otro: se descarta la fila y la próxima lectura la recalcula
+        AsistenciaResumenDiarioModel.objects.filter(fecha=fecha).delete()
+    return valores
+
+
+def reconstruir_rango(fecha_inicio: date, fecha_fin: date) -> int:
+    """Reconstruye el resumen de cada día del rango (inclusive); retorna los días procesados"""
+    dias = 0
+    fecha = fecha_inicio
+    while fecha <= fecha_fin:
+        reconstruir_resumen(fecha)
+        fecha += timedelta(days=1)
+        dias += 1
+    return dias
+
+
+def reconstruir_fechas(fechas) -> None:
+    """Reconstruye el resumen de un conjunto de fechas (escrituras masivas)"""
+    for fecha in sorted(set(fechas)):
+        tiempo_real.emitir_resumen(fecha, resumen=reconstruir_resumen(fecha))
+
+
+def obtener_resumen(fecha: date) -> Dict[str, int]:
+    """Obtiene el resumen por clave primaria; lo construye si aún no existe"""
+    fila = AsistenciaResumenDiarioModel.objects.filter(fecha=fecha).values(*CAMPOS_RESUMEN).first()
+    if fila is not None:
+        return fila
+    return reconstruir_resumen(fecha)
+
+
+def _ajustar_contador(fecha: date, estado_id: int, delta: int) -> Tuple[Dict[str, int], bool]:
+    """
+    Aplica el delta a la columna del estado. Retorna los cambios incrementales
+    aplicados y si la fila no existía y se reconstruyó (ya con la escritura incluida)
+    """
+    estado = estado_registry.get_enum(estado_id)
+    columna = COLUMNAS_POR_ESTADO.get(estado)
+    if columna is None:
+        return {}, False
+
+    fila = AsistenciaResumenDiarioModel.objects.filter(fecha=fecha)
+    if fila.update(**{columna: F(columna) + delta}):
+        return {columna: delta}, False
+
+    # La escritura ya está aplicada en asistencia: el recálculo la incluye
+    valores = calcular_resumen(fecha)
+    try:
+        with transaction.atomic():
+            AsistenciaResumenDiarioModel.objects.create(fecha=fecha, **valores)
+    except IntegrityError:
+        # Otra escritura creó la fila en paralelo sin ver esta: se aplica el delta sobre la suya
+        fila.update(**{columna: F(columna) + delta})
+        return {columna: delta}, False
+    tiempo_real.emitir_resumen(fecha, resumen=valores)
+    return {}, True
+
+
+def registrar_cambio_asistencia(
+    fecha_anterior: Optional[date],
+    estado_anterior_id: Optional[int],
+    fecha_nueva: Optional[date],
+    estado_nuevo_id: Optional[int]
+) -> None:
+    """
+    Aplica al resumen diario el cambio de una asistencia ya escrita.
+    Debe llamarse dentro de la misma transacción que la escritura; save() y delete()
+    lo hacen con sus señales, las escrituras por lote usan reconstruir_fechas.
+    """
+    if (fecha_anterior, estado_anterior_id) == (fecha_nueva, estado_nuevo_id):
+        return
+    cambios: Dict[date, Dict[str, int]] = {}
+    # Fechas cuya fila se reconstruyó: el recálculo ya refleja la escritura completa
+    reconstruidas = set()
+    for fecha, estado_id, delta in (
+        (fecha_anterior, estado_anterior_id, -1),
+        (fecha_nueva, estado_nuevo_id, 1)
+    ):
+        if fecha is None or estado_id is None or fecha in reconstruidas:
+            continue
+        cambios_fecha, reconstruida = _ajustar_contador(fecha, estado_id, delta)
+        if reconstruida:
+            reconstruidas.add(fecha)
+            cambios.pop(fecha, None)
+        else:
+            cambios.setdefault(fecha, {}).update(cambios_fecha)
+    # Un solo resumen_delta por fecha afectada
+    for fecha, cambios_fecha in cambios.items():
+        tiempo_real.emitir_resumen(fecha, cambios=cambios_fecha)
+
+
+@receiver(post_save, sender=AsistenciaModel)
+def _contar_asistencia_guardada(sender, instance, **kwargs):
+    anterior = valores_guardados(instance)
+    fecha_anterior, estado_anterior_id = (anterior.fecha, anterior.estado_id) if anterior else (None, None)
+    registrar_cambio_asistencia(fecha_anterior, estado_anterior_id, instance.fecha, instance.estado_id)
+
+
+@receiver(post_delete, sender=AsistenciaModel)
+def _descontar_asistencia_eliminada(sender, instance, **kwargs):
+    cambios, _ = _ajustar_contador(instance.fecha, instance.estado_id, -1)
+    tiempo_real.emitir_resumen(instance.fecha, cambios=cambios)
+
+
+@receiver(post_save, sender=HorarioClasesModel)
+@receiver(post_delete, sender=HorarioClasesModel)
+@receiver(post_save, sender=PracticanteModel)
+@receiver(post_delete, sender=PracticanteModel)
+def _invalidar_resumenes_vigentes(sender, **kwargs):
+    # con_clases y activos_sin_clases dependen de horarios y practicantes:
+    # los días cerrados se conservan y los vigentes se recalculan al leerse
+    AsistenciaResumenDiarioModel.objects.filter(fecha__gte=timezone.now().date()).delete()
@@ -0,0 +1,34 @@
+from datetime import date
+from typing import NamedTuple, Optional
+
+from django.db.models.signals import pre_save
+from django.dispatch import Signal, receiver
+
+from .models import Asistencia as AsistenciaModel
+
+
+# Escrituras de Asistencia por lote (bulk_create / update) que no emiten post_save.
+# Argumento: fechas (conjunto de fechas de las filas escritas)
+asistencias_escritas_en_lote = Signal()
+
+
+class ValoresGuardados(NamedTuple):
+    practicante_id: int
+    fecha: date
+    estado_id: int
+    motivo: Optional[str]
+
+
+def valores_guardados(instance: AsistenciaModel) -> Optional[ValoresGuardados]:
+    """Valores de la fila antes del save() en curso; None si la fila es nueva"""
+    return instance.__dict__.get('_valores_guardados')
+
+
+@receiver(pre_save, sender=AsistenciaModel)
+def _recordar_valores_guardados(sender, instance, **kwargs):
+    # Los receptores del resumen diario y del cupo de tickets ajustan sus contadores
+    # con la diferencia: así cualquier save() los mantiene, también el admin
+    fila = None if instance.pk is None else AsistenciaModel.objects.filter(pk=instance.pk).values_list(
+        *ValoresGuardados._fields
+    ).first()
+    instance._valores_guardados = ValoresGuardados(*fila) if fila else None
@@ -70,3 +70,41 @@ class JustificacionUpdateSerializer(serializers.Serializer):
             })
         return data
 
+MAX_JUSTIFICACIONES_BULK = 500
+
+
+class JustificacionBulkSerializer(serializers.Serializer):
+    """Serializer para aprobar o rechazar varias justificaciones en una solicitud"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_JUSTIFICACIONES_BULK
+    )
+    accion = serializers.ChoiceField(
+        choices=['aprobar', 'rechazar'],
+        required=True
+    )
+    motivo_rechazo = serializers.CharField(
+        max_length=255,
+        required=False,
+        allow_blank=True
+    )
+    
+    def validate(self, data):
+        """Validar que si se rechaza, haya motivo de rechazo"""
+        if data.get('accion') == 'rechazar' and not data.get('motivo_rechazo', '').strip():
+            raise serializers.ValidationError({
+                'motivo_rechazo': 'El motivo de rechazo es requerido cuando se rechaza una justificación'
+            })
+        return data
+
+
+class AsistenciaBulkItemSerializer(serializers.Serializer):
+    """Serializer para cada registro de asistencia del endpoint de carga masiva"""
+    practicante_id = serializers.IntegerField(required=True)
+    fecha = serializers.DateField(required=True)
+    hora_entrada = serializers.TimeField(required=False, allow_null=True)
+    estado = serializers.ChoiceField(
+        choices=['presente', 'tardanza', 'ausente-justificado', 'ausente-sin-justificar'],
+        required=True
+    )
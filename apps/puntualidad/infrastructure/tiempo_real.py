@@ -0,0 +1,113 @@
+import logging
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ..domain.entities import EstadoAsistenciaEnum
+from .estado_registry import estado_registry
+from .models import Asistencia as AsistenciaModel
+
+logger = logging.getLogger(__name__)
+
+GRUPO_PUNTUALIDAD = 'puntualidad'
+
+
+def _enviar(evento: Dict) -> None:
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(
+            GRUPO_PUNTUALIDAD,
+            {
+                'type': 'puntualidad_evento',
+                'message': evento
+            }
+        )
+    except Exception as e:
+        # La difusión nunca debe hacer fallar una escritura ya confirmada
+        logger.warning(f"No se pudo emitir el evento {evento.get('tipo')}: {str(e)}")
+
+
+def emitir(tipo: str, **datos) -> None:
+    """Difunde un evento al grupo de puntualidad cuando se confirma la transacción en curso"""
+    evento = {'tipo': tipo, **datos}
+    transaction.on_commit(lambda: _enviar(evento))
+
+
+def _hora(valor) -> Optional[str]:
+    return valor.isoformat() if valor else None
+
+
+def estado_justificacion(hora_entrada, hora_salida, fecha) -> str:
+    """Mismo criterio que el listado: aprobada con entrada y salida, vencida si la fecha ya pasó"""
+    if hora_entrada and hora_salida:
+        return 'aprobado'
+    return 'pendiente' if fecha >= timezone.localdate() else 'vencido'
+
+
+def _datos_asistencia(asistencia, estado: Optional[EstadoAsistenciaEnum], eliminada: bool) -> Dict:
+    return {
+        'id': asistencia.id,
+        'practicante_id': asistencia.practicante_id,
+        'fecha': asistencia.fecha.isoformat(),
+        'estado': estado.value if estado else None,
+        'hora_entrada': _hora(asistencia.hora_entrada),
+        'hora_salida': _hora(asistencia.hora_salida),
+        'eliminada': eliminada
+    }
+
+
+def _datos_justificacion(asistencia, eliminada: bool) -> Dict:
+    return {
+        'id': asistencia.id,
+        'practicante_id': asistencia.practicante_id,
+        'fecha': asistencia.fecha.isoformat(),
+        'ticket_id': asistencia.ticket_id,
+        'estado': estado_justificacion(asistencia.hora_entrada, asistencia.hora_salida, asistencia.fecha),
+        'eliminada': eliminada
+    }
+
+
+def emitir_asistencias(asistencias: Iterable, eliminadas: bool = False) -> None:
+    """
+    Emite un solo asistencia_changed con las filas escritas (modelos Asistencia)
+    y, si alguna es una justificación con motivo, un solo justificacion_changed
+    """
+    datos_asistencias, datos_justificaciones = [], []
+    for asistencia in asistencias:
+        estado = estado_registry.get_enum(asistencia.estado_id)
+        datos_asistencias.append(_datos_asistencia(asistencia, estado, eliminadas))
+        if estado == EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO and asistencia.motivo and asistencia.motivo.strip():
+            datos_justificaciones.append(_datos_justificacion(asistencia, eliminadas))
+    if datos_asistencias:
+        emitir('asistencia_changed', asistencias=datos_asistencias)
+    if datos_justificaciones:
+        emitir('justificacion_changed', justificaciones=datos_justificaciones)
+
+
+def emitir_resumen(fecha: date, cambios: Optional[Dict[str, int]] = None, resumen: Optional[Dict[str, int]] = None) -> None:
+    """
+    Emite resumen_delta de una fecha: `cambios` con los incrementos por columna
+    o, si el resumen se recalculó completo, `resumen` con los valores nuevos
+    """
+    if cambios:
+        emitir('resumen_delta', fecha=fecha.isoformat(), cambios=cambios)
+    elif resumen is not None:
+        emitir('resumen_delta', fecha=fecha.isoformat(), resumen=resumen)
+
+
+@receiver(post_save, sender=AsistenciaModel)
+def _emitir_asistencia_guardada(sender, instance, **kwargs):
+    emitir_asistencias([instance])
+
+
+@receiver(post_delete, sender=AsistenciaModel)
+def _emitir_asistencia_eliminada(sender, instance, **kwargs):
+    emitir_asistencias([instance], eliminadas=True)
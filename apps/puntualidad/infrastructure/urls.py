@@ -4,11 +4,14 @@ from .views import (
     alertas_puntualidad, 
     practicantes_puntualidad,
     practicantes_activos,
+    matriz_asistencia,
     justificaciones,
     recuperaciones,
     crear_justificacion,
     aprobar_justificacion,
-    rechazar_justificacion
+    rechazar_justificacion,
+    actualizar_justificaciones_bulk,
+    registrar_asistencias_bulk
 )
 
 urlpatterns = [
@@ -16,9 +19,12 @@ urlpatterns = [
     path('alertas/', alertas_puntualidad),
     path('practicantes/', practicantes_puntualidad),
     path('practicantes/activos/', practicantes_activos),
+    path('matriz/', matriz_asistencia),
     path('justificaciones/', justificaciones),
     path('justificaciones/crear/', crear_justificacion),
+    path('justificaciones/bulk/', actualizar_justificaciones_bulk),
     path('justificaciones/<int:pk>/aprobar/', aprobar_justificacion),
     path('justificaciones/<int:pk>/rechazar/', rechazar_justificacion),
     path('recuperaciones/', recuperaciones),
+    path('asistencias/bulk/', registrar_asistencias_bulk),
 ]
@@ -1,324 +1,321 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q, Count, Case, When, IntegerField
-from django.db import OperationalError
+from django.conf import settings
+from django.db.models import Q, Count, Case, When, IntegerField, Window
+from django.db import OperationalError, connection, transaction
 from django.utils import timezone
 from datetime import datetime, time, timedelta
+import asyncio
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from apps.practicantes.infrastructure.models import Practicante
-from apps.puntualidad.infrastructure.models import Asistencia, EstadoAsistencia, HorarioClases, AsistenciaRecuperacion
-from apps.puntualidad.infrastructure.serializers import JustificacionCreateSerializer
+from apps.puntualidad.infrastructure.models import Asistencia, HorarioClases, AsistenciaRecuperacion, DOMINIO_VERSION
+from apps.comun.infrastructure.version_datos import respuesta_condicional
+from apps.puntualidad.infrastructure.serializers import (
+    JustificacionCreateSerializer,
+    JustificacionBulkSerializer,
+    AsistenciaBulkItemSerializer
+)
+from apps.puntualidad.infrastructure.estado_registry import estado_registry
+from apps.puntualidad.infrastructure.horario_indice import horario_indice
+from apps.puntualidad.infrastructure import resumen_diario, cupo_tickets
+from apps.puntualidad.infrastructure.paginacion import (
+    codificar_cursor,
+    decodificar_cursor,
+    filtro_despues_de,
+    obtener_limite
+)
+from apps.puntualidad.infrastructure.django_orm_repository import (
+    DjangoEstadoAsistenciaRepository,
+    DjangoHorarioClasesRepository,
+    DjangoAsistenciaRepository
+)
+from apps.puntualidad.domain.entities import (
+    Asistencia as AsistenciaEntity,
+    EstadoAsistenciaEnum,
+    extraer_ticket_id,
+    MAX_TICKETS_MES,
+    CupoTicketsAgotado
+)
+from apps.puntualidad.application.services import (
+    ResumenPuntualidadService,
+    RegistrarAsistenciasMasivoService,
+    AprobarJustificacionService,
+    RechazarJustificacionService,
+    MatrizAsistenciaService
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+ESTADOS_CLAVES = {
+    'presente': EstadoAsistenciaEnum.PRESENTE,
+    'tardanza': EstadoAsistenciaEnum.TARDANZA,
+    'ausente-justificado': EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+    'ausente-sin-justificar': EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR
+}
+
+
+HORAS_SEMANALES_META = 30
+
+
 def obtener_estado_asistencia():
-    """Obtiene o crea los estados de asistencia necesarios"""
-    try:
-        estados = {}
-        estados_nombres = {
-            'presente': 'Presente',
-            'tardanza': 'Tardanza',
-            'ausente-justificado': 'Ausente Justificado',
-            'ausente-sin-justificar': 'Ausente Sin Justificar'
-        }
-        
-        for key, nombre in estados_nombres.items():
-            estado, _ = EstadoAsistencia.objects.get_or_create(
-                estado=nombre,
-                defaults={'estado': nombre}
-            )
-            estados[key] = estado
-        
-        return estados
-    except OperationalError as e:
-        logger.error(f"Error al obtener estados de asistencia: {str(e)}")
-        # Retornar estados vacíos si las tablas no existen
+    """
+    Obtiene los ids de los estados de asistencia desde el registro en memoria
+    Retorna un dict clave -> estado_id (vacío si las tablas no existen)
+    """
+    ids = estado_registry.get_ids()
+    if not ids:
+        logger.error("Error al obtener estados de asistencia: tablas no disponibles")
         return {}
+    return {key: ids[estado] for key, estado in ESTADOS_CLAVES.items()}
 
 
-@api_view(['GET'])
-def resumen_puntualidad(request):
+async def aobtener_estado_asistencia():
+    """Versión asíncrona de obtener_estado_asistencia para las vistas de lectura"""
+    ids = await estado_registry.aget_ids()
+    if not ids:
+        logger.error("Error al obtener estados de asistencia: tablas no disponibles")
+        return {}
+    return {key: ids[estado] for key, estado in ESTADOS_CLAVES.items()}
+
+
+def _json_error(mensaje, e):
+    return JsonResponse(
+        {"error": mensaje, "detail": str(e)},
+        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    )
+
+
+async def _o_vacio(consulta, vacio):
+    """Espera una consulta y retorna `vacio` si las tablas aún no existen"""
+    try:
+        return await consulta
+    except OperationalError:
+        return vacio
+
+
+async def _listar(queryset):
+    """Evalúa un queryset con el ORM asíncrono"""
+    return [fila async for fila in queryset]
+
+
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION)
+async def resumen_puntualidad(request):
     """
     Endpoint mejorado que devuelve el resumen de puntualidad del día actual
-    Con cálculos optimizados y validaciones robustas
+    Todos los conteos se obtienen en una sola consulta agregada
     """
     try:
-        hoy = timezone.now().date()
-        estados = obtener_estado_asistencia()
-        
-        # Si no hay estados, las tablas probablemente no existen
-        if not estados:
-            return Response({
-                "asistencias": 0,
-                "tardanzas": 0,
-                "faltas": 0,
-                "total": 0,
-                "con_clases": 0,
-                "ausentes_justificados": 0,
-                "ausentes_sin_justificar": 0
-            })
-        
-        # Mapear día de la semana en español
-        dias_semana = {
-            0: 'Lunes', 1: 'Martes', 2: 'Miércoles', 3: 'Jueves',
-            4: 'Viernes', 5: 'Sábado', 6: 'Domingo'
-        }
-        dia_hoy = dias_semana[hoy.weekday()]
-        
-        # Obtener practicantes con clases de forma optimizada
-        try:
-            practicantes_con_clases = set(HorarioClases.objects.filter(
-                dia_clase=dia_hoy
-            ).values_list('practicante_id', flat=True))
-        except OperationalError:
-            practicantes_con_clases = set()
-        
-        # Total de practicantes activos que deben asistir (optimizado)
-        try:
-            total_practicantes = Practicante.objects.filter(
-                estado='activo'
-            ).exclude(id__in=practicantes_con_clases).count()
-        except OperationalError:
-            total_practicantes = 0
-        
-        # Contar asistencias del día de forma optimizada con una sola consulta
-        try:
-            asistencias_hoy = Asistencia.objects.filter(fecha=hoy)
-            
-            # Usar agregación para contar todos los estados en una consulta
-            conteos = asistencias_hoy.values('estado_id').annotate(
-                total=Count('id')
-            )
-            
-            # Inicializar contadores
-            presentes = 0
-            tardanzas = 0
-            ausentes_justificados = 0
-            ausentes_sin_justificar = 0
-            
-            # Mapear conteos usando IDs de estados
-            estado_presente_id = estados.get('presente').id if estados.get('presente') else None
-            estado_tardanza_id = estados.get('tardanza').id if estados.get('tardanza') else None
-            estado_ausente_just_id = estados.get('ausente-justificado').id if estados.get('ausente-justificado') else None
-            estado_ausente_sin_id = estados.get('ausente-sin-justificar').id if estados.get('ausente-sin-justificar') else None
-            
-            for conteo in conteos:
-                estado_id = conteo['estado_id']
-                total = conteo['total']
-                
-                if estado_id == estado_presente_id:
-                    presentes = total
-                elif estado_id == estado_tardanza_id:
-                    tardanzas = total
-                elif estado_id == estado_ausente_just_id:
-                    ausentes_justificados = total
-                elif estado_id == estado_ausente_sin_id:
-                    ausentes_sin_justificar = total
-                    
-        except OperationalError:
-            presentes = 0
-            tardanzas = 0
-            ausentes_justificados = 0
-            ausentes_sin_justificar = 0
-        
-        con_clases = len(practicantes_con_clases)
-        total_deben_asistir = total_practicantes + con_clases
-        
-        data = {
-            "asistencias": presentes,
-            "tardanzas": tardanzas,
-            "faltas": ausentes_justificados + ausentes_sin_justificar,
-            "total": total_deben_asistir,
-            "con_clases": con_clases,
-            "ausentes_justificados": ausentes_justificados,
-            "ausentes_sin_justificar": ausentes_sin_justificar
-        }
-        return Response(data)
+        service = ResumenPuntualidadService(
+            DjangoEstadoAsistenciaRepository(),
+            DjangoAsistenciaRepository(),
+            DjangoHorarioClasesRepository()
+        )
+        return JsonResponse(await sync_to_async(service.execute)(timezone.now().date()))
     except Exception as e:
         logger.error(f"Error en resumen_puntualidad: {str(e)}", exc_info=True)
-        return Response(
-            {"error": "Error al obtener el resumen de puntualidad", "detail": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return _json_error("Error al obtener el resumen de puntualidad", e)
 
 
-@api_view(['GET'])
-def alertas_puntualidad(request):
+def exponer_total_consultas(view_func):
+    """
+    En modo DEBUG agrega el encabezado X-Query-Count con el número de consultas
+    SQL ejecutadas por la vista (síncrona o asíncrona)
+    """
+    def contar(consultas):
+        def wrapper(execute, sql, params, many, context):
+            consultas.append(sql)
+            return execute(sql, params, many, context)
+        return wrapper
+
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not settings.DEBUG:
+                return await view_func(request, *args, **kwargs)
+            # El ORM asíncrono ejecuta las consultas en el hilo de sync_to_async,
+            # cuya conexión es distinta a la visible desde la corrutina
+            consultas = []
+            contador = contar(consultas)
+            await sync_to_async(lambda: connection.execute_wrappers.append(contador))()
+            try:
+                response = await view_func(request, *args, **kwargs)
+            finally:
+                await sync_to_async(lambda: connection.execute_wrappers.remove(contador))()
+            response['X-Query-Count'] = str(len(consultas))
+            return response
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not settings.DEBUG:
+            return view_func(request, *args, **kwargs)
+        consultas = []
+        with connection.execute_wrapper(contar(consultas)):
+            response = view_func(request, *args, **kwargs)
+        response['X-Query-Count'] = str(len(consultas))
+        return response
+    return wrapper
+
+
+async def _top_practicantes(queryset, orden):
+    """
+    Retorna (total, nombres) en una sola consulta: el total se obtiene con
+    COUNT(*) OVER () sobre las mismas filas de las que se toman los 5 primeros
+    """
+    filas = await _listar(
+        queryset.annotate(total_filas=Window(Count('*')))
+        .order_by(*orden)
+        .values_list('practicante__nombre', 'practicante__apellido', 'total_filas')[:5]
+    )
+    if not filas:
+        return 0, []
+    return filas[0][2], [f"{nombre} {apellido}" for nombre, apellido, _ in filas]
+
+
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION)
+@exponer_total_consultas
+async def alertas_puntualidad(request):
     """
     Endpoint que devuelve las alertas automáticas de puntualidad
+    Cada alerta se arma con una sola consulta (total y primeros 5 nombres)
     """
     try:
         hoy = timezone.now().date()
-        estados = obtener_estado_asistencia()
+        estados = await aobtener_estado_asistencia()
         alertas = []
         
         # Si no hay estados, retornar lista vacía
         if not estados:
-            return Response([])
+            return JsonResponse([], safe=False)
         
-        # Alerta 1: Tardanzas potenciales
-        try:
-            tardanzas_hoy = Asistencia.objects.filter(
-                fecha=hoy,
-                estado=estados.get('tardanza')
-            ).select_related('practicante') if estados.get('tardanza') else []
-            
-            if tardanzas_hoy and tardanzas_hoy.exists():
-                practicantes_tardanza = [
-                    f"{a.practicante.nombre} {a.practicante.apellido}"
-                    for a in tardanzas_hoy[:5]
-                ]
-                alertas.append({
-                    "tipo": "tardanza",
-                    "titulo": "Tardanza potencial detectada",
-                    "cantidad": tardanzas_hoy.count(),
-                    "hora": "8:05 a.m.",
-                    "descripcion": "Gracia de 5 minutos aplicada",
-                    "practicantes": practicantes_tardanza
-                })
-        except (OperationalError, AttributeError):
-            pass
+        # Practicantes con clase hoy desde el índice en memoria (sin JOIN con horarios)
+        con_clase_hoy = await horario_indice.aget_practicantes(resumen_diario.DIAS_SEMANA[hoy.weekday()])
+        inicio_mes = hoy.replace(day=1)
+        sin_datos = (0, [])
+        
+        # Consultas en secuencia: el ORM asíncrono las ejecuta en el hilo único de
+        # sync_to_async(thread_sensitive=True), así que lanzarlas juntas no las solapa
         
+        # Alerta 1: Tardanzas potenciales
+        total_tardanzas, practicantes_tardanza = await _o_vacio(_top_practicantes(
+            Asistencia.objects.filter(fecha=hoy, estado_id=estados['tardanza']),
+            ('id',)
+        ), sin_datos)
         # Alerta 2: Ausencias sin clase registrada
-        try:
-            dias_semana = {
-                0: 'Lunes', 1: 'Martes', 2: 'Miércoles', 3: 'Jueves',
-                4: 'Viernes', 5: 'Sábado', 6: 'Domingo'
-            }
-            dia_hoy = dias_semana[hoy.weekday()]
-            practicantes_con_clases = list(HorarioClases.objects.filter(
-                dia_clase=dia_hoy
-            ).values_list('practicante_id', flat=True))
-            
-            ausentes_sin_clase = Asistencia.objects.filter(
+        total_ausentes, practicantes_ausentes = await _o_vacio(_top_practicantes(
+            Asistencia.objects.filter(
                 fecha=hoy,
-                estado=estados.get('ausente-sin-justificar')
+                estado_id=estados['ausente-sin-justificar']
             ).exclude(
-                practicante_id__in=practicantes_con_clases
-            ).select_related('practicante') if estados.get('ausente-sin-justificar') else []
-            
-            if ausentes_sin_clase and ausentes_sin_clase.exists():
-                practicantes_ausentes = [
-                    f"{a.practicante.nombre} {a.practicante.apellido}"
-                    for a in ausentes_sin_clase[:5]
-                ]
-                alertas.append({
-                    "tipo": "ausencia",
-                    "titulo": "Ausencias sin clase registrada",
-                    "cantidad": ausentes_sin_clase.count(),
-                    "hora": "8:30 a.m.",
-                    "descripcion": "No tienen clases programadas hoy",
-                    "practicantes": practicantes_ausentes
-                })
-        except (OperationalError, AttributeError):
-            pass
-        
-        # Alerta 3: Practicantes en riesgo
-        try:
-            inicio_mes = hoy.replace(day=1)
-            practicantes_riesgo = Asistencia.objects.filter(
+                practicante_id__in=con_clase_hoy
+            ),
+            ('id',)
+        ), sin_datos)
+        # Alerta 3: Practicantes en riesgo (3 o más ausencias sin justificar en el mes)
+        total_riesgo, nombres_riesgo = await _o_vacio(_top_practicantes(
+            Asistencia.objects.filter(
                 fecha__gte=inicio_mes,
                 fecha__lte=hoy,
-                estado=estados.get('ausente-sin-justificar')
-            ).values('practicante').annotate(
+                estado_id=estados['ausente-sin-justificar']
+            ).values(
+                'practicante_id', 'practicante__nombre', 'practicante__apellido'
+            ).annotate(
                 total_ausencias=Count('id')
-            ).filter(total_ausencias__gte=3) if estados.get('ausente-sin-justificar') else []
-            
-            if practicantes_riesgo and practicantes_riesgo.exists():
-                nombres_riesgo = []
-                for p in practicantes_riesgo[:5]:
-                    try:
-                        practicante = Practicante.objects.get(id=p['practicante'])
-                        nombres_riesgo.append(f"{practicante.nombre} {practicante.apellido}")
-                    except Practicante.DoesNotExist:
-                        continue
-                
-                if nombres_riesgo:
-                    alertas.append({
-                        "tipo": "riesgo",
-                        "titulo": "Practicantes en riesgo",
-                        "cantidad": len(nombres_riesgo),
-                        "hora": "9:15 a.m.",
-                        "descripcion": "3er ticket del mes alcanzado",
-                        "practicantes": nombres_riesgo
-                    })
-        except (OperationalError, AttributeError):
-            pass
-        
-        return Response(alertas)
+            ).filter(total_ausencias__gte=3),
+            ('-total_ausencias', 'practicante_id')
+        ), sin_datos)
+        
+        if total_tardanzas:
+            alertas.append({
+                "tipo": "tardanza",
+                "titulo": "Tardanza potencial detectada",
+                "cantidad": total_tardanzas,
+                "hora": "8:05 a.m.",
+                "descripcion": "Gracia de 5 minutos aplicada",
+                "practicantes": practicantes_tardanza
+            })
+        if total_ausentes:
+            alertas.append({
+                "tipo": "ausencia",
+                "titulo": "Ausencias sin clase registrada",
+                "cantidad": total_ausentes,
+                "hora": "8:30 a.m.",
+                "descripcion": "No tienen clases programadas hoy",
+                "practicantes": practicantes_ausentes
+            })
+        if total_riesgo:
+            alertas.append({
+                "tipo": "riesgo",
+                "titulo": "Practicantes en riesgo",
+                "cantidad": total_riesgo,
+                "hora": "9:15 a.m.",
+                "descripcion": "3er ticket del mes alcanzado",
+                "practicantes": nombres_riesgo
+            })
+        
+        return JsonResponse(alertas, safe=False)
     except Exception as e:
         logger.error(f"Error en alertas_puntualidad: {str(e)}", exc_info=True)
-        return Response(
-            {"error": "Error al obtener las alertas", "detail": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return _json_error("Error al obtener las alertas", e)
 
 
-@api_view(['GET'])
-def practicantes_puntualidad(request):
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION)
+async def practicantes_puntualidad(request):
     """
     Endpoint que devuelve la lista de practicantes con su estado de asistencia del día
+    Practicantes, asistencias del día y horas semanales se leen con una consulta cada uno
     """
     try:
         hoy = timezone.now().date()
-        estados = obtener_estado_asistencia()
+        estados = await aobtener_estado_asistencia()
         
         # Si no hay estados, retornar lista vacía
         if not estados:
-            return Response([])
+            return JsonResponse([], safe=False)
         
-        # Obtener todos los practicantes activos
-        try:
-            practicantes = Practicante.objects.filter(estado='activo').order_by('apellido', 'nombre')
-        except OperationalError:
-            return Response([])
+        # Horas trabajadas en la semana actual (lunes a hoy) en una sola consulta agrupada
+        inicio_semana = hoy - timedelta(days=hoy.weekday())
+        repo = DjangoAsistenciaRepository()
         
-        # Obtener asistencias del día
-        try:
-            asistencias_hoy = {
-                a.practicante_id: a
-                for a in Asistencia.objects.filter(fecha=hoy).select_related('practicante', 'estado')
-            }
-        except OperationalError:
-            asistencias_hoy = {}
+        # Todos los practicantes activos
+        practicantes = await _o_vacio(_listar(
+            Practicante.objects.filter(estado='activo').order_by('apellido', 'nombre')
+        ), None)
+        if practicantes is None:
+            return JsonResponse([], safe=False)
         
-        # Obtener horarios de clases
-        try:
-            horarios = {
-                h.practicante_id: h
-                for h in HorarioClases.objects.filter(
-                    practicante__in=practicantes
-                ).select_related('practicante')
-            }
-        except OperationalError:
-            horarios = {}
+        # Asistencias del día
+        asistencias = await _o_vacio(_listar(Asistencia.objects.filter(fecha=hoy)), [])
+        horas_semana = await sync_to_async(repo.get_horas_por_practicante)(inicio_semana, hoy)
+        
+        asistencias_hoy = {a.practicante_id: a for a in asistencias}
+        claves_por_estado_id = {estado_id: key for key, estado_id in estados.items()}
         
         data = []
         for practicante in practicantes:
             asistencia = asistencias_hoy.get(practicante.id)
             
             # Determinar estado
-            if asistencia and asistencia.estado:
-                estado_nombre = asistencia.estado.estado.lower()
-                if 'presente' in estado_nombre:
-                    estado = 'presente'
-                elif 'tardanza' in estado_nombre:
-                    estado = 'tardanza'
-                elif 'justificado' in estado_nombre:
-                    estado = 'ausente-justificado'
-                else:
-                    estado = 'ausente-sin-justificar'
+            if asistencia and asistencia.estado_id:
+                estado = claves_por_estado_id.get(asistencia.estado_id, 'ausente-sin-justificar')
                 
                 hora_entrada = asistencia.hora_entrada.strftime('%I:%M %p') if asistencia.hora_entrada else None
             else:
                 estado = 'ausente-sin-justificar'
                 hora_entrada = None
             
-            # Calcular horas semanales (simulado por ahora)
-            horas_completadas = 24
-            horas_totales = 30
+            # Horas semanales reales frente a la meta semanal
+            horas_completadas = round(horas_semana.get(practicante.id, 0), 1)
+            horas_totales = HORAS_SEMANALES_META
             
             practicante_data = {
                 "id": practicante.id,
@@ -327,7 +324,7 @@ def practicantes_puntualidad(request):
                 "equipo": "Rpsoft",  # Esto debería venir de otro modelo o campo
                 "team": "Team Alpha",  # Esto debería venir de otro modelo o campo
                 "horaIngreso": hora_entrada,
-                "horasSemanales": f"{horas_completadas}/{horas_totales}",
+                "horasSemanales": f"{horas_completadas:g}/{horas_totales}",
                 "horasCompletadas": horas_completadas,
                 "horasTotales": horas_totales,
                 "estado": estado
@@ -338,53 +335,144 @@ def practicantes_puntualidad(request):
             
             data.append(practicante_data)
         
-        return Response(data)
+        return JsonResponse(data, safe=False)
     except Exception as e:
         logger.error(f"Error en practicantes_puntualidad: {str(e)}", exc_info=True)
-        return Response(
-            {"error": "Error al obtener la lista de practicantes", "detail": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        return _json_error("Error al obtener la lista de practicantes", e)
+
+
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION)
+async def matriz_asistencia(request):
+    """
+    Endpoint que devuelve la matriz de asistencia practicante x día en formato columnar
+    - desde / hasta: rango de fechas (YYYY-MM-DD), por defecto los últimos 7 días
+    Respuesta: practicantes, fechas, estados (código -> estado, 0 = sin registro) y
+    codigos, donde codigos[i * len(fechas) + j] es el estado del practicante i el día j
+    """
+    try:
+        try:
+            hasta = request.GET.get('hasta')
+            hasta = datetime.strptime(hasta, '%Y-%m-%d').date() if hasta else timezone.now().date()
+            desde = request.GET.get('desde')
+            desde = datetime.strptime(desde, '%Y-%m-%d').date() if desde else hasta - timedelta(days=6)
+        except ValueError:
+            return JsonResponse(
+                {"error": "Parámetros inválidos", "detalle": "desde/hasta deben ser YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Los practicantes activos tienen fila aunque no registren asistencia en el rango
+        activos = await _o_vacio(
+            _listar(Practicante.objects.filter(estado='activo').values_list('id', flat=True)),
+            []
         )
+        service = MatrizAsistenciaService(DjangoAsistenciaRepository())
+        try:
+            data = await sync_to_async(service.execute)(desde, hasta, activos)
+        except ValueError as e:
+            return JsonResponse(
+                {"error": "Parámetros inválidos", "detalle": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return JsonResponse(data)
+    except Exception as e:
+        logger.error(f"Error en matriz_asistencia: {str(e)}", exc_info=True)
+        return _json_error("Error al obtener la matriz de asistencia", e)
 
 
-@api_view(['GET'])
-def justificaciones(request):
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION, ventana=60)  # slaRestante cambia cada minuto
+async def justificaciones(request):
     """
     Endpoint mejorado que devuelve la lista de justificaciones (asistencias ausentes justificadas)
-    Con mejor cálculo de SLA y validaciones robustas
+    Paginado por cursor sobre (fecha, id) con filtros aplicados en SQL:
+    - desde / hasta: rango de fechas (YYYY-MM-DD)
+    - estado: pendiente, aprobado o vencido
+    - ticket: ID de ticket (TKT-123), búsqueda por índice
+    - limite: tamaño de página (máximo 200)
+    - cursor: valor "next" de la página anterior
     """
+    pagina_vacia = {"results": [], "next": None}
     try:
-        estados = obtener_estado_asistencia()
+        try:
+            desde = request.GET.get('desde')
+            desde = datetime.strptime(desde, '%Y-%m-%d').date() if desde else None
+            hasta = request.GET.get('hasta')
+            hasta = datetime.strptime(hasta, '%Y-%m-%d').date() if hasta else None
+            cursor = request.GET.get('cursor')
+            cursor = decodificar_cursor(cursor) if cursor else None
+            limite = obtener_limite(request.GET.get('limite'))
+        except ValueError:
+            return JsonResponse(
+                {"error": "Parámetros inválidos", "detalle": "desde/hasta deben ser YYYY-MM-DD y cursor/limite válidos"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        estado_filtro = request.GET.get('estado')
+        if estado_filtro and estado_filtro not in ('pendiente', 'aprobado', 'vencido'):
+            return JsonResponse(
+                {"error": "Parámetros inválidos", "detalle": "estado debe ser pendiente, aprobado o vencido"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        estados = await aobtener_estado_asistencia()
         
         if not estados or not estados.get('ausente-justificado'):
-            return Response([])
+            return JsonResponse(pagina_vacia)
         
-        estado_justificado = estados['ausente-justificado']
+        estado_justificado_id = estados['ausente-justificado']
         
-        # Obtener asistencias justificadas que tienen motivo (ticket) - optimizado
+        # Obtener una página de asistencias justificadas que tienen motivo (ticket)
         try:
             asistencias_justificadas = Asistencia.objects.filter(
-                estado=estado_justificado,
+                estado_id=estado_justificado_id,
                 motivo__isnull=False
-            ).exclude(motivo='').select_related('practicante', 'estado').order_by('-fecha', '-id')
+            ).exclude(motivo='')
+            if desde:
+                asistencias_justificadas = asistencias_justificadas.filter(fecha__gte=desde)
+            if hasta:
+                asistencias_justificadas = asistencias_justificadas.filter(fecha__lte=hasta)
+            ticket = request.GET.get('ticket', '').strip()
+            if ticket:
+                asistencias_justificadas = asistencias_justificadas.filter(
+                    ticket_id=extraer_ticket_id(ticket) or ticket.upper()
+                )
+            
+            # Aprobada = tiene hora de entrada y salida; vencida = pendiente con el SLA de 24h agotado
+            aprobada = Q(hora_entrada__isnull=False, hora_salida__isnull=False)
+            if estado_filtro == 'aprobado':
+                asistencias_justificadas = asistencias_justificadas.filter(aprobada)
+            elif estado_filtro == 'pendiente':
+                asistencias_justificadas = asistencias_justificadas.exclude(aprobada).filter(
+                    fecha__gte=timezone.localdate()
+                )
+            elif estado_filtro == 'vencido':
+                asistencias_justificadas = asistencias_justificadas.exclude(aprobada).filter(
+                    fecha__lt=timezone.localdate()
+                )
+            
+            asistencias_justificadas = await _listar(
+                asistencias_justificadas.filter(filtro_despues_de(cursor))
+                .select_related('practicante')
+                .order_by('-fecha', '-id')[:limite + 1]
+            )
         except OperationalError:
-            return Response([])
+            return JsonResponse(pagina_vacia)
         
-        # Obtener el mes actual para contar tickets
-        hoy = timezone.now().date()
-        inicio_mes = hoy.replace(day=1)
+        siguiente = None
+        if len(asistencias_justificadas) > limite:
+            asistencias_justificadas = asistencias_justificadas[:limite]
+            ultima = asistencias_justificadas[-1]
+            siguiente = codificar_cursor(ultima.fecha, ultima.id)
         
-        # Optimizar: obtener todos los tickets del mes en una consulta
+        # Tickets del mes actual de los practicantes de la página, leídos del contador
         try:
-            tickets_mes_por_practicante = dict(
-                Asistencia.objects.filter(
-                    estado=estado_justificado,
-                    motivo__isnull=False,
-                    fecha__gte=inicio_mes,
-                    fecha__lte=hoy
-                ).exclude(motivo='').values('practicante_id').annotate(
-                    total=Count('id')
-                ).values_list('practicante_id', 'total')
+            hoy = timezone.now().date()
+            tickets_mes_por_practicante = await sync_to_async(cupo_tickets.tickets_usados_por_practicante)(
+                {a.practicante_id for a in asistencias_justificadas},
+                hoy.replace(day=1),
+                hoy
             )
         except OperationalError:
             tickets_mes_por_practicante = {}
@@ -453,15 +541,10 @@ def justificaciones(request):
                     except (ValueError, AttributeError):
                         pass
                 
-                # Extraer ticket ID del motivo si es posible
-                ticket_id = f"TKT-{asistencia.id}"
-                if asistencia.motivo:
-                    import re
-                    ticket_match = re.search(r'TKT-?\d+', asistencia.motivo, re.IGNORECASE)
-                    if ticket_match:
-                        ticket_id = ticket_match.group(0).upper()
-                    elif len(asistencia.motivo) <= 20:
-                        ticket_id = asistencia.motivo
+                # Ticket ID extraído del motivo al guardar
+                ticket_id = asistencia.ticket_id or f"TKT-{asistencia.id}"
+                if not asistencia.ticket_id and asistencia.motivo and len(asistencia.motivo) <= 20:
+                    ticket_id = asistencia.motivo
                 
                 justificacion_data = {
                     "id": asistencia.id,
@@ -475,7 +558,7 @@ def justificaciones(request):
                     "revisado": revisado_str,
                     "tieneEvidencia": bool(asistencia.motivo and len(asistencia.motivo.strip()) > 0),
                     "ticketsMes": tickets_mes,
-                    "ticketsMax": 3,
+                    "ticketsMax": MAX_TICKETS_MES,
                     "estado": estado_just,
                     "slaRestante": sla_restante,
                     "motivoRechazo": motivo_rechazo
@@ -486,17 +569,15 @@ def justificaciones(request):
                 logger.warning(f"Error procesando justificación {asistencia.id}: {str(item_error)}")
                 continue
         
-        return Response(data)
+        return JsonResponse({"results": data, "next": siguiente})
     except Exception as e:
         logger.error(f"Error en justificaciones: {str(e)}", exc_info=True)
-        return Response(
-            {"error": "Error al obtener las justificaciones", "detail": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return _json_error("Error al obtener las justificaciones", e)
 
 
-@api_view(['GET'])
-def recuperaciones(request):
+@require_GET
+@respuesta_condicional(DOMINIO_VERSION)
+async def recuperaciones(request):
     """
     Endpoint que devuelve la lista de recuperaciones de horas
     Versión simplificada y robusta que siempre devuelve una respuesta válida
@@ -515,19 +596,19 @@ def recuperaciones(request):
             ).order_by('-fecha_recuperacion', '-id')
             
             # Convertir a lista para evitar problemas de lazy evaluation
-            recuperaciones = list(recuperaciones_queryset[:100])  # Limitar a 100 para evitar problemas de memoria
+            recuperaciones = await _listar(recuperaciones_queryset[:100])  # Limitar a 100 para evitar problemas de memoria
             
         except OperationalError as op_error:
             # Si las tablas no existen, retornar lista vacía
             logger.info(f"Tablas no existen aún: {str(op_error)}")
-            return Response([])
+            return JsonResponse([], safe=False)
         except Exception as db_error:
             logger.warning(f"Error de base de datos en recuperaciones: {str(db_error)}")
-            return Response([])
+            return JsonResponse([], safe=False)
         
         # Si no hay recuperaciones, retornar lista vacía
         if not recuperaciones:
-            return Response([])
+            return JsonResponse([], safe=False)
         
         # Procesar cada recuperación
         for recuperacion in recuperaciones:
@@ -549,30 +630,9 @@ def recuperaciones(request):
                     # Capturar cualquier excepción relacionada con la relación
                     continue
                 
-                # Calcular horas completadas
-                horas_completadas = 0
-                horas_totales = 6
-                
-                if (recuperacion.hora_entrada and 
-                    recuperacion.hora_salida and 
-                    recuperacion.fecha_recuperacion):
-                    try:
-                        entrada = datetime.combine(
-                            recuperacion.fecha_recuperacion, 
-                            recuperacion.hora_entrada
-                        )
-                        salida = datetime.combine(
-                            recuperacion.fecha_recuperacion, 
-                            recuperacion.hora_salida
-                        )
-                        
-                        if salida > entrada:
-                            diferencia = salida - entrada
-                            horas_completadas = round(diferencia.total_seconds() / 3600, 2)
-                            horas_completadas = min(horas_completadas, 12)  # Máximo 12 horas
-                            horas_totales = max(horas_totales, int(horas_completadas))
-                    except (ValueError, TypeError, AttributeError):
-                        horas_completadas = 0
+                # Horas completadas desde la duración persistida al guardar (máximo 12 horas)
+                horas_completadas = round(recuperacion.duracion_minutos / 60, 2)
+                horas_totales = max(6, int(horas_completadas))
                 
                 # Tipo de evidencia
                 tipo_evidencia = 'trello'
@@ -611,15 +671,10 @@ def recuperaciones(request):
                 if horas_completadas >= horas_totales:
                     estado_frontend = 'completado'
                 
-                # Ticket ID
-                ticket_id = f"TKT-{asistencia.id}"
-                if asistencia.motivo:
-                    import re
-                    ticket_match = re.search(r'TKT-?\d+', str(asistencia.motivo), re.IGNORECASE)
-                    if ticket_match:
-                        ticket_id = ticket_match.group(0).upper()
-                    elif len(str(asistencia.motivo)) <= 20:
-                        ticket_id = str(asistencia.motivo)
+                # Ticket ID extraído del motivo al guardar
+                ticket_id = asistencia.ticket_id or f"TKT-{asistencia.id}"
+                if not asistencia.ticket_id and asistencia.motivo and len(str(asistencia.motivo)) <= 20:
+                    ticket_id = str(asistencia.motivo)
                 
                 # Construir datos de recuperación
                 recuperacion_data = {
@@ -645,16 +700,17 @@ def recuperaciones(request):
                 continue
         
         # Siempre retornar una lista, incluso si está vacía
-        return Response(data)
+        return JsonResponse(data, safe=False)
         
     except Exception as e:
         logger.error(f"Error crítico en recuperaciones: {str(e)}", exc_info=True)
         # En caso de error crítico, retornar lista vacía en lugar de error
         # Esto evita que el frontend muestre un error cuando simplemente no hay datos
-        return Response([])
+        return JsonResponse([], safe=False)
 
 
 @api_view(['GET'])
+@respuesta_condicional(DOMINIO_VERSION)
 def practicantes_activos(request):
     """
     Endpoint simple para obtener lista de practicantes activos
@@ -714,79 +770,40 @@ def crear_justificacion(request):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        estado_justificado = estados['ausente-justificado']
-        
-        # Validar límite de tickets del mes (máximo 3)
-        hoy = timezone.now().date()
-        inicio_mes = hoy.replace(day=1)
+        estado_justificado_id = estados['ausente-justificado']
         
+        # El save() consume el ticket con un UPDATE condicional en la misma transacción
+        # que la escritura (señal pre_save): el límite mensual no requiere contar asistencias
         try:
-            tickets_mes = Asistencia.objects.filter(
-                practicante_id=practicante_id,
-                estado=estado_justificado,
-                motivo__isnull=False,
-                fecha__gte=inicio_mes,
-                fecha__lte=hoy
-            ).exclude(motivo='').count()
-            
-            if tickets_mes >= 3:
-                return Response(
-                    {
-                        "error": "Límite de tickets alcanzado",
-                        "mensaje": f"Ya has usado {tickets_mes}/3 tickets este mes. El límite es de 3 tickets por mes."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except OperationalError:
-            # Si hay error de BD, continuar pero registrar
-            logger.warning("No se pudo verificar límite de tickets")
-        
-        # Verificar si ya existe una asistencia para esta fecha
-        try:
-            asistencia_existente = Asistencia.objects.filter(
-                practicante_id=practicante_id,
-                fecha=fecha
-            ).first()
-            
-            if asistencia_existente:
-                # Si ya existe, actualizar el estado y motivo
-                asistencia_existente.estado = estado_justificado
-                asistencia_existente.motivo = motivo_final
-                asistencia_existente.save()
+            with transaction.atomic():
+                asistencia_existente = Asistencia.objects.select_for_update().filter(
+                    practicante_id=practicante_id,
+                    fecha=fecha
+                ).first()
                 
-                return Response(
-                    {
-                        "mensaje": "Justificación actualizada exitosamente",
-                        "id": asistencia_existente.id,
-                        "tickets_mes": tickets_mes + 1,
-                        "tickets_max": 3
-                    },
-                    status=status.HTTP_200_OK
-                )
-        except OperationalError:
-            pass
-        
-        # Crear nueva asistencia con estado justificado
-        try:
-            nueva_asistencia = Asistencia.objects.create(
-                practicante_id=practicante_id,
-                fecha=fecha,
-                estado=estado_justificado,
-                motivo=motivo_final,
-                hora_entrada=None,  # Se establecerá cuando se apruebe
-                hora_salida=None
-            )
-            
+                if asistencia_existente:
+                    # Si ya existe, actualizar el estado y motivo
+                    asistencia_existente.estado_id = estado_justificado_id
+                    asistencia_existente.motivo = motivo_final
+                    asistencia_existente.save()
+                else:
+                    # Crear nueva asistencia con estado justificado
+                    nueva_asistencia = Asistencia.objects.create(
+                        practicante_id=practicante_id,
+                        fecha=fecha,
+                        estado_id=estado_justificado_id,
+                        motivo=motivo_final,
+                        hora_entrada=None,  # Se establecerá cuando se apruebe
+                        hora_salida=None
+                    )
+                tickets_mes = cupo_tickets.tickets_usados(practicante_id, fecha, fecha)
+        except CupoTicketsAgotado as cupo:
             return Response(
                 {
-                    "mensaje": "Justificación creada exitosamente",
-                    "id": nueva_asistencia.id,
-                    "tickets_mes": tickets_mes + 1,
-                    "tickets_max": 3,
-                    "sla_horas": 24,
-                    "tiene_evidencia": tiene_evidencia
+                    "error": "Límite de tickets alcanzado",
+                    "mensaje": f"Ya has usado {cupo.usados}/{cupo.maximo} tickets este mes. El límite es de {cupo.maximo} tickets por mes."
                 },
-                status=status.HTTP_201_CREATED
+                status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as create_error:
             logger.error(f"Error al crear justificación: {str(create_error)}")
@@ -794,6 +811,29 @@ def crear_justificacion(request):
                 {"error": "Error al crear la justificación", "detalle": str(create_error)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        
+        if asistencia_existente:
+            return Response(
+                {
+                    "mensaje": "Justificación actualizada exitosamente",
+                    "id": asistencia_existente.id,
+                    "tickets_mes": tickets_mes,
+                    "tickets_max": MAX_TICKETS_MES
+                },
+                status=status.HTTP_200_OK
+            )
+        
+        return Response(
+            {
+                "mensaje": "Justificación creada exitosamente",
+                "id": nueva_asistencia.id,
+                "tickets_mes": tickets_mes,
+                "tickets_max": MAX_TICKETS_MES,
+                "sla_horas": 24,
+                "tiene_evidencia": tiene_evidencia
+            },
+            status=status.HTTP_201_CREATED
+        )
             
     except Exception as e:
         logger.error(f"Error en crear_justificacion: {str(e)}", exc_info=True)
@@ -803,6 +843,83 @@ def crear_justificacion(request):
         )
 
 
+MAX_ASISTENCIAS_BULK = 500
+
+
+@api_view(['POST'])
+def registrar_asistencias_bulk(request):
+    """
+    Endpoint para registrar check-ins en lote (usado por el bot de Discord)
+    Recibe una lista de {practicante_id, fecha, hora_entrada, estado} y la inserta
+    o actualiza por (practicante, fecha) en una sola transacción.
+    Retorna un resultado por elemento en el mismo orden.
+    """
+    try:
+        items = request.data.get('asistencias') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "Datos inválidos", "detalle": "Se espera una lista no vacía de asistencias"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > MAX_ASISTENCIAS_BULK:
+            return Response(
+                {"error": "Datos inválidos", "detalle": f"Máximo {MAX_ASISTENCIAS_BULK} asistencias por solicitud"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        resultados = [None] * len(items)
+        validos = []
+        for indice, item in enumerate(items):
+            serializer = AsistenciaBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                validos.append((indice, serializer.validated_data))
+            else:
+                resultados[indice] = {"indice": indice, "resultado": "error", "errores": serializer.errors}
+        
+        # Validar practicantes activos en una sola consulta
+        practicantes_activos = set(Practicante.objects.filter(
+            id__in={datos['practicante_id'] for _, datos in validos},
+            estado='activo'
+        ).values_list('id', flat=True))
+        
+        indices, asistencias = [], []
+        for indice, datos in validos:
+            if datos['practicante_id'] not in practicantes_activos:
+                resultados[indice] = {
+                    "indice": indice,
+                    "resultado": "error",
+                    "errores": {"practicante_id": ["El practicante no existe o no está activo"]}
+                }
+                continue
+            indices.append(indice)
+            asistencias.append(AsistenciaEntity(
+                practicante_id=datos['practicante_id'],
+                fecha=datos['fecha'],
+                hora_entrada=datos.get('hora_entrada'),
+                estado=ESTADOS_CLAVES[datos['estado']]
+            ))
+        
+        if asistencias:
+            service = RegistrarAsistenciasMasivoService(DjangoAsistenciaRepository())
+            for indice, resultado in zip(indices, service.execute(asistencias)):
+                resultados[indice] = {"indice": indice, **resultado}
+        
+        return Response(
+            {
+                "procesados": len(asistencias),
+                "errores": len(items) - len(asistencias),
+                "resultados": resultados
+            },
+            status=status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.error(f"Error en registrar_asistencias_bulk: {str(e)}", exc_info=True)
+        return Response(
+            {"error": "Error al procesar la solicitud", "detalle": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['POST'])
 def aprobar_justificacion(request, pk):
     """
@@ -811,7 +928,7 @@ def aprobar_justificacion(request, pk):
     """
     try:
         try:
-            asistencia = Asistencia.objects.select_related('practicante', 'estado').get(id=pk)
+            asistencia = Asistencia.objects.get(id=pk)
         except Asistencia.DoesNotExist:
             return Response(
                 {"error": "La justificación no existe"},
@@ -819,10 +936,10 @@ def aprobar_justificacion(request, pk):
             )
         
         estados = obtener_estado_asistencia()
-        estado_justificado = estados.get('ausente-justificado')
+        estado_justificado_id = estados.get('ausente-justificado')
         
         # Verificar que sea una justificación pendiente
-        if asistencia.estado != estado_justificado:
+        if asistencia.estado_id != estado_justificado_id:
             return Response(
                 {"error": "Esta asistencia no es una justificación pendiente"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -867,7 +984,7 @@ def rechazar_justificacion(request, pk):
             )
         
         try:
-            asistencia = Asistencia.objects.select_related('practicante', 'estado').get(id=pk)
+            asistencia = Asistencia.objects.get(id=pk)
         except Asistencia.DoesNotExist:
             return Response(
                 {"error": "La justificación no existe"},
@@ -875,10 +992,10 @@ def rechazar_justificacion(request, pk):
             )
         
         estados = obtener_estado_asistencia()
-        estado_justificado = estados.get('ausente-justificado')
+        estado_justificado_id = estados.get('ausente-justificado')
         
         # Verificar que sea una justificación pendiente
-        if asistencia.estado != estado_justificado:
+        if asistencia.estado_id != estado_justificado_id:
             return Response(
                 {"error": "Esta asistencia no es una justificación pendiente"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -888,7 +1005,9 @@ def rechazar_justificacion(request, pk):
         motivo_original = asistencia.motivo or ""
         motivo_completo = f"{motivo_original} [RECHAZADO: {motivo_rechazo}]"
         asistencia.motivo = motivo_completo
-        asistencia.save()
+        # El save() devuelve el ticket al cupo del mes en la misma transacción (señal post_save)
+        with transaction.atomic():
+            asistencia.save()
         
         return Response(
             {
@@ -906,3 +1025,33 @@ def rechazar_justificacion(request, pk):
             {"error": "Error al procesar la solicitud", "detalle": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['POST'])
+def actualizar_justificaciones_bulk(request):
+    """
+    Endpoint para aprobar o rechazar varias justificaciones a la vez
+    Recibe {ids, accion, motivo_rechazo} y aplica un solo UPDATE a las que
+    están justificadas; informa las omitidas y las que no existen
+    """
+    serializer = JustificacionBulkSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {"error": "Datos inválidos", "detalles": serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    datos = serializer.validated_data
+    try:
+        repo = DjangoAsistenciaRepository()
+        if datos['accion'] == 'aprobar':
+            resultado = AprobarJustificacionService(repo).execute_lote(datos['ids'])
+        else:
+            resultado = RechazarJustificacionService(repo).execute_lote(datos['ids'], datos['motivo_rechazo'])
+        return Response(resultado, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error en actualizar_justificaciones_bulk: {str(e)}", exc_info=True)
+        return Response(
+            {"error": "Error al procesar la solicitud", "detalle": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
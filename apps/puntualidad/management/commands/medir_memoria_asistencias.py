@@ -0,0 +1,75 @@
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.puntualidad.domain.entities import Asistencia, AsistenciaBatch, ESTADOS_ASISTENCIA
+
+
+# Misma forma que Asistencia pero sin slots: cada instancia lleva su __dict__
+AsistenciaConDict = make_dataclass('AsistenciaConDict', [(f.name, f.type) for f in fields(Asistencia)])
+
+
+def _bytes_por_fila(construir: Callable[[], object], filas: int) -> float:
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        resultado = construir()
+        despues = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return (despues - antes) / filas
+
+
+def medir_memoria(filas: int) -> Dict[str, float]:
+    """Bytes por fila al cargar `filas` asistencias con cada representación"""
+    inicio = date(2025, 1, 1)
+
+    def fila(i: int) -> dict:
+        return dict(
+            id=i + 1,
+            practicante_id=1000 + i % 500,
+            fecha=inicio + timedelta(days=i % 365),
+            estado=ESTADOS_ASISTENCIA[i % len(ESTADOS_ASISTENCIA)],
+            hora_entrada=None,
+            hora_salida=None,
+            motivo=None,
+            ticket_id=None
+        )
+
+    def lote() -> AsistenciaBatch:
+        batch = AsistenciaBatch()
+        for i in range(filas):
+            datos = fila(i)
+            batch.agregar(datos['id'], datos['practicante_id'], datos['fecha'], datos['estado'])
+        return batch
+
+    return {
+        'dataclass': _bytes_por_fila(lambda: [AsistenciaConDict(**fila(i)) for i in range(filas)], filas),
+        'slots': _bytes_por_fila(lambda: [Asistencia(**fila(i)) for i in range(filas)], filas),
+        'batch': _bytes_por_fila(lote, filas)
+    }
+
+
+class Command(BaseCommand):
+    help = "Compara la memoria por fila de Asistencia con y sin slots y de AsistenciaBatch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100_000, help="Cantidad de asistencias a cargar (por defecto 100000)")
+
+    def handle(self, *args, **options):
+        filas = options['filas']
+        if filas <= 0:
+            raise CommandError("La cantidad de filas debe ser positiva")
+
+        resultados = medir_memoria(filas)
+        base = resultados['dataclass']
+        for nombre, bytes_fila in resultados.items():
+            ahorro = base - bytes_fila
+            self.stdout.write(
+                f"{nombre:<10} {bytes_fila:8.1f} B/fila  {bytes_fila * filas / 1024 / 1024:8.2f} MiB  "
+                f"ahorro {ahorro:7.1f} B/fila ({ahorro / base:.0%})"
+            )
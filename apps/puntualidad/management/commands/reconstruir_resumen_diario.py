@@ -0,0 +1,25 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.puntualidad.infrastructure.resumen_diario import reconstruir_rango
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla asistencia_resumen_diario para un rango de fechas"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help="Fecha inicial (YYYY-MM-DD), por defecto hoy")
+        parser.add_argument('--hasta', type=date.fromisoformat, help="Fecha final (YYYY-MM-DD), por defecto hoy")
+
+    def handle(self, *args, **options):
+        hoy = timezone.now().date()
+        desde = options['desde'] or hoy
+        hasta = options['hasta'] or hoy
+
+        if desde > hasta:
+            raise CommandError("La fecha inicial no puede ser posterior a la fecha final")
+
+        dias = reconstruir_rango(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f"Resumen diario reconstruido: {dias} día(s) entre {desde} y {hasta}"))
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+ESTADOS = [
+    'Presente',
+    'Tardanza',
+    'Ausente Justificado',
+    'Ausente Sin Justificar',
+]
+
+
+def crear_estados(apps, schema_editor):
+    EstadoAsistencia = apps.get_model('puntualidad', 'EstadoAsistencia')
+    for nombre in ESTADOS:
+        EstadoAsistencia.objects.get_or_create(estado=nombre)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puntualidad', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_estados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puntualidad', '0002_seed_estado_asistencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AsistenciaResumenDiario',
+            fields=[
+                ('fecha', models.DateField(primary_key=True, serialize=False)),
+                ('presentes', models.PositiveIntegerField(default=0)),
+                ('tardanzas', models.PositiveIntegerField(default=0)),
+                ('ausentes_justificados', models.PositiveIntegerField(default=0)),
+                ('ausentes_sin_justificar', models.PositiveIntegerField(default=0)),
+                ('con_clases', models.PositiveIntegerField(default=0)),
+                ('activos_sin_clases', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen Diario de Asistencia',
+                'verbose_name_plural': 'Resúmenes Diarios de Asistencia',
+                'db_table': 'asistencia_resumen_diario',
+            },
+        ),
+    ]
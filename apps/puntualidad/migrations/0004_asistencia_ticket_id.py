@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:21
+
+import re
+
+from django.db import migrations, models
+
+
+TICKET_PATTERN = re.compile(r'TKT-?\d+', re.IGNORECASE)
+TAMANO_LOTE = 500
+
+
+def extraer_tickets(apps, schema_editor):
+    """Parsea una sola vez los motivos existentes para llenar ticket_id"""
+    Asistencia = apps.get_model('puntualidad', 'Asistencia')
+    pendientes = []
+    for asistencia in Asistencia.objects.filter(motivo__icontains='TKT').only('id', 'motivo').iterator(chunk_size=TAMANO_LOTE):
+        ticket_match = TICKET_PATTERN.search(asistencia.motivo)
+        if not ticket_match:
+            continue
+        asistencia.ticket_id = ticket_match.group(0).upper()
+        pendientes.append(asistencia)
+        if len(pendientes) >= TAMANO_LOTE:
+            Asistencia.objects.bulk_update(pendientes, ['ticket_id'])
+            pendientes = []
+    if pendientes:
+        Asistencia.objects.bulk_update(pendientes, ['ticket_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puntualidad', '0003_asistencia_resumen_diario'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asistencia',
+            name='ticket_id',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='ID de ticket extraído del motivo al guardar', max_length=50, null=True),
+        ),
+        migrations.RunPython(extraer_tickets, migrations.RunPython.noop),
+    ]
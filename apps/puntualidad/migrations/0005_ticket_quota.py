@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:28
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def llenar_cupos(apps, schema_editor):
+    """Carga los tickets ya usados (justificadas con motivo, sin rechazar) por practicante y mes"""
+    EstadoAsistencia = apps.get_model('puntualidad', 'EstadoAsistencia')
+    Asistencia = apps.get_model('puntualidad', 'Asistencia')
+    TicketQuota = apps.get_model('puntualidad', 'TicketQuota')
+
+    estado = EstadoAsistencia.objects.filter(estado='Ausente Justificado').first()
+    if estado is None:
+        return
+    usados = Counter(
+        (practicante_id, f"{fecha.year:04d}-{fecha.month:02d}")
+        for practicante_id, fecha in Asistencia.objects.filter(
+            estado_id=estado.id,
+            motivo__isnull=False
+        ).exclude(motivo='').exclude(motivo__contains='[RECHAZADO').values_list('practicante_id', 'fecha').iterator(chunk_size=500)
+    )
+    TicketQuota.objects.bulk_create(
+        [
+            TicketQuota(practicante_id=practicante_id, year_month=year_month, used=total)
+            for (practicante_id, year_month), total in usados.items()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practicantes', '0001_initial'),
+        ('puntualidad', '0004_asistencia_ticket_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_month', models.CharField(help_text='Mes en formato YYYY-MM', max_length=7)),
+                ('used', models.PositiveSmallIntegerField(default=0)),
+                ('practicante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_quotas', to='practicantes.practicante')),
+            ],
+            options={
+                'verbose_name': 'Cupo de Tickets',
+                'verbose_name_plural': 'Cupos de Tickets',
+                'db_table': 'ticket_quota',
+                'unique_together': {('practicante', 'year_month')},
+            },
+        ),
+        migrations.RunPython(llenar_cupos, migrations.RunPython.noop),
+    ]
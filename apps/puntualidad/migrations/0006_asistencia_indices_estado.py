@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practicantes', '0001_initial'),
+        ('puntualidad', '0005_ticket_quota'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asistencia',
+            index=models.Index(fields=['estado', 'fecha'], name='asistencia_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asistencia',
+            index=models.Index(condition=models.Q(('motivo__isnull', False), models.Q(('motivo', ''), _negated=True)), fields=['estado', '-fecha', '-id'], name='asistencia_justif_orden_idx'),
+        ),
+    ]
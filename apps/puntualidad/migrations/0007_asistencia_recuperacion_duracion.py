@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:35
+
+from django.db import migrations, models
+
+
+MAX_MINUTOS_RECUPERACION = 12 * 60
+TAMANO_LOTE = 500
+
+
+def _segundos(hora):
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+
+def calcular_duraciones(apps, schema_editor):
+    """Llena duracion_minutos de las recuperaciones existentes con entrada y salida"""
+    AsistenciaRecuperacion = apps.get_model('puntualidad', 'AsistenciaRecuperacion')
+    pendientes = []
+    recuperaciones = AsistenciaRecuperacion.objects.filter(
+        hora_entrada__isnull=False,
+        hora_salida__isnull=False
+    ).only('id', 'hora_entrada', 'hora_salida')
+    for recuperacion in recuperaciones.iterator(chunk_size=TAMANO_LOTE):
+        segundos = _segundos(recuperacion.hora_salida) - _segundos(recuperacion.hora_entrada)
+        if segundos <= 0:
+            continue
+        recuperacion.duracion_minutos = min(segundos // 60, MAX_MINUTOS_RECUPERACION)
+        pendientes.append(recuperacion)
+        if len(pendientes) >= TAMANO_LOTE:
+            AsistenciaRecuperacion.objects.bulk_update(pendientes, ['duracion_minutos'])
+            pendientes = []
+    if pendientes:
+        AsistenciaRecuperacion.objects.bulk_update(pendientes, ['duracion_minutos'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puntualidad', '0006_asistencia_indices_estado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asistenciarecuperacion',
+            name='duracion_minutos',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Minutos entre hora_entrada y hora_salida, calculados al guardar'),
+        ),
+        migrations.RunPython(calcular_duraciones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+def _indice_sin_condicion():
+    return models.Index(fields=['estado', '-fecha', '-id'], name='asistencia_justif_orden_idx')
+
+
+def crear_indice_sin_condicion(apps, schema_editor):
+    """
+    Los motores sin índices parciales (MySQL) omiten asistencia_justif_orden_idx
+    (aviso models.W037); ahí se crea la versión completa con el mismo nombre
+    """
+    if schema_editor.connection.features.supports_partial_indexes:
+        return
+    schema_editor.add_index(apps.get_model('puntualidad', 'Asistencia'), _indice_sin_condicion())
+
+
+def eliminar_indice_sin_condicion(apps, schema_editor):
+    if schema_editor.connection.features.supports_partial_indexes:
+        return
+    schema_editor.remove_index(apps.get_model('puntualidad', 'Asistencia'), _indice_sin_condicion())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('puntualidad', '0007_asistencia_recuperacion_duracion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_sin_condicion, eliminar_indice_sin_condicion),
+    ]
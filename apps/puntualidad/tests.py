@@ -1,3 +1,1117 @@
-from django.test import TestCase
+import re
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest import SkipTest, mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_init
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.practicantes.infrastructure.models import Practicante
+from apps.puntualidad.domain.entities import (
+    Asistencia,
+    AsistenciaBatch,
+    AsistenciaRecuperacion,
+    EstadoAsistencia,
+    EstadoAsistenciaEnum,
+    EstadoRecuperacionEnum,
+    DiaSemanaEnum,
+    CupoTicketsAgotado,
+    extraer_ticket_id
+)
+from apps.puntualidad.infrastructure.models import (
+    EstadoAsistencia as EstadoAsistenciaModel,
+    Asistencia as AsistenciaModel,
+    HorarioClases as HorarioClasesModel,
+    AsistenciaResumenDiario as AsistenciaResumenDiarioModel,
+    AsistenciaRecuperacion as AsistenciaRecuperacionModel,
+    TicketQuota as TicketQuotaModel,
+    DOMINIO_VERSION
+)
+from apps.comun.infrastructure.version_datos import incrementar_version
+from apps.puntualidad.infrastructure import resumen_diario
+from apps.puntualidad.infrastructure.estado_registry import estado_registry
+from apps.puntualidad.infrastructure.horario_indice import horario_indice
+from apps.puntualidad.infrastructure.tiempo_real import GRUPO_PUNTUALIDAD
+from apps.puntualidad.infrastructure import routing as puntualidad_routing
+from apps.puntualidad.infrastructure.django_orm_repository import (
+    opciones_upsert_asistencia,
+    DjangoAsistenciaRepository,
+    DjangoAsistenciaRecuperacionRepository,
+    DjangoHorarioClasesRepository
+)
+from apps.puntualidad.infrastructure.in_memory_repository import InMemoryAsistenciaRepository
+from apps.puntualidad.application.services import ListarJustificacionesService, RechazarJustificacionService
+from apps.puntualidad.management.commands.medir_memoria_asistencias import medir_memoria
+
+
+CAPA_EN_MEMORIA = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+def crear_practicante(numero: int, estado: str = 'activo') -> Practicante:
+    return Practicante.objects.create(
+        id_discord=1000 + numero,
+        nombre=f"Nombre{numero}",
+        apellido=f"Apellido{numero}",
+        correo=f"practicante{numero}@test.com",
+        semestre=3,
+        estado=estado
+    )
+
+
+class EstadoAsistenciaRegistryTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+
+    def test_ids_coinciden_con_tabla(self):
+        ids = estado_registry.get_ids()
+        self.assertEqual(set(ids), set(EstadoAsistenciaEnum))
+        for estado, estado_id in ids.items():
+            self.assertEqual(EstadoAsistenciaModel.objects.get(id=estado_id).estado, estado.value)
+            self.assertEqual(estado_registry.get_enum(estado_id), estado)
+
+    def test_registro_cargado_no_consulta(self):
+        estado_registry.get_ids()
+        with self.assertNumQueries(0):
+            estado_registry.get_id(EstadoAsistenciaEnum.TARDANZA)
+            estado_registry.get_enum(estado_registry.get_id(EstadoAsistenciaEnum.PRESENTE))
+
+    def test_cambio_de_fila_invalida_registro(self):
+        tardanza_id = estado_registry.get_id(EstadoAsistenciaEnum.TARDANZA)
+        EstadoAsistenciaModel.objects.filter(id=tardanza_id).delete()
+        EstadoAsistenciaModel.objects.create(estado=EstadoAsistenciaEnum.TARDANZA.value)
+        nuevo_id = EstadoAsistenciaModel.objects.get(estado=EstadoAsistenciaEnum.TARDANZA.value).id
+        self.assertEqual(estado_registry.get_id(EstadoAsistenciaEnum.TARDANZA), nuevo_id)
+
+    def test_repositorio_guarda_sin_buscar_estado(self):
+        practicante = crear_practicante(1)
+        repo = DjangoAsistenciaRepository()
+        estado_registry.get_ids()
+        asistencia = Asistencia(practicante_id=practicante.id, fecha=date(2025, 11, 3), estado=EstadoAsistenciaEnum.TARDANZA)
+        with CaptureQueriesContext(connection) as consultas:
+            guardada = repo.save(asistencia)
+        self.assertFalse([q for q in consultas.captured_queries if 'estado_asistencia' in q['sql']])
+        self.assertEqual(guardada.estado, EstadoAsistenciaEnum.TARDANZA)
+        self.assertEqual(repo.count_by_estado_and_fecha(EstadoAsistenciaEnum.TARDANZA, date(2025, 11, 3)), 1)
+
+
+class ResumenPuntualidadRepositoryTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.repo = DjangoAsistenciaRepository()
+        self.fecha = date(2025, 11, 3)  # Lunes
+        self.practicantes = [crear_practicante(n) for n in range(1, 5)]
+        crear_practicante(5, estado='en_riesgo')
+        # Antes de las asistencias: cada save() ya mantiene la fila de resumen del día
+        HorarioClasesModel.objects.create(practicante=self.practicantes[3], dia_clase=DiaSemanaEnum.LUNES.value)
+        ids = estado_registry.get_ids()
+        AsistenciaModel.objects.create(practicante=self.practicantes[0], fecha=self.fecha, estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+        AsistenciaModel.objects.create(practicante=self.practicantes[1], fecha=self.fecha, estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+        AsistenciaModel.objects.create(practicante=self.practicantes[2], fecha=self.fecha, estado_id=ids[EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO])
+        AsistenciaModel.objects.create(practicante=self.practicantes[0], fecha=date(2025, 11, 4), estado_id=ids[EstadoAsistenciaEnum.TARDANZA])
+
+    def test_counts_by_estado_for_fecha(self):
+        with self.assertNumQueries(1):
+            conteos = self.repo.counts_by_estado_for_fecha(self.fecha)
+        self.assertEqual(conteos[EstadoAsistenciaEnum.PRESENTE], 2)
+        self.assertEqual(conteos[EstadoAsistenciaEnum.TARDANZA], 0)
+        self.assertEqual(conteos[EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO], 1)
+        self.assertEqual(conteos[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR], 0)
+
+    def test_calcular_resumen_en_una_consulta(self):
+        with self.assertNumQueries(1):
+            resumen = resumen_diario.calcular_resumen(self.fecha)
+        self.assertEqual(resumen, {
+            "presentes": 2,
+            "tardanzas": 0,
+            "ausentes_justificados": 1,
+            "ausentes_sin_justificar": 0,
+            "con_clases": 1,
+            "activos_sin_clases": 3
+        })
+
+    def test_resumen_fecha_lee_por_clave_primaria(self):
+        esperado = resumen_diario.calcular_resumen(self.fecha)
+        self.assertEqual(self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES), esperado)
+        with self.assertNumQueries(1):
+            resumen = self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES)
+        self.assertEqual(resumen, esperado)
+
+    def test_resumen_se_mantiene_en_cada_escritura(self):
+        self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES)
+        asistencia = self.repo.get_by_practicante_and_fecha(self.practicantes[0].id, self.fecha)
+        asistencia.estado = EstadoAsistenciaEnum.TARDANZA
+        self.repo.save(asistencia)
+        self.repo.save(Asistencia(
+            practicante_id=self.practicantes[3].id,
+            fecha=self.fecha,
+            estado=EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR
+        ))
+        AsistenciaModel.objects.filter(practicante=self.practicantes[2], fecha=self.fecha).delete()
+
+        fila = AsistenciaResumenDiarioModel.objects.get(fecha=self.fecha)
+        self.assertEqual(fila.presentes, 1)
+        self.assertEqual(fila.tardanzas, 1)
+        self.assertEqual(fila.ausentes_justificados, 0)
+        self.assertEqual(fila.ausentes_sin_justificar, 1)
+        self.assertEqual(resumen_diario.calcular_resumen(self.fecha), self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES))
+
+    def test_cambio_de_estado_sin_fila_de_resumen(self):
+        self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES)
+        # Guardar un practicante borra las filas vigentes; aquí se borra la del día directamente
+        AsistenciaResumenDiarioModel.objects.filter(fecha=self.fecha).delete()
+
+        asistencia = self.repo.get_by_practicante_and_fecha(self.practicantes[0].id, self.fecha)
+        asistencia.estado = EstadoAsistenciaEnum.TARDANZA
+        self.repo.save(asistencia)
+
+        fila = AsistenciaResumenDiarioModel.objects.get(fecha=self.fecha)
+        self.assertEqual((fila.presentes, fila.tardanzas), (1, 1))
+        self.assertEqual(resumen_diario.calcular_resumen(self.fecha), self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES))
+
+    def test_save_directo_mantiene_el_resumen(self):
+        # Como el admin o un script: save() y create() sin pasar por el repositorio
+        self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES)
+        ids = estado_registry.get_ids()
+        asistencia = AsistenciaModel.objects.get(practicante=self.practicantes[1], fecha=self.fecha)
+        asistencia.estado_id = ids[EstadoAsistenciaEnum.TARDANZA]
+        asistencia.save()
+        AsistenciaModel.objects.create(
+            practicante=self.practicantes[3], fecha=self.fecha, estado_id=ids[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR]
+        )
+
+        fila = AsistenciaResumenDiarioModel.objects.get(fecha=self.fecha)
+        self.assertEqual((fila.presentes, fila.tardanzas, fila.ausentes_sin_justificar), (1, 1, 1))
+        self.assertEqual(resumen_diario.calcular_resumen(self.fecha), self.repo.get_resumen_fecha(self.fecha, DiaSemanaEnum.LUNES))
+
+    def test_fila_creada_en_paralelo_recibe_el_delta(self):
+        AsistenciaResumenDiarioModel.objects.filter(fecha=self.fecha).delete()
+        calcular = resumen_diario.calcular_resumen
+
+        def calcular_mientras_otra_escritura_crea_la_fila(fecha):
+            valores = calcular(fecha)
+            # La otra transacción registró un presente más y creó la fila sin ver esta escritura
+            AsistenciaResumenDiarioModel.objects.create(fecha=fecha, **{**valores, 'presentes': 3, 'tardanzas': 0})
+            return valores
+
+        asistencia = self.repo.get_by_practicante_and_fecha(self.practicantes[0].id, self.fecha)
+        asistencia.estado = EstadoAsistenciaEnum.TARDANZA
+        with mock.patch.object(
+            resumen_diario, 'calcular_resumen', side_effect=calcular_mientras_otra_escritura_crea_la_fila
+        ):
+            self.repo.save(asistencia)
+
+        fila = AsistenciaResumenDiarioModel.objects.get(fecha=self.fecha)
+        self.assertEqual((fila.presentes, fila.tardanzas), (2, 1))
+
+    def test_comando_reconstruye_rango(self):
+        salida = StringIO()
+        call_command('reconstruir_resumen_diario', '--desde=2025-11-03', '--hasta=2025-11-04', stdout=salida)
+        self.assertIn("2 día(s)", salida.getvalue())
+        self.assertEqual(AsistenciaResumenDiarioModel.objects.get(fecha=date(2025, 11, 4)).tardanzas, 1)
+
+
+class PuntualidadViewsTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.practicantes = [crear_practicante(n) for n in range(1, 4)]
+
+    def test_resumen_cuenta_por_estado(self):
+        hoy = timezone.now().date()
+        ids = estado_registry.get_ids()
+        AsistenciaModel.objects.create(practicante=self.practicantes[0], fecha=hoy, estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+        AsistenciaModel.objects.create(practicante=self.practicantes[1], fecha=hoy, estado_id=ids[EstadoAsistenciaEnum.TARDANZA])
+
+        response = self.client.get('/api/puntualidad/resumen/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['asistencias'], 1)
+        self.assertEqual(data['tardanzas'], 1)
+        self.assertEqual(data['faltas'], 0)
+        self.assertEqual(data['total'], 3)
+
+    def test_endpoints_de_lectura_responden(self):
+        for url in ['alertas/', 'practicantes/', 'justificaciones/', 'recuperaciones/']:
+            response = self.client.get(f'/api/puntualidad/{url}')
+            self.assertEqual(response.status_code, 200, url)
+
+    async def test_endpoints_de_lectura_asincronos(self):
+        for url in ['resumen/', 'alertas/', 'practicantes/', 'justificaciones/', 'recuperaciones/']:
+            response = await self.async_client.get(f'/api/puntualidad/{url}')
+            self.assertEqual(response.status_code, 200, url)
+
+        response = await self.async_client.post('/api/puntualidad/alertas/')
+        self.assertEqual(response.status_code, 405)
+
+    def test_practicantes_con_estado_del_dia(self):
+        ids = estado_registry.get_ids()
+        AsistenciaModel.objects.create(
+            practicante=self.practicantes[0],
+            fecha=timezone.now().date(),
+            estado_id=ids[EstadoAsistenciaEnum.TARDANZA],
+            hora_entrada=time(8, 10)
+        )
+
+        data = {p['id']: p for p in self.client.get('/api/puntualidad/practicantes/').json()}
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[self.practicantes[0].id]['estado'], 'tardanza')
+        self.assertEqual(data[self.practicantes[0].id]['horaIngreso'], '08:10 AM')
+        self.assertEqual(data[self.practicantes[1].id]['estado'], 'ausente-sin-justificar')
+
+
+# Las escrituras confirmadas emiten eventos: sin Redis, la capa en memoria los recibe
+@override_settings(CHANNEL_LAYERS=CAPA_EN_MEMORIA)
+class RespuestaCondicionalTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.practicante = crear_practicante(1)
+
+    def test_304_sin_ejecutar_la_vista_hasta_que_cambian_los_datos(self):
+        estado_registry.get_ids()
+        response = self.client.get('/api/puntualidad/practicantes/')
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/puntualidad/practicantes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AsistenciaModel.objects.create(
+                practicante=self.practicante,
+                fecha=timezone.now().date(),
+                estado_id=estado_registry.get_id(EstadoAsistenciaEnum.PRESENTE)
+            )
+        response = self.client.get('/api/puntualidad/practicantes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0]['estado'], 'presente')
+
+    def test_registro_masivo_incrementa_version(self):
+        etag = self.client.get('/api/puntualidad/resumen/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            DjangoAsistenciaRepository().save_many([
+                Asistencia(practicante_id=self.practicante.id, fecha=timezone.now().date(), estado=EstadoAsistenciaEnum.TARDANZA)
+            ])
+        response = self.client.get('/api/puntualidad/resumen/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tardanzas'], 1)
+
+
+class JustificacionesPaginadasTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        justificado_id = estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+        self.practicante = crear_practicante(1)
+        # Carga histórica (sin señales): excede el cupo mensual de tickets a propósito
+        AsistenciaModel.objects.bulk_create([
+            AsistenciaModel(
+                practicante=self.practicante,
+                fecha=date(2025, 10, dia),
+                estado_id=justificado_id,
+                motivo=f"TKT-{dia} - Cita médica",
+                ticket_id=extraer_ticket_id(f"TKT-{dia} - Cita médica"),
+                hora_entrada=time(9, 0) if dia % 2 else None,
+                hora_salida=time(9, 0) if dia % 2 else None
+            )
+            for dia in range(1, 8)
+        ])
+
+    def test_repositorio_recorre_paginas_por_cursor(self):
+        repo = DjangoAsistenciaRepository()
+        fechas, cursor = [], None
+        while True:
+            pagina, cursor = repo.get_justificadas_paginadas(date(2025, 10, 2), date(2025, 10, 6), 2, cursor)
+            fechas.extend(a.fecha.day for a in pagina)
+            if cursor is None:
+                break
+        self.assertEqual(fechas, [6, 5, 4, 3, 2])
+
+    def test_lecturas_proyectan_solo_columnas_del_mapper(self):
+        repo = DjangoAsistenciaRepository()
+        instanciados = []
+        registrar = lambda sender, **kwargs: instanciados.append(sender)
+        post_init.connect(registrar, sender=AsistenciaModel)
+        try:
+            with CaptureQueriesContext(connection) as consultas:
+                justificadas = repo.get_justificadas(date(2025, 10, 1), date(2025, 10, 7))
+                asistencia = repo.get_by_practicante_and_fecha(self.practicante.id, date(2025, 10, 3))
+        finally:
+            post_init.disconnect(registrar, sender=AsistenciaModel)
+        self.assertEqual(instanciados, [])
+        self.assertEqual(len(consultas.captured_queries), 2)
+        self.assertFalse([q for q in consultas.captured_queries if 'JOIN' in q['sql']])
+        self.assertEqual(len(justificadas), 7)
+        self.assertEqual(asistencia.estado, EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+        self.assertEqual((asistencia.ticket_id, asistencia.hora_entrada), ('TKT-3', time(9, 0)))
+
+    def test_vista_pagina_con_cursor_opaco(self):
+        response = self.client.get('/api/puntualidad/justificaciones/', {'limite': 3})
+        self.assertEqual(response.status_code, 200)
+        primera = response.json()
+        self.assertEqual([j['fecha'] for j in primera['results']], ['2025-10-07', '2025-10-06', '2025-10-05'])
+        self.assertIsNotNone(primera['next'])
+
+        response = self.client.get('/api/puntualidad/justificaciones/', {'limite': 3, 'cursor': primera['next']})
+        segunda = response.json()
+        self.assertEqual([j['fecha'] for j in segunda['results']], ['2025-10-04', '2025-10-03', '2025-10-02'])
+
+    def test_vista_filtra_por_estado_y_rango(self):
+        response = self.client.get('/api/puntualidad/justificaciones/', {
+            'desde': '2025-10-02', 'hasta': '2025-10-06', 'estado': 'aprobado'
+        })
+        data = response.json()
+        self.assertEqual([j['fecha'] for j in data['results']], ['2025-10-05', '2025-10-03'])
+        self.assertIsNone(data['next'])
+        self.assertTrue(all(j['estado'] == 'aprobado' for j in data['results']))
+
+    def test_ticket_id_se_guarda_al_escribir(self):
+        asistencia = AsistenciaModel.objects.get(fecha=date(2025, 10, 3))
+        self.assertEqual(asistencia.ticket_id, 'TKT-3')
+        asistencia.motivo = 'tkt45 - Reprogramado'
+        asistencia.save(update_fields=['motivo'])
+        asistencia.refresh_from_db()
+        self.assertEqual(asistencia.ticket_id, 'TKT45')
+
+    def test_vista_filtra_por_ticket(self):
+        response = self.client.get('/api/puntualidad/justificaciones/', {'ticket': 'tkt-4'})
+        data = response.json()
+        self.assertEqual([j['ticketId'] for j in data['results']], ['TKT-4'])
+
+    def test_vista_rechaza_cursor_invalido(self):
+        response = self.client.get('/api/puntualidad/justificaciones/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class JustificacionesBulkTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        ids = estado_registry.get_ids()
+        self.justificadas = [
+            AsistenciaModel.objects.create(
+                practicante=crear_practicante(n),
+                fecha=date(2025, 10, 6),
+                estado_id=ids[EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO],
+                motivo=f"TKT-{n} - Cita médica"
+            )
+            for n in range(1, 4)
+        ]
+        self.presente = AsistenciaModel.objects.create(
+            practicante=crear_practicante(4),
+            fecha=date(2025, 10, 6),
+            estado_id=ids[EstadoAsistenciaEnum.PRESENTE]
+        )
+
+    def test_aprobar_en_un_solo_update(self):
+        ids = [self.justificadas[0].id, self.justificadas[1].id, self.presente.id, 9999]
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(
+                '/api/puntualidad/justificaciones/bulk/', {'ids': ids, 'accion': 'aprobar'}, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'estado': 'aprobado',
+            'actualizadas': [self.justificadas[0].id, self.justificadas[1].id],
+            'omitidas': [self.presente.id],
+            'no_encontradas': [9999]
+        })
+        updates = [q for q in consultas.captured_queries if q['sql'].startswith('UPDATE "asistencia"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(AsistenciaModel.objects.filter(hora_entrada__isnull=False, hora_salida__isnull=False).count(), 2)
+
+    def test_rechazar_agrega_sufijo_al_motivo(self):
+        response = self.client.post('/api/puntualidad/justificaciones/bulk/', {
+            'ids': [self.justificadas[2].id], 'accion': 'rechazar', 'motivo_rechazo': 'Sin evidencia'
+        }, content_type='application/json')
+        self.assertEqual(response.json()['actualizadas'], [self.justificadas[2].id])
+        self.justificadas[2].refresh_from_db()
+        self.assertEqual(self.justificadas[2].motivo, 'TKT-3 - Cita médica [RECHAZADO: Sin evidencia]')
+        self.assertEqual(self.justificadas[2].ticket_id, 'TKT-3')
+
+    def test_rechazar_deriva_ticket_del_motivo_completo(self):
+        AsistenciaModel.objects.filter(id=self.justificadas[0].id).update(motivo='Cita médica', ticket_id=None)
+        self.client.post('/api/puntualidad/justificaciones/bulk/', {
+            'ids': [self.justificadas[0].id, self.justificadas[1].id],
+            'accion': 'rechazar',
+            'motivo_rechazo': 'Duplicado de TKT-9'
+        }, content_type='application/json')
+        self.assertEqual(
+            dict(AsistenciaModel.objects.filter(
+                id__in=[self.justificadas[0].id, self.justificadas[1].id]
+            ).values_list('id', 'ticket_id')),
+            {self.justificadas[0].id: 'TKT-9', self.justificadas[1].id: 'TKT-2'}
+        )
+
+    def test_rechazar_requiere_motivo(self):
+        response = self.client.post('/api/puntualidad/justificaciones/bulk/', {
+            'ids': [self.justificadas[0].id], 'accion': 'rechazar'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class RegistrarAsistenciasBulkTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.fecha = date(2025, 11, 3)
+        self.practicantes = [crear_practicante(n) for n in range(1, 4)]
+        self.inactivo = crear_practicante(4, estado='en_riesgo')
+        AsistenciaModel.objects.create(
+            practicante=self.practicantes[0],
+            fecha=self.fecha,
+            estado_id=estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        )
+
+    def test_upsert_con_resultado_por_elemento(self):
+        payload = [
+            {"practicante_id": self.practicantes[0].id, "fecha": "2025-11-03", "hora_entrada": "08:02", "estado": "presente"},
+            {"practicante_id": self.practicantes[1].id, "fecha": "2025-11-03", "hora_entrada": "08:10", "estado": "presente"},
+            {"practicante_id": self.practicantes[1].id, "fecha": "2025-11-03", "hora_entrada": "08:12", "estado": "tardanza"},
+            {"practicante_id": self.practicantes[2].id, "fecha": "2025-11-03", "estado": "desconocido"},
+            {"practicante_id": self.inactivo.id, "fecha": "2025-11-03", "estado": "presente"},
+        ]
+        response = self.client.post('/api/puntualidad/asistencias/bulk/', payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        resultados = response.json()['resultados']
+        self.assertEqual(
+            [r['resultado'] for r in resultados],
+            ['actualizado', 'omitido', 'creado', 'error', 'error']
+        )
+
+        tardanza = AsistenciaModel.objects.get(practicante=self.practicantes[1], fecha=self.fecha)
+        self.assertEqual(tardanza.id, resultados[2]['id'])
+        self.assertEqual(tardanza.hora_entrada, time(8, 12))
+        self.assertEqual(AsistenciaModel.objects.filter(fecha=self.fecha).count(), 2)
+
+        fila = AsistenciaResumenDiarioModel.objects.get(fecha=self.fecha)
+        self.assertEqual((fila.presentes, fila.tardanzas, fila.ausentes_sin_justificar), (1, 1, 0))
+
+    def test_repositorio_retorna_la_fila_guardada(self):
+        AsistenciaModel.objects.filter(practicante=self.practicantes[0]).update(
+            motivo='Sin aviso', hora_salida=time(17, 0)
+        )
+        [(asistencia, creada)] = DjangoAsistenciaRepository().save_many([Asistencia(
+            practicante_id=self.practicantes[0].id,
+            fecha=self.fecha,
+            estado=EstadoAsistenciaEnum.PRESENTE,
+            hora_entrada=time(8, 0),
+            hora_salida=time(9, 0),
+            motivo='TKT-5 - Otro'
+        )])
+        self.assertFalse(creada)
+        self.assertEqual(
+            (asistencia.estado, asistencia.hora_entrada, asistencia.hora_salida, asistencia.motivo, asistencia.ticket_id),
+            (EstadoAsistenciaEnum.PRESENTE, time(8, 0), time(17, 0), 'Sin aviso', None)
+        )
+
+    def test_upsert_sin_columnas_de_conflicto_en_mysql(self):
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            self.assertEqual(opciones_upsert_asistencia(connection), {})
+
+        self.assertEqual(opciones_upsert_asistencia(connection), {'unique_fields': ['practicante', 'fecha']})
+        with CaptureQueriesContext(connection) as consultas:
+            DjangoAsistenciaRepository().save_many([Asistencia(
+                practicante_id=self.practicantes[0].id,
+                fecha=self.fecha,
+                estado=EstadoAsistenciaEnum.PRESENTE,
+                hora_entrada=time(8, 0)
+            )])
+        [insert] = [q['sql'] for q in consultas.captured_queries if q['sql'].startswith('INSERT INTO "asistencia"')]
+        self.assertIn('ON CONFLICT("practicante_id", "fecha")', insert)
+
+    def test_rechaza_payload_vacio(self):
+        response = self.client.post('/api/puntualidad/asistencias/bulk/', [], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class AlertasPuntualidadViewTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.hoy = timezone.now().date()
+        ids = estado_registry.get_ids()
+        self.practicantes = [crear_practicante(n) for n in range(1, 9)]
+        for practicante in self.practicantes[:6]:
+            AsistenciaModel.objects.create(practicante=practicante, fecha=self.hoy, estado_id=ids[EstadoAsistenciaEnum.TARDANZA])
+        dia_hoy = resumen_diario.DIAS_SEMANA[self.hoy.weekday()].value
+        HorarioClasesModel.objects.create(practicante=self.practicantes[7], dia_clase=dia_hoy)
+        for practicante in self.practicantes[6:]:
+            AsistenciaModel.objects.create(
+                practicante=practicante,
+                fecha=self.hoy - timedelta(days=40),
+                estado_id=ids[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR]
+            )
+            for dias in range(0, 3):
+                fecha = self.hoy - timedelta(days=dias)
+                if fecha.month == self.hoy.month:
+                    AsistenciaModel.objects.create(
+                        practicante=practicante,
+                        fecha=fecha,
+                        estado_id=ids[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR]
+                    )
+
+    def test_alertas_con_total_y_primeros_nombres(self):
+        estado_registry.get_ids()
+        horario_indice.get_practicantes(DiaSemanaEnum.LUNES)
+        # versión de datos (ETag) + una consulta por alerta
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/puntualidad/alertas/')
+        alertas = {a['tipo']: a for a in response.json()}
+
+        self.assertEqual(alertas['tardanza']['cantidad'], 6)
+        self.assertEqual(len(alertas['tardanza']['practicantes']), 5)
+        self.assertEqual(alertas['ausencia']['cantidad'], 1)
+        self.assertEqual(alertas['ausencia']['practicantes'], ['Nombre7 Apellido7'])
+        if self.hoy.day >= 3:
+            self.assertEqual(alertas['riesgo']['cantidad'], 2)
+            self.assertEqual(sorted(alertas['riesgo']['practicantes']), ['Nombre7 Apellido7', 'Nombre8 Apellido8'])
+
+    @override_settings(DEBUG=True)
+    def test_expone_total_de_consultas_en_debug(self):
+        estado_registry.get_ids()
+        horario_indice.get_practicantes(DiaSemanaEnum.LUNES)
+        response = self.client.get('/api/puntualidad/alertas/')
+        self.assertEqual(response['X-Query-Count'], '3')
+
+
+class HorasSemanalesTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        ids = estado_registry.get_ids()
+        self.activo = crear_practicante(1)
+        self.inactivo = crear_practicante(2, estado='en_riesgo')
+        lunes = date(2025, 11, 3)
+        registros = [
+            (self.activo, lunes, time(8, 0), time(14, 30)),
+            (self.activo, date(2025, 11, 4), time(8, 15), time(12, 0)),
+            (self.activo, date(2025, 11, 10), time(8, 0), time(16, 0)),  # Semana siguiente
+            (self.inactivo, lunes, time(8, 0), time(12, 0)),
+        ]
+        for practicante, fecha, entrada, salida in registros:
+            AsistenciaModel.objects.create(
+                practicante=practicante,
+                fecha=fecha,
+                hora_entrada=entrada,
+                hora_salida=salida,
+                estado_id=ids[EstadoAsistenciaEnum.PRESENTE]
+            )
+
+    def test_horas_por_practicante_en_una_consulta(self):
+        repo = DjangoAsistenciaRepository()
+        with self.assertNumQueries(1):
+            horas = repo.get_horas_por_practicante(date(2025, 11, 3), date(2025, 11, 9))
+        self.assertEqual(horas, {self.activo.id: 10.25})
+
+
+class TicketQuotaTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.practicante = crear_practicante(1)
+        self.hoy = timezone.now().date()
+        self.repo = DjangoAsistenciaRepository()
+
+    def crear(self, fecha, motivo='Cita médica'):
+        return self.client.post('/api/puntualidad/justificaciones/crear/', {
+            'practicante_id': self.practicante.id,
+            'fecha': fecha.isoformat(),
+            'motivo': motivo,
+            'ticket_id': 'TKT-1'
+        }, content_type='application/json')
+
+    def test_limite_mensual_con_contador(self):
+        fechas = [self.hoy.replace(day=1) + timedelta(days=n) for n in range(4)]
+        for usados, fecha in enumerate(fechas[:3], start=1):
+            response = self.crear(fecha)
+            self.assertEqual(response.json()['tickets_mes'], usados)
+
+        # Reenviar la justificación de un día ya justificado no consume otro ticket
+        response = self.crear(fechas[0], motivo='Cita médica con constancia')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tickets_mes'], 3)
+
+        response = self.crear(fechas[3])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AsistenciaModel.objects.filter(fecha=fechas[3]).exists())
+        self.assertEqual(TicketQuotaModel.objects.get(practicante=self.practicante).used, 3)
+
+    def test_repositorio_consume_y_lee_el_contador(self):
+        inicio_mes = self.hoy.replace(day=1)
+        for dias in range(3):
+            asistencia, usados = self.repo.save_justificacion(Asistencia(
+                practicante_id=self.practicante.id,
+                fecha=inicio_mes + timedelta(days=dias),
+                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+                motivo='TKT-9 - Examen'
+            ))
+            self.assertEqual(usados, dias + 1)
+
+        with self.assertRaises(CupoTicketsAgotado):
+            self.repo.save_justificacion(Asistencia(
+                practicante_id=self.practicante.id,
+                fecha=inicio_mes + timedelta(days=3),
+                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+                motivo='TKT-10 - Examen'
+            ))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.repo.count_tickets_mes(self.practicante.id, inicio_mes, self.hoy), 3)
+
+    def usados(self):
+        return TicketQuotaModel.objects.get(practicante=self.practicante).used
+
+    def justificar(self, fecha):
+        return self.repo.save_justificacion(Asistencia(
+            practicante_id=self.practicante.id,
+            fecha=fecha,
+            estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+            motivo='TKT-9 - Examen'
+        ))[0]
+
+    def test_rechazo_borrado_y_cambio_de_estado_devuelven_el_ticket(self):
+        fechas = [self.hoy.replace(day=1) + timedelta(days=n) for n in range(3)]
+        justificadas = [self.justificar(fecha) for fecha in fechas]
+        self.assertEqual(self.usados(), 3)
+
+        RechazarJustificacionService(self.repo).execute(justificadas[0].id, 'Sin evidencia')
+        self.assertEqual(self.usados(), 2)
+
+        # Rechazar de nuevo una ya rechazada no devuelve otro ticket
+        self.repo.rechazar_justificaciones([justificadas[0].id, justificadas[1].id], 'Sin evidencia')
+        self.assertEqual(self.usados(), 1)
+
+        AsistenciaModel.objects.filter(id=justificadas[2].id).delete()
+        self.assertEqual(self.usados(), 0)
+
+        # Una justificación rechazada puede volver a presentarse y consume de nuevo
+        self.justificar(fechas[0])
+        self.assertEqual(self.usados(), 1)
+        self.repo.save_many([Asistencia(
+            practicante_id=self.practicante.id,
+            fecha=fechas[0],
+            estado=EstadoAsistenciaEnum.PRESENTE,
+            hora_entrada=time(8, 0)
+        )])
+        self.assertEqual(self.usados(), 0)
+
+    def test_save_directo_mantiene_el_cupo(self):
+        # Admin o scripts de shell: create()/save() sin pasar por el repositorio
+        ids = estado_registry.get_ids()
+        justificado_id = ids[EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO]
+        fechas = [self.hoy.replace(day=1) + timedelta(days=n) for n in range(4)]
+        filas = [
+            AsistenciaModel.objects.create(
+                practicante=self.practicante, fecha=fecha, estado_id=justificado_id, motivo='TKT-9 - Examen'
+            )
+            for fecha in fechas[:3]
+        ]
+        self.assertEqual(self.usados(), 3)
+
+        with self.assertRaises(CupoTicketsAgotado):
+            AsistenciaModel.objects.create(
+                practicante=self.practicante, fecha=fechas[3], estado_id=justificado_id, motivo='TKT-9 - Examen'
+            )
+        self.assertFalse(AsistenciaModel.objects.filter(fecha=fechas[3]).exists())
+
+        # Editar el motivo no consume otro ticket; cambiar el estado lo devuelve
+        filas[0].motivo = 'TKT-9 - Examen final'
+        filas[0].save()
+        self.assertEqual(self.usados(), 3)
+        filas[0].estado_id = ids[EstadoAsistenciaEnum.PRESENTE]
+        filas[0].save()
+        self.assertEqual(self.usados(), 2)
+
+        filas[0].estado_id = justificado_id
+        filas[0].save()
+        self.assertEqual(self.usados(), 3)
+
+    def test_vista_de_rechazo_devuelve_el_ticket(self):
+        asistencia = self.justificar(self.hoy)
+        for _ in range(2):
+            response = self.client.post(
+                f'/api/puntualidad/justificaciones/{asistencia.id}/rechazar/',
+                {'motivo_rechazo': 'Sin evidencia'}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.usados(), 0)
+
+    def test_repositorio_en_memoria_devuelve_el_ticket(self):
+        repo = InMemoryAsistenciaRepository()
+        asistencia, usados = repo.save_justificacion(Asistencia(
+            practicante_id=1,
+            fecha=self.hoy,
+            estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+            motivo='TKT-9 - Examen'
+        ))
+        self.assertEqual(usados, 1)
+        repo.rechazar_justificaciones([asistencia.id], 'Sin evidencia')
+        self.assertEqual(repo.count_tickets_mes(1, self.hoy, self.hoy), 0)
+
+
+class MatrizAsistenciaTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        ids = estado_registry.get_ids()
+        self.practicantes = [crear_practicante(n) for n in range(1, 4)]
+        self.practicantes.append(crear_practicante(4, estado='inactivo'))
+        AsistenciaModel.objects.create(practicante=self.practicantes[0], fecha=date(2025, 11, 3), estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+        AsistenciaModel.objects.create(practicante=self.practicantes[0], fecha=date(2025, 11, 5), estado_id=ids[EstadoAsistenciaEnum.TARDANZA])
+        AsistenciaModel.objects.create(practicante=self.practicantes[2], fecha=date(2025, 11, 4), estado_id=ids[EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR])
+        AsistenciaModel.objects.create(practicante=self.practicantes[3], fecha=date(2025, 11, 4), estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+        AsistenciaModel.objects.create(practicante=self.practicantes[1], fecha=date(2025, 11, 6), estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+
+    def test_matriz_columnar_en_una_consulta_de_rango(self):
+        estado_registry.get_ids()
+        # versión de datos (ETag) + practicantes activos + rango de asistencias
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/puntualidad/matriz/', {'desde': '2025-11-03', 'hasta': '2025-11-05'})
+        data = response.json()
+        self.assertEqual(data['practicantes'], [p.id for p in self.practicantes])
+        self.assertEqual(data['fechas'], ['2025-11-03', '2025-11-04', '2025-11-05'])
+        self.assertEqual(data['estados'][0], None)
+        estados = {estado: codigo for codigo, estado in enumerate(data['estados'])}
+        self.assertEqual(data['codigos'], [
+            estados['Presente'], 0, estados['Tardanza'],
+            0, 0, 0,
+            0, estados['Ausente Sin Justificar'], 0,
+            0, estados['Presente'], 0
+        ])
+
+    def test_rango_invalido(self):
+        response = self.client.get('/api/puntualidad/matriz/', {'desde': '2025-11-05', 'hasta': '2025-11-03'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/puntualidad/matriz/', {'desde': '2025-01-01', 'hasta': '2025-12-31'})
+        self.assertEqual(response.status_code, 400)
+
+
+class HorarioIndiceTest(TestCase):
+
+    def setUp(self):
+        horario_indice.invalidate()
+        self.practicantes = [crear_practicante(n) for n in range(1, 4)]
+        HorarioClasesModel.objects.create(practicante=self.practicantes[0], dia_clase=DiaSemanaEnum.LUNES.value)
+        HorarioClasesModel.objects.create(practicante=self.practicantes[1], dia_clase=DiaSemanaEnum.LUNES.value)
+        HorarioClasesModel.objects.create(practicante=self.practicantes[2], dia_clase=DiaSemanaEnum.MARTES.value)
+
+    def test_get_by_dia_sin_consultas_tras_cargar(self):
+        repo = DjangoHorarioClasesRepository()
+        repo.get_by_dia(DiaSemanaEnum.LUNES)
+        with self.assertNumQueries(0):
+            lunes = repo.get_by_dia(DiaSemanaEnum.LUNES)
+            martes = horario_indice.get_practicantes(DiaSemanaEnum.MARTES)
+            domingo = repo.get_by_dia(DiaSemanaEnum.DOMINGO)
+        self.assertEqual({h.practicante_id for h in lunes}, {self.practicantes[0].id, self.practicantes[1].id})
+        self.assertEqual(martes, frozenset({self.practicantes[2].id}))
+        self.assertEqual(domingo, [])
+
+    def test_cambio_de_horario_invalida_indice(self):
+        horario_indice.get_practicantes(DiaSemanaEnum.LUNES)
+        HorarioClasesModel.objects.filter(practicante=self.practicantes[0]).get().delete()
+        HorarioClasesModel.objects.create(practicante=self.practicantes[2], dia_clase=DiaSemanaEnum.LUNES.value)
+        self.assertEqual(
+            horario_indice.get_practicantes(DiaSemanaEnum.LUNES),
+            frozenset({self.practicantes[1].id, self.practicantes[2].id})
+        )
+
+    def test_version_de_otro_proceso_recarga_indice(self):
+        horario_indice.get_practicantes(DiaSemanaEnum.LUNES)
+        # Escritura sin señales (como la de otro proceso) seguida del incremento de versión
+        HorarioClasesModel.objects.filter(practicante=self.practicantes[2]).update(dia_clase=DiaSemanaEnum.LUNES.value)
+        with self.captureOnCommitCallbacks(execute=True):
+            incrementar_version(DOMINIO_VERSION)
+        self.assertEqual(len(horario_indice.get_practicantes(DiaSemanaEnum.LUNES)), 2)
+        with mock.patch.object(horario_indice, '_verificado_en', 0.0):
+            self.assertEqual(len(horario_indice.get_practicantes(DiaSemanaEnum.LUNES)), 3)
+
+
+class AsistenciaBatchTest(TestCase):
+
+    def test_entidades_sin_dict(self):
+        asistencia = Asistencia(practicante_id=1, fecha=date(2025, 11, 3), estado=EstadoAsistenciaEnum.PRESENTE)
+        self.assertFalse(hasattr(asistencia, '__dict__'))
+        estado = EstadoAsistencia(id=1, estado=EstadoAsistenciaEnum.TARDANZA)
+        with self.assertRaises(AttributeError):
+            estado.id = 2
+
+    def test_lote_por_rango_desde_repositorio(self):
+        estado_registry.invalidate()
+        ids = estado_registry.get_ids()
+        practicantes = [crear_practicante(n) for n in range(1, 4)]
+        for dia, practicante in enumerate(practicantes, start=3):
+            AsistenciaModel.objects.create(practicante=practicante, fecha=date(2025, 11, dia), estado_id=ids[EstadoAsistenciaEnum.TARDANZA])
+        AsistenciaModel.objects.create(practicante=practicantes[0], fecha=date(2025, 11, 4), estado_id=ids[EstadoAsistenciaEnum.PRESENTE])
+
+        with self.assertNumQueries(1):
+            lote = DjangoAsistenciaRepository().get_batch_by_rango(date(2025, 11, 4), date(2025, 11, 5))
+        self.assertEqual(len(lote), 3)
+        self.assertEqual(lote.practicantes_con_estado(EstadoAsistenciaEnum.TARDANZA), [practicantes[1].id, practicantes[2].id])
+        self.assertEqual(lote.contar_por_estado()[EstadoAsistenciaEnum.PRESENTE], 1)
+        self.assertEqual([a.fecha.day for a in lote], [4, 4, 5])
+
+    def test_lote_ocupa_menos_memoria_por_fila(self):
+        resultados = medir_memoria(2000)
+        self.assertLess(resultados['slots'], resultados['dataclass'])
+        self.assertLess(resultados['batch'], resultados['slots'])
+
+
+class ListarJustificacionesServiceTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.hoy = timezone.now().date()
+        self.inicio_mes = self.hoy.replace(day=1)
+
+    def justificar(self, repo, practicante_id, dias):
+        for dia in range(dias):
+            repo.save_justificacion(Asistencia(
+                practicante_id=practicante_id,
+                fecha=self.inicio_mes + timedelta(days=dia),
+                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+                motivo=f"TKT-{practicante_id}{dia} - Examen"
+            ))
+
+    def test_conteo_de_tickets_en_memoria(self):
+        repo = InMemoryAsistenciaRepository()
+        self.justificar(repo, 1, 2)
+        self.justificar(repo, 2, 3)
+
+        self.assertEqual(repo.count_tickets_by_practicante([1, 2, 3], self.inicio_mes, self.hoy), {1: 2, 2: 3})
+        data = ListarJustificacionesService(repo).execute(self.inicio_mes, self.inicio_mes + timedelta(days=2))
+        self.assertEqual(sorted((j['practicante_id'], j['tickets_mes']) for j in data), [(1, 2), (1, 2), (2, 3), (2, 3), (2, 3)])
+
+    def test_una_consulta_de_tickets_por_pagina(self):
+        repo = DjangoAsistenciaRepository()
+        practicantes = [crear_practicante(n) for n in range(1, 11)]
+        for practicante in practicantes:
+            self.justificar(repo, practicante.id, 2)
+        estado_registry.get_ids()
+
+        # justificaciones + tickets agrupados, sin importar el número de filas
+        with self.assertNumQueries(2):
+            data = ListarJustificacionesService(repo).execute(self.inicio_mes, self.inicio_mes + timedelta(days=1))
+        self.assertEqual(len(data), 20)
+        self.assertTrue(all(j['tickets_mes'] == 2 for j in data))
+
+
+class DuracionRecuperacionTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        justificado_id = estado_registry.get_id(EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO)
+        self.practicantes = [crear_practicante(n) for n in range(1, 3)]
+        self.asistencias = [
+            AsistenciaModel.objects.create(practicante=p, fecha=date(2025, 11, 3), estado_id=justificado_id)
+            for p in self.practicantes
+        ]
+
+    def crear_recuperacion(self, asistencia, dia, entrada, salida, estado='Pendiente'):
+        return AsistenciaRecuperacionModel.objects.create(
+            asistencia=asistencia,
+            fecha_recuperacion=date(2025, 11, dia),
+            hora_entrada=entrada,
+            hora_salida=salida,
+            estado=estado
+        )
+
+    def test_duracion_se_guarda_y_actualiza(self):
+        recuperacion = self.crear_recuperacion(self.asistencias[0], 8, time(9, 0), time(11, 30))
+        self.assertEqual(recuperacion.duracion_minutos, 150)
+        recuperacion.hora_salida = time(8, 0)
+        recuperacion.save(update_fields=['hora_salida'])
+        recuperacion.refresh_from_db()
+        self.assertEqual(recuperacion.duracion_minutos, 0)
+        self.assertEqual(self.crear_recuperacion(self.asistencias[1], 8, time(6, 0), time(23, 0)).duracion_minutos, 720)
+
+    def test_totales_en_una_consulta_agregada(self):
+        self.crear_recuperacion(self.asistencias[0], 8, time(9, 0), time(11, 0), 'Completado')
+        self.crear_recuperacion(self.asistencias[0], 9, time(9, 0), time(10, 15))
+        self.crear_recuperacion(self.asistencias[1], 9, time(14, 0), time(15, 0), 'Completado')
+        self.crear_recuperacion(self.asistencias[1], 20, time(14, 0), time(15, 0))
+        repo = DjangoAsistenciaRecuperacionRepository()
+        with self.assertNumQueries(1):
+            por_practicante = repo.get_minutos_por_practicante(date(2025, 11, 3), date(2025, 11, 9))
+        self.assertEqual(por_practicante, {self.practicantes[0].id: 195, self.practicantes[1].id: 60})
+        with self.assertNumQueries(1):
+            por_estado = repo.get_minutos_por_estado(date(2025, 11, 3), date(2025, 11, 9))
+        self.assertEqual(por_estado, {EstadoRecuperacionEnum.COMPLETADO: 180, EstadoRecuperacionEnum.PENDIENTE: 75})
+        self.assertEqual(repo.get_all()[0].calcular_horas_completadas(), 1.0)
+
+    def test_vista_usa_duracion_guardada(self):
+        recuperacion = self.crear_recuperacion(self.asistencias[0], 8, time(9, 0), time(12, 0))
+        AsistenciaRecuperacionModel.objects.filter(id=recuperacion.id).update(duracion_minutos=150)
+        data = self.client.get('/api/puntualidad/recuperaciones/').json()
+        self.assertEqual(data[0]['horasCompletadas'], 2)
+
+
+@override_settings(CHANNEL_LAYERS=CAPA_EN_MEMORIA)
+class TiempoRealTest(TestCase):
+
+    def setUp(self):
+        estado_registry.invalidate()
+        self.ids = estado_registry.get_ids()
+        self.practicante = crear_practicante(1)
+        self.hoy = timezone.now().date()
+        self.channel_layer = get_channel_layer()
+        self.canal = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(GRUPO_PUNTUALIDAD, self.canal)
+
+    def recibir_eventos(self, cantidad):
+        return [async_to_sync(self.channel_layer.receive)(self.canal)['message'] for _ in range(cantidad)]
+
+    def test_escritura_emite_diferencias_al_confirmar(self):
+        repo = DjangoAsistenciaRepository()
+        repo.get_resumen_fecha(self.hoy, resumen_diario.DIAS_SEMANA[self.hoy.weekday()])
+        with self.captureOnCommitCallbacks(execute=True):
+            asistencia = repo.save(Asistencia(
+                practicante_id=self.practicante.id,
+                fecha=self.hoy,
+                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO,
+                motivo='TKT-7 - Cita médica'
+            ))
+        eventos = {evento['tipo']: evento for evento in self.recibir_eventos(3)}
+
+        self.assertEqual(eventos['asistencia_changed']['asistencias'][0]['id'], asistencia.id)
+        self.assertEqual(eventos['justificacion_changed']['justificaciones'][0]['ticket_id'], 'TKT-7')
+        self.assertEqual(eventos['justificacion_changed']['justificaciones'][0]['estado'], 'pendiente')
+        self.assertEqual(eventos['resumen_delta'], {
+            'tipo': 'resumen_delta', 'fecha': self.hoy.isoformat(), 'cambios': {'ausentes_justificados': 1}
+        })
+
+    def test_carga_masiva_emite_un_solo_evento(self):
+        otro = crear_practicante(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            DjangoAsistenciaRepository().save_many([
+                Asistencia(practicante_id=p.id, fecha=self.hoy, estado=EstadoAsistenciaEnum.PRESENTE)
+                for p in (self.practicante, otro)
+            ])
+        eventos = self.recibir_eventos(2)
+        self.assertEqual(sorted(e['tipo'] for e in eventos), ['asistencia_changed', 'resumen_delta'])
+        cambio = next(e for e in eventos if e['tipo'] == 'asistencia_changed')
+        self.assertEqual(len(cambio['asistencias']), 2)
+
+    async def test_consumidor_envia_snapshot_y_eventos(self):
+        comunicador = WebsocketCommunicator(
+            URLRouter(puntualidad_routing.websocket_urlpatterns), '/ws/puntualidad/'
+        )
+        conectado, _ = await comunicador.connect()
+        self.assertTrue(conectado)
+        snapshot = await comunicador.receive_json_from()
+        self.assertEqual(snapshot['tipo'], 'snapshot')
+        self.assertIn('asistencias', snapshot['resumen'])
+
+        await self.channel_layer.group_send(GRUPO_PUNTUALIDAD, {
+            'type': 'puntualidad_evento',
+            'message': {'tipo': 'resumen_delta', 'fecha': self.hoy.isoformat(), 'cambios': {'presentes': 1}}
+        })
+        self.assertEqual((await comunicador.receive_json_from())['cambios'], {'presentes': 1})
+        await comunicador.disconnect()
+
+
+class PlanesDeConsultaTest(TestCase):
+    """
+    Ejecuta EXPLAIN sobre cada consulta de los caminos críticos y falla si alguna
+    recorre completa una tabla que crece con el tiempo
+    """
+    TABLAS_CRITICAS = {'asistencia', 'ticket_quota', 'asistencia_recuperacion'}
+
+    def setUp(self):
+        estado_registry.invalidate()
+        estado_registry.get_ids()
+        self.practicante = crear_practicante(1)
+        self.hoy = timezone.now().date()
+
+    def escaneos_completos(self, sql):
+        """Tablas recorridas completas según el plan del motor actual"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                return {
+                    m.group(1) for *_, detalle in cursor.fetchall()
+                    if (m := re.match(r'SCAN (\w+)$', detalle))
+                }
+            if connection.vendor == 'postgresql':
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}")
+                return {m.group(1) for (linea,) in cursor.fetchall() if (m := re.search(r'Seq Scan on (\w+)', linea))}
+            if connection.vendor == 'mysql':
+                cursor.execute(f"EXPLAIN {sql}")
+                columnas = [c[0] for c in cursor.description]
+                return {fila['table'] for fila in (dict(zip(columnas, f)) for f in cursor.fetchall()) if fila['type'] == 'ALL'}
+        raise SkipTest(f"EXPLAIN no soportado para {connection.vendor}")
+
+    def assertSinEscaneosCompletos(self, consultas):
+        # Un camino que deja de consultar no debe pasar la prueba sin revisar nada
+        self.assertTrue(consultas.captured_queries, "No se capturó ninguna consulta")
+        for consulta in consultas:
+            # SAVEPOINT/RELEASE y demás sentencias de control no tienen plan
+            if not re.match(r'\s*(SELECT|UPDATE|DELETE|INSERT)\b', consulta['sql'], re.IGNORECASE):
+                continue
+            tablas = self.escaneos_completos(consulta['sql']) & self.TABLAS_CRITICAS
+            self.assertFalse(tablas, f"Escaneo completo de {tablas} en: {consulta['sql']}")
+
+    def test_consultas_del_repositorio_usan_indices(self):
+        repo = DjangoAsistenciaRepository()
+        rango = (self.hoy.replace(day=1), self.hoy)
+        with CaptureQueriesContext(connection) as consultas:
+            repo.get_by_fecha(self.hoy)
+            repo.get_by_practicante_and_fecha(self.practicante.id, self.hoy)
+            repo.get_by_practicante_and_rango(self.practicante.id, *rango)
+            repo.get_batch_by_rango(*rango)
+            repo.get_justificadas(*rango)
+            repo.get_justificadas_paginadas(None, None, 50)
+            repo.get_justificadas_paginadas(*rango, 50, cursor=(self.hoy, 10))
+            repo.count_by_estado_and_fecha(EstadoAsistenciaEnum.TARDANZA, self.hoy)
+            repo.counts_by_estado_for_fecha(self.hoy)
+            repo.get_horas_por_practicante(*rango)
+            repo.count_tickets_mes(self.practicante.id, *rango)
+            repo.count_tickets_by_practicante([self.practicante.id], *rango)
+            resumen_diario.calcular_resumen(self.hoy)
+            DjangoAsistenciaRecuperacionRepository().get_all()
+        self.assertGreaterEqual(len(consultas), 14)
+        self.assertSinEscaneosCompletos(consultas)
+
+    def test_consultas_de_las_vistas_usan_indices(self):
+        for url in ['alertas/', 'justificaciones/', 'justificaciones/?estado=vencido', 'recuperaciones/']:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as consultas:
+                    response = self.client.get(f'/api/puntualidad/{url}')
+                self.assertEqual(response.status_code, 200)
+                self.assertSinEscaneosCompletos(consultas)
+
+    def test_escrituras_usan_indices(self):
+        repo = DjangoAsistenciaRepository()
+        inicio_mes = self.hoy.replace(day=1)
+        with CaptureQueriesContext(connection) as consultas:
+            presente = repo.save(Asistencia(
+                practicante_id=self.practicante.id, fecha=inicio_mes,
+                estado=EstadoAsistenciaEnum.PRESENTE, hora_entrada=time(8, 0)
+            ))
+            repo.save_many([Asistencia(
+                practicante_id=self.practicante.id, fecha=inicio_mes,
+                estado=EstadoAsistenciaEnum.TARDANZA, hora_entrada=time(8, 30)
+            )])
+            justificada, _ = repo.save_justificacion(Asistencia(
+                practicante_id=self.practicante.id, fecha=inicio_mes + timedelta(days=1),
+                estado=EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, motivo='TKT-9 - Examen'
+            ))
+            repo.aprobar_justificaciones([justificada.id], time(9, 0))
+            repo.rechazar_justificaciones([justificada.id], 'Sin evidencia')
+            DjangoAsistenciaRecuperacionRepository().save(AsistenciaRecuperacion(
+                asistencia_id=presente.id, fecha_recuperacion=self.hoy
+            ))
+            AsistenciaModel.objects.filter(id=justificada.id).delete()
+        self.assertSinEscaneosCompletos(consultas)
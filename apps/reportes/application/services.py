@@ -1,25 +1,16 @@
 # app/application/services.py
 
-from datetime import datetime, date
-import os
+from asgiref.sync import sync_to_async
+from django.db import OperationalError
 
+from apps.puntualidad.domain.entities import calcular_duracion_minutos
+from apps.reportes.domain.repositories import IReporteRepository
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-pool = None
+COLUMNAS_DETALLE_EXCEL = ["Fecha", "Practicante", "Estado", "Entrada", "Salida", "Horas", "Motivo"]
 
-
-# =========================================================
-# 🔧 HELPER: INTENTAR CONECTAR / FALLBACK SI NO HAY BD
-# =========================================================
-async def get_pool():
-    global pool
-    if pool is None:
-        try:
-            pool = await asyncpg.create_pool(DATABASE_URL)
-        except Exception:
-            pool = None
-    return pool
+# Cada cuántas filas de detalle se informa el avance de una exportación
+FILAS_POR_AVANCE = 1000
 
 
 def no_db(data):
@@ -32,190 +23,150 @@ def no_db(data):
     }
 
 
-# =========================================================
-# 📌 DASHBOARD
-# =========================================================
-async def get_dashboard_summary():
+async def _o_fallback(consulta, fallback):
+    # Sin tablas (migraciones pendientes) se responde el valor por defecto
     try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception("NO BD")
+        return await consulta
+    except OperationalError:
+        return fallback
 
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow("""
-                SELECT COALESCE(SUM(EXTRACT(EPOCH FROM (hora_salida - hora_entrada))/3600), 0)::float AS total_horas
-                FROM asistencia
-                WHERE fecha >= date_trunc('week', CURRENT_DATE - interval '1 week')
-                  AND hora_salida IS NOT NULL 
-                  AND hora_entrada IS NOT NULL
-            """)
 
-        total_horas = round(row['total_horas'], 1)
+class ReportesService:
+    """Casos de uso de reportes; los datos vienen de cualquier IReporteRepository"""
 
-        return {
-            "total_horas": total_horas,
-            "meta_semanal": 240,
-            "cumplimiento_porcentaje": round((total_horas / 240) * 100, 1),
-            "horas_faltantes": round(240 - total_horas, 1)
-        }
+    def __init__(self, reporte_repository: IReporteRepository):
+        self.reporte_repository = reporte_repository
+
+    # =========================================================
+    # 📌 DASHBOARD
+    # =========================================================
+    async def get_dashboard_summary(self):
+        resumen = await self.get_resumen_global_horas()
+        if "detail" in resumen:
+            resumen = resumen["data"]
 
-    except:
-        # Fallback válido para el serializer
+        total_horas = resumen["total_horas_trabajadas"]
+        meta = resumen["meta_semanal_total"]
         return {
-            "total_horas": 0,
-            "meta_semanal": 240,
-            "cumplimiento_porcentaje": 0,
-            "horas_faltantes": 240
+            "total_horas": total_horas,
+            "meta_semanal": meta,
+            "cumplimiento_porcentaje": resumen["porcentaje_cumplimiento"],
+            "horas_faltantes": round(max(meta - total_horas, 0), 1)
         }
 
-
-
-# =========================================================
-# 📌 ADVERTENCIAS DEL MES
-# =========================================================
-async def get_advertencias_mes_actual():
-    try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception("NO BD")
-
-        async with pool.acquire() as conn:
-            rows = await conn.fetch("""
-                SELECT 
-                    p.nombre, 
-                    p.apellido,
-                    COUNT(a.id) AS advertencias
-                FROM practicante p
-                LEFT JOIN asistencia a ON a.practicante_id = p.id
-                WHERE EXTRACT(MONTH FROM COALESCE(a.fecha, CURRENT_DATE)) = EXTRACT(MONTH FROM CURRENT_DATE)
-                  AND EXTRACT(YEAR FROM COALESCE(a.fecha, CURRENT_DATE)) = EXTRACT(YEAR FROM CURRENT_DATE)
-                  AND a.estado_id IN (
-                        SELECT id FROM estado_asistencia 
-                        WHERE lower(estado) LIKE '%falta%' 
-                           OR lower(estado) LIKE '%injustificada%'
-                           OR lower(estado) LIKE '%ausente%'
-                  )
-                GROUP BY p.id, p.nombre, p.apellido
-                HAVING COUNT(a.id) > 0
-                ORDER BY advertencias DESC
-            """)
-
-        return [
-            {
-                "practicante": {"nombre": r["nombre"], "apellido": r["apellido"]},
-                "cantidad_advertencias": r["advertencias"]
-            }
-            for r in rows
+    async def get_resumen_global_horas(self):
+        return await _o_fallback(
+            self.reporte_repository.get_resumen_global_horas(),
+            no_db({
+                "total_horas_trabajadas": 0,
+                "meta_semanal_total": 0,
+                "porcentaje_cumplimiento": 0,
+                "practicantes_cumpliendo": 0,
+                "practicantes_criticos": 0,
+                "total_practicantes": 0
+            })
+        )
+
+    # =========================================================
+    # 📌 ADVERTENCIAS
+    # =========================================================
+    async def get_advertencias_mes_actual(self):
+        return await _o_fallback(self.reporte_repository.get_advertencias_mes_actual(), no_db([]))
+
+    async def get_historial_advertencias(self, page: int = 1, size: int = 20):
+        return await _o_fallback(self.reporte_repository.get_historial_advertencias(page, size), no_db([]))
+
+    # =========================================================
+    # 📌 HORAS Y PERMISOS
+    # =========================================================
+    async def get_detalle_cumplimiento_horas(self):
+        return await _o_fallback(self.reporte_repository.get_cumplimiento_semanal_detalle(), no_db([]))
+
+    async def get_permisos_semana_actual(self):
+        return await _o_fallback(self.reporte_repository.get_permisos_semana_actual(), no_db([]))
+
+    async def get_resumen_permisos_practicante(self):
+        return await _o_fallback(self.reporte_repository.get_resumen_permisos_por_practicante(), no_db([]))
+
+    # =========================================================
+    # 📌 REPORTES EXCEL
+    # Libros write_only: cada fila se vuelca a disco al agregarse y el
+    # detalle diario se lee por lotes, así la memoria no crece con el reporte
+    # =========================================================
+    async def generar_reporte_semanal_excel(self, destino, al_avanzar=None):
+        summary = await self.get_dashboard_summary()
+        detalle = await _o_fallback(self.reporte_repository.generar_datos_reporte_semanal(), [])
+        resumen = [
+            ["INDICADOR", "VALOR"],
+            ["Horas trabajadas esta semana", summary["total_horas"]],
+            ["Meta semanal", summary["meta_semanal"]],
+            ["% de cumplimiento", f"{summary['cumplimiento_porcentaje']}%"],
+            ["Horas faltantes", summary["horas_faltantes"]],
+            [],
+            ["Practicante", "Horas semanales", "Proyección mensual", "% de meta", "Estado"],
+            *(
+                [
+                    _nombre(fila["practicante"]),
+                    fila["horas_semanales"],
+                    fila["proyeccion_mensual"],
+                    fila["porcentaje_meta"],
+                    fila["estado"]
+                ]
+                for fila in detalle
+            )
         ]
-
-    except:
-        return no_db([
-            {
-                "practicante": {"nombre": "Sin datos", "apellido": ""},
-                "cantidad_advertencias": 0
-            }
-        ])
-
-
-# =========================================================
-# 📌 OTROS SERVICIOS (con fallback)
-# =========================================================
-async def get_detalle_cumplimiento_horas():
-    try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception()
-
-        # luego lo implementas real
-        return []
-
-    except:
-        return no_db([])
-
-
-async def get_resumen_global_horas():
-    summary = await get_dashboard_summary()
-
-    if "detail" in summary:
-        return no_db({
-            "total_horas_trabajadas": 0,
-            "meta_semanal_total": 240,
-            "porcentaje_cumplimiento": 0,
-            "practicantes_cumpliendo": 0,
-            "practicantes_criticos": 8,
-            "total_practicantes": 8
-        })
-
-    return {
-        "total_horas_trabajadas": summary["total_horas"],
-        "meta_semanal_total": 240,
-        "porcentaje_cumplimiento": summary["cumplimiento_porcentaje"],
-        "practicantes_cumpliendo": 0,
-        "practicantes_criticos": 8,
-        "total_practicantes": 8
-    }
-
-
-async def get_permisos_semana_actual():
-    try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception()
-        return []
-
-    except:
-        return no_db([])
-
-
-async def get_resumen_permisos_practicante():
-    try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception()
-        return []
-
-    except:
-        return no_db([])
-
-
-# =========================================================
-# 📌 REPORTES EXCEL
-# =========================================================
-async def generar_reporte_semanal_excel(buffer):
-    from openpyxl import Workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Reporte Semanal"
-
-    summary = await get_dashboard_summary()
-
-    ws.append(["INDICADOR", "VALOR"])
-    ws.append(["Horas trabajadas esta semana", summary.get("total_horas", 0)])
-    ws.append(["Meta semanal", summary.get("meta_semanal", 240)])
-    ws.append(["% de cumplimiento", f"{summary.get('cumplimiento_porcentaje', 0)}%"])
-    ws.append(["Horas faltantes", summary.get("horas_faltantes", 240)])
-
-    wb.save(buffer)
-
-
-async def generar_reporte_mensual_excel(buffer):
-    from openpyxl import Workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Reporte Mensual"
-
-    ws.append(["Mes", "Total Horas", "Meta Mensual", "Estado"])
-    ws.append([date.today().strftime("%B %Y"), "Sin datos", 960, "Pendiente"])
-
-    wb.save(buffer)
-
-
-async def get_historial_advertencias(page: int = 1, size: int = 20):
-    try:
-        pool = await get_pool()
-        if pool is None:
-            raise Exception()
-        return []
-
-    except:
-        return no_db([])
+        await sync_to_async(self._escribir_excel)(
+            destino, "Reporte Semanal", resumen, self.reporte_repository.get_semana_actual(), al_avanzar
+        )
+
+    async def generar_reporte_mensual_excel(self, destino, al_avanzar=None):
+        inicio, fin = self.reporte_repository.get_mes_actual()
+        filas = await _o_fallback(self.reporte_repository.generar_datos_reporte_mensual(), [])
+        resumen = [
+            [f"Mes: {inicio.strftime('%B %Y')}"],
+            ["Practicante", "Total Horas", "Meta Mensual", "% de meta", "Advertencias", "Estado"],
+            *(
+                [
+                    _nombre(fila["practicante"]),
+                    fila["horas_mensuales"],
+                    fila["meta_mensual"],
+                    fila["porcentaje_meta"],
+                    fila["advertencias"],
+                    fila["estado"]
+                ]
+                for fila in filas
+            )
+        ]
+        await sync_to_async(self._escribir_excel)(destino, "Reporte Mensual", resumen, (inicio, fin), al_avanzar)
+
+    def _escribir_excel(self, destino, titulo, resumen, periodo, al_avanzar=None):
+        """
+        Escribe el resumen y una hoja con una fila por asistencia del periodo en `destino`.
+        `al_avanzar(filas)` recibe las filas de detalle escritas cada FILAS_POR_AVANCE
+        """
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+
+        ws = wb.create_sheet(titulo)
+        for fila in resumen:
+            ws.append(fila)
+
+        ws = wb.create_sheet("Detalle diario")
+        ws.append(COLUMNAS_DETALLE_EXCEL)
+        try:
+            filas = self.reporte_repository.iterar_detalle_asistencias(*periodo)
+            for escritas, (fecha, nombre, apellido, estado, entrada, salida, motivo) in enumerate(filas, 1):
+                ws.append([
+                    fecha, f"{nombre} {apellido}", estado, entrada, salida,
+                    round(calcular_duracion_minutos(entrada, salida) / 60, 2), motivo
+                ])
+                if al_avanzar and escritas % FILAS_POR_AVANCE == 0:
+                    al_avanzar(escritas)
+        except OperationalError:
+            pass
+
+        wb.save(destino)
+
+
+def _nombre(practicante):
+    return f"{practicante['nombre']} {practicante['apellido']}"
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ReportesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.reportes'    # ← ESTO ES CLAVE
\ No newline at end of file
+    name = 'apps.reportes'    # ← ESTO ES CLAVE
+
+    def ready(self):
+        # Registra el modelo de jobs y las señales que invalidan el cache de reportes
+        from .infrastructure import models, cache  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,44 @@
+# apps/reportes/domain/entities.py
+import calendar
+from datetime import date, timedelta
+from enum import Enum
+from typing import Tuple
+
+
+# Horas que cada practicante debe cumplir por semana
+META_SEMANAL_PRACTICANTE = 30
+SEMANAS_POR_MES = 4
+
+# Por debajo de este porcentaje de la meta el practicante queda en estado crítico
+UMBRAL_CRITICO = 50
+
+
+class EstadoCumplimientoEnum(Enum):
+    """Estado de un practicante respecto a su meta de horas"""
+    CUMPLE = "cumple"
+    EN_RIESGO = "en_riesgo"
+    CRITICO = "critico"
+
+
+def semana_de(fecha: date) -> Tuple[date, date]:
+    """Lunes y domingo de la semana que contiene la fecha"""
+    inicio = fecha - timedelta(days=fecha.weekday())
+    return inicio, inicio + timedelta(days=6)
+
+
+def mes_de(fecha: date) -> Tuple[date, date]:
+    """Primer y último día del mes que contiene la fecha"""
+    ultimo = calendar.monthrange(fecha.year, fecha.month)[1]
+    return fecha.replace(day=1), fecha.replace(day=ultimo)
+
+
+def porcentaje_meta(horas: float, meta: float) -> float:
+    return round(horas / meta * 100, 1) if meta else 0.0
+
+
+def estado_cumplimiento(porcentaje: float) -> EstadoCumplimientoEnum:
+    if porcentaje >= 100:
+        return EstadoCumplimientoEnum.CUMPLE
+    if porcentaje >= UMBRAL_CRITICO:
+        return EstadoCumplimientoEnum.EN_RIESGO
+    return EstadoCumplimientoEnum.CRITICO
@@ -1,9 +1,21 @@
 # app/domain/repositories.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 from datetime import date
 
 class IReporteRepository(ABC):
+    """
+    Fuente de datos de los reportes. Los métodos sin fecha usan el periodo
+    actual (semana de lunes a domingo o mes calendario de hoy)
+    """
+
+    @abstractmethod
+    def get_semana_actual(self) -> Tuple[date, date]:
+        pass
+
+    @abstractmethod
+    def get_mes_actual(self) -> Tuple[date, date]:
+        pass
 
     @abstractmethod
     async def get_total_horas_trabajadas_periodo_actual(self) -> float:
@@ -39,4 +51,12 @@ class IReporteRepository(ABC):
 
     @abstractmethod
     async def generar_datos_reporte_mensual(self) -> List[Dict]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def iterar_detalle_asistencias(self, inicio: date, fin: date) -> Iterator[Tuple]:
+        """
+        Filas (fecha, nombre, apellido, estado, hora_entrada, hora_salida, motivo)
+        del rango, leídas por lotes; es síncrono y se consume dentro de un hilo
+        """
+        pass
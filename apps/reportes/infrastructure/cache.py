@@ -0,0 +1,197 @@
+# apps/reportes/infrastructure/cache.py
+import logging
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.practicantes.infrastructure.models import Practicante as PracticanteModel
+from apps.puntualidad.infrastructure.models import (
+    Asistencia as AsistenciaModel,
+    AsistenciaRecuperacion as AsistenciaRecuperacionModel
+)
+from apps.puntualidad.infrastructure.senales import asistencias_escritas_en_lote
+from ..domain.entities import semana_de, mes_de
+from ..domain.repositories import IReporteRepository
+
+logger = logging.getLogger(__name__)
+
+# Alias de settings.CACHES (locmem por defecto; un backend de archivos o compartido
+# hace que las invalidaciones de un proceso valgan para todos)
+ALIAS_CACHE = 'default'
+
+# El periodo vigente se invalida con cada escritura y además vence pronto por si otro
+# proceso escribió (con locmem cada proceso tiene su cache). Los cerrados casi no cambian,
+# pero una corrección tardía en otro proceso solo se ve cuando vencen: un día como máximo
+TTL_PERIODO_VIGENTE = 300
+TTL_PERIODO_CERRADO = 24 * 3600
+
+# Generación que forma parte de cada clave: cambiarla descarta los reportes de todos
+# los periodos sin enumerar sus claves (datos del practicante en reportes ya cerrados)
+CLAVE_GENERACION = 'reportes:generacion'
+
+# Reportes cacheados según el periodo que cubren
+REPORTES_SEMANA = ('total_horas', 'cumplimiento_semanal', 'resumen_global', 'permisos_semana')
+REPORTES_MES = ('advertencias_mes', 'permisos_por_practicante', 'reporte_mensual')
+
+
+def clave_reporte(reporte: str, inicio: date, fin: date, generacion: int) -> str:
+    return f"reportes:{generacion}:{reporte}:{inicio.isoformat()}:{fin.isoformat()}"
+
+
+def generacion_actual() -> int:
+    cache = caches[ALIAS_CACHE]
+    # Si el cache la descartó, la nueva (marca de tiempo) no coincide con ninguna clave vieja
+    cache.add(CLAVE_GENERACION, time.time_ns(), timeout=None)
+    return cache.get(CLAVE_GENERACION)
+
+
+async def _ageneracion_actual() -> int:
+    cache = caches[ALIAS_CACHE]
+    await cache.aadd(CLAVE_GENERACION, time.time_ns(), timeout=None)
+    return await cache.aget(CLAVE_GENERACION)
+
+
+def _claves_fecha(fecha: date, generacion: int) -> List[str]:
+    semana, mes = semana_de(fecha), mes_de(fecha)
+    return (
+        [clave_reporte(reporte, *semana, generacion) for reporte in REPORTES_SEMANA]
+        + [clave_reporte(reporte, *mes, generacion) for reporte in REPORTES_MES]
+    )
+
+
+def _borrar(fechas: Set[date]) -> None:
+    try:
+        generacion = generacion_actual()
+        caches[ALIAS_CACHE].delete_many(sorted({
+            clave for fecha in fechas for clave in _claves_fecha(fecha, generacion)
+        }))
+    except Exception as e:
+        # Un fallo del cache nunca debe hacer fallar una escritura ya confirmada
+        logger.warning(f"No se pudo invalidar el cache de reportes: {str(e)}")
+
+
+def _nueva_generacion() -> None:
+    try:
+        caches[ALIAS_CACHE].set(CLAVE_GENERACION, time.time_ns(), timeout=None)
+    except Exception as e:
+        logger.warning(f"No se pudo invalidar el cache de reportes: {str(e)}")
+
+
+def invalidar_fechas(fechas: Iterable[date]) -> None:
+    """Descarta, al confirmar la transacción, los reportes de la semana y el mes de cada fecha"""
+    fechas = {fecha for fecha in fechas if fecha}
+    if fechas:
+        transaction.on_commit(lambda: _borrar(fechas))
+
+
+def invalidar_todo() -> None:
+    """Descarta, al confirmar la transacción, los reportes de todos los periodos"""
+    transaction.on_commit(_nueva_generacion)
+
+
+class ReporteCacheRepository(IReporteRepository):
+    """
+    Decorador de cualquier IReporteRepository que guarda cada reporte agregado
+    en el cache de Django con la clave (reporte, inicio, fin) de su periodo
+    """
+
+    def __init__(self, repositorio: IReporteRepository):
+        self._repositorio = repositorio
+
+    async def _cacheado(self, reporte: str, periodo: Tuple[date, date], calcular):
+        cache = caches[ALIAS_CACHE]
+        clave = clave_reporte(reporte, *periodo, await _ageneracion_actual())
+        valor = await cache.aget(clave)
+        if valor is None:
+            valor = await calcular()
+            cerrado = periodo[1] < timezone.localdate()
+            await cache.aset(clave, valor, timeout=TTL_PERIODO_CERRADO if cerrado else TTL_PERIODO_VIGENTE)
+        return valor
+
+    def get_semana_actual(self) -> Tuple[date, date]:
+        return self._repositorio.get_semana_actual()
+
+    def get_mes_actual(self) -> Tuple[date, date]:
+        return self._repositorio.get_mes_actual()
+
+    def iterar_detalle_asistencias(self, inicio: date, fin: date) -> Iterator[Tuple]:
+        return self._repositorio.iterar_detalle_asistencias(inicio, fin)
+
+    async def get_total_horas_trabajadas_periodo_actual(self) -> float:
+        return await self._cacheado(
+            'total_horas', self.get_semana_actual(),
+            self._repositorio.get_total_horas_trabajadas_periodo_actual
+        )
+
+    async def get_advertencias_mes_actual(self) -> List[Dict]:
+        return await self._cacheado(
+            'advertencias_mes', self.get_mes_actual(), self._repositorio.get_advertencias_mes_actual
+        )
+
+    async def get_historial_advertencias(self, page: int, size: int) -> List[Dict]:
+        # Histórico completo y paginado: no pertenece a un periodo
+        return await self._repositorio.get_historial_advertencias(page, size)
+
+    async def get_cumplimiento_semanal_detalle(self) -> List[Dict]:
+        return await self._cacheado(
+            'cumplimiento_semanal', self.get_semana_actual(), self._repositorio.get_cumplimiento_semanal_detalle
+        )
+
+    async def get_resumen_global_horas(self) -> Dict:
+        return await self._cacheado(
+            'resumen_global', self.get_semana_actual(), self._repositorio.get_resumen_global_horas
+        )
+
+    async def get_permisos_semana_actual(self) -> List[Dict]:
+        return await self._cacheado(
+            'permisos_semana', self.get_semana_actual(), self._repositorio.get_permisos_semana_actual
+        )
+
+    async def get_resumen_permisos_por_practicante(self) -> List[Dict]:
+        return await self._cacheado(
+            'permisos_por_practicante', self.get_mes_actual(),
+            self._repositorio.get_resumen_permisos_por_practicante
+        )
+
+    async def generar_datos_reporte_semanal(self) -> List[Dict]:
+        # Mismos datos que el detalle de cumplimiento semanal
+        return await self.get_cumplimiento_semanal_detalle()
+
+    async def generar_datos_reporte_mensual(self) -> List[Dict]:
+        return await self._cacheado(
+            'reporte_mensual', self.get_mes_actual(), self._repositorio.generar_datos_reporte_mensual
+        )
+
+
+@receiver(post_save, sender=AsistenciaModel)
+@receiver(post_delete, sender=AsistenciaModel)
+def _invalidar_asistencia(sender, instance, **kwargs):
+    invalidar_fechas([instance.fecha])
+
+
+@receiver(asistencias_escritas_en_lote)
+def _invalidar_asistencias_en_lote(sender, fechas, **kwargs):
+    invalidar_fechas(fechas)
+
+
+@receiver(post_save, sender=AsistenciaRecuperacionModel)
+@receiver(post_delete, sender=AsistenciaRecuperacionModel)
+def _invalidar_recuperacion(sender, instance, **kwargs):
+    fechas = [instance.fecha_recuperacion]
+    # La fecha de la asistencia original solo si ya está cargada (sin consulta extra)
+    if AsistenciaRecuperacionModel.asistencia.is_cached(instance):
+        fechas.append(instance.asistencia.fecha)
+    invalidar_fechas(fechas)
+
+
+@receiver(post_save, sender=PracticanteModel)
+@receiver(post_delete, sender=PracticanteModel)
+def _invalidar_practicante(sender, **kwargs):
+    # Nombre, correo o semestre aparecen en los reportes de cualquier periodo
+    invalidar_todo()
@@ -0,0 +1,274 @@
+# apps/reportes/infrastructure/django_orm_repository.py
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.practicantes.infrastructure.models import Practicante
+from apps.puntualidad.domain.entities import EstadoAsistenciaEnum
+from apps.puntualidad.infrastructure.expresiones import segundos_entre
+from apps.puntualidad.infrastructure.models import Asistencia
+from apps.puntualidad.infrastructure.tiempo_real import estado_justificacion
+from ..domain.entities import (
+    META_SEMANAL_PRACTICANTE,
+    SEMANAS_POR_MES,
+    EstadoCumplimientoEnum,
+    semana_de,
+    mes_de,
+    porcentaje_meta,
+    estado_cumplimiento
+)
+from ..domain.repositories import IReporteRepository
+
+
+# Columnas del practicante que acompañan a cada fila de reporte
+COLUMNAS_PRACTICANTE = ('id', 'nombre', 'apellido', 'correo', 'semestre')
+
+# Columnas de cada fila del detalle diario (orden de iterar_detalle_asistencias)
+COLUMNAS_DETALLE = (
+    'fecha', 'practicante__nombre', 'practicante__apellido', 'estado__estado',
+    'hora_entrada', 'hora_salida', 'motivo'
+)
+
+# Filas por lote al recorrer el detalle (cursor del lado del servidor donde el motor lo soporta)
+TAMANO_LOTE_DETALLE = 2000
+
+# Las advertencias son las faltas sin justificar; las justificadas se reportan como permisos
+ESTADOS_ADVERTENCIA = (EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR.value,)
+
+
+def _segundos(prefijo: str = ''):
+    return segundos_entre(f'{prefijo}hora_entrada', f'{prefijo}hora_salida')
+
+
+def _intervalo_valido(prefijo: str = '') -> Q:
+    """Filas con salida posterior a la entrada (las invertidas no suman horas negativas)"""
+    return Q(**{f'{prefijo}hora_salida__gt': F(f'{prefijo}hora_entrada')})
+
+
+def _horas(segundos: Optional[int]) -> float:
+    return round(segundos / 3600, 1) if segundos else 0.0
+
+
+def _practicante(fila: Dict, prefijo: str = '') -> Dict:
+    return {columna: fila[f'{prefijo}{columna}'] for columna in COLUMNAS_PRACTICANTE}
+
+
+def _q_advertencia(prefijo: str = '') -> Q:
+    return Q(**{f'{prefijo}estado__estado__in': ESTADOS_ADVERTENCIA})
+
+
+def _q_permiso(prefijo: str = '') -> Q:
+    return (
+        Q(**{f'{prefijo}estado__estado': EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO.value})
+        & Q(**{f'{prefijo}motivo__isnull': False})
+        & ~Q(**{f'{prefijo}motivo': ''})
+    )
+
+
+class DjangoReporteRepository(IReporteRepository):
+    """
+    Implementación con el ORM de Django: cada reporte es una sola consulta
+    agregada; las horas se calculan con segundos_entre, igual que en puntualidad
+    """
+
+    def __init__(self, hoy: Optional[date] = None):
+        # Fecha de referencia fija (pruebas y reportes de periodos cerrados)
+        self._hoy = hoy
+
+    def _fecha_referencia(self) -> date:
+        return self._hoy or timezone.localdate()
+
+    def get_semana_actual(self) -> Tuple[date, date]:
+        return semana_de(self._fecha_referencia())
+
+    def get_mes_actual(self) -> Tuple[date, date]:
+        return mes_de(self._fecha_referencia())
+
+    def iterar_detalle_asistencias(self, inicio: date, fin: date) -> Iterator[Tuple]:
+        return Asistencia.objects.filter(fecha__range=(inicio, fin)).values_list(
+            *COLUMNAS_DETALLE
+        ).order_by('fecha', 'practicante__apellido', 'practicante__nombre', 'id').iterator(
+            chunk_size=TAMANO_LOTE_DETALLE
+        )
+
+    # ------------------------------------------------------------------
+    # Consultas síncronas (una por reporte)
+    # ------------------------------------------------------------------
+
+    def _total_horas(self, inicio: date, fin: date) -> float:
+        total = Asistencia.objects.filter(
+            _intervalo_valido(),
+            fecha__range=(inicio, fin)
+        ).aggregate(total=Sum(_segundos()))['total']
+        return _horas(total)
+
+    def _cumplimiento(self, inicio: date, fin: date, meta: float) -> List[Dict]:
+        # Solo practicantes activos: los inactivos no suman a la meta ni aparecen con 0 h
+        filas = Practicante.objects.filter(estado='activo').annotate(
+            segundos=Sum(
+                _segundos('asistencias__'),
+                filter=Q(asistencias__fecha__range=(inicio, fin)) & _intervalo_valido('asistencias__')
+            ),
+            advertencias=Count(
+                'asistencias',
+                filter=Q(asistencias__fecha__range=(inicio, fin)) & _q_advertencia('asistencias__')
+            )
+        ).values(*COLUMNAS_PRACTICANTE, 'segundos', 'advertencias').order_by('apellido', 'nombre', 'id')
+
+        resultado = []
+        for fila in filas:
+            horas = _horas(fila['segundos'])
+            porcentaje = porcentaje_meta(horas, meta)
+            resultado.append({
+                "practicante": _practicante(fila),
+                "horas": horas,
+                "meta": meta,
+                "porcentaje_meta": porcentaje,
+                "advertencias": fila['advertencias'],
+                "estado": estado_cumplimiento(porcentaje).value
+            })
+        return resultado
+
+    def _cumplimiento_semanal(self) -> List[Dict]:
+        return [
+            {
+                "practicante": fila["practicante"],
+                "horas_semanales": fila["horas"],
+                "proyeccion_mensual": round(fila["horas"] * SEMANAS_POR_MES, 1),
+                "porcentaje_meta": fila["porcentaje_meta"],
+                "estado": fila["estado"]
+            }
+            for fila in self._cumplimiento(*self.get_semana_actual(), META_SEMANAL_PRACTICANTE)
+        ]
+
+    def _resumen_global(self) -> Dict:
+        detalle = self._cumplimiento_semanal()
+        total_horas = round(sum(fila["horas_semanales"] for fila in detalle), 1)
+        meta_total = META_SEMANAL_PRACTICANTE * len(detalle)
+        return {
+            "total_horas_trabajadas": total_horas,
+            "meta_semanal_total": meta_total,
+            "porcentaje_cumplimiento": porcentaje_meta(total_horas, meta_total),
+            "practicantes_cumpliendo": sum(
+                fila["estado"] == EstadoCumplimientoEnum.CUMPLE.value for fila in detalle
+            ),
+            "practicantes_criticos": sum(
+                fila["estado"] == EstadoCumplimientoEnum.CRITICO.value for fila in detalle
+            ),
+            "total_practicantes": len(detalle)
+        }
+
+    def _advertencias_mes(self) -> List[Dict]:
+        inicio, fin = self.get_mes_actual()
+        filas = Practicante.objects.filter(
+            _q_advertencia('asistencias__'),
+            asistencias__fecha__range=(inicio, fin)
+        ).annotate(
+            advertencias=Count('asistencias')
+        ).values(*COLUMNAS_PRACTICANTE, 'advertencias').order_by('-advertencias', 'apellido', 'nombre', 'id')
+        return [
+            {"practicante": _practicante(fila), "cantidad_advertencias": fila['advertencias']}
+            for fila in filas
+        ]
+
+    def _historial_advertencias(self, page: int, size: int) -> List[Dict]:
+        desde = (max(page, 1) - 1) * size
+        filas = Asistencia.objects.filter(_q_advertencia()).values(
+            'fecha', 'motivo', 'estado__estado',
+            *(f'practicante__{columna}' for columna in COLUMNAS_PRACTICANTE)
+        ).order_by('-fecha', '-id')[desde:desde + size]
+        return [
+            {
+                "practicante": _practicante(fila, 'practicante__'),
+                "fecha": fila['fecha'].isoformat(),
+                "motivo": fila['motivo'],
+                "tipo": fila['estado__estado']
+            }
+            for fila in filas
+        ]
+
+    def _permisos_semana(self) -> List[Dict]:
+        inicio, fin = self.get_semana_actual()
+        filas = Asistencia.objects.filter(_q_permiso(), fecha__range=(inicio, fin)).values(
+            'id', 'fecha', 'motivo', 'hora_entrada', 'hora_salida',
+            *(f'practicante__{columna}' for columna in COLUMNAS_PRACTICANTE)
+        ).order_by('-fecha', '-id')
+        return [
+            {
+                "id": fila['id'],
+                "practicante": _practicante(fila, 'practicante__'),
+                "fecha_solicitud": fila['fecha'].isoformat(),
+                "motivo": fila['motivo'],
+                "estado": estado_justificacion(fila['hora_entrada'], fila['hora_salida'], fila['fecha'])
+            }
+            for fila in filas
+        ]
+
+    def _permisos_por_practicante(self) -> List[Dict]:
+        inicio, fin = self.get_mes_actual()
+        del_mes = _q_permiso('asistencias__') & Q(asistencias__fecha__range=(inicio, fin))
+        filas = Practicante.objects.filter(estado='activo').annotate(
+            total_solicitados=Count('asistencias', filter=del_mes),
+            aprobados=Count(
+                'asistencias',
+                filter=del_mes & Q(asistencias__hora_entrada__isnull=False, asistencias__hora_salida__isnull=False)
+            )
+        ).filter(total_solicitados__gt=0).values(
+            *COLUMNAS_PRACTICANTE, 'total_solicitados', 'aprobados'
+        ).order_by('-total_solicitados', 'apellido', 'nombre', 'id')
+        return [
+            {
+                "practicante": _practicante(fila),
+                "aprobados": fila['aprobados'],
+                "total_solicitados": fila['total_solicitados']
+            }
+            for fila in filas
+        ]
+
+    def _datos_reporte_mensual(self) -> List[Dict]:
+        inicio, fin = self.get_mes_actual()
+        return [
+            {
+                "practicante": fila["practicante"],
+                "horas_mensuales": fila["horas"],
+                "meta_mensual": fila["meta"],
+                "porcentaje_meta": fila["porcentaje_meta"],
+                "advertencias": fila["advertencias"],
+                "estado": fila["estado"]
+            }
+            for fila in self._cumplimiento(inicio, fin, META_SEMANAL_PRACTICANTE * SEMANAS_POR_MES)
+        ]
+
+    # ------------------------------------------------------------------
+    # Interfaz asíncrona
+    # ------------------------------------------------------------------
+
+    async def get_total_horas_trabajadas_periodo_actual(self) -> float:
+        return await sync_to_async(self._total_horas)(*self.get_semana_actual())
+
+    async def get_advertencias_mes_actual(self) -> List[Dict]:
+        return await sync_to_async(self._advertencias_mes)()
+
+    async def get_historial_advertencias(self, page: int, size: int) -> List[Dict]:
+        return await sync_to_async(self._historial_advertencias)(page, size)
+
+    async def get_cumplimiento_semanal_detalle(self) -> List[Dict]:
+        return await sync_to_async(self._cumplimiento_semanal)()
+
+    async def get_resumen_global_horas(self) -> Dict:
+        return await sync_to_async(self._resumen_global)()
+
+    async def get_permisos_semana_actual(self) -> List[Dict]:
+        return await sync_to_async(self._permisos_semana)()
+
+    async def get_resumen_permisos_por_practicante(self) -> List[Dict]:
+        return await sync_to_async(self._permisos_por_practicante)()
+
+    async def generar_datos_reporte_semanal(self) -> List[Dict]:
+        return await sync_to_async(self._cumplimiento_semanal)()
+
+    async def generar_datos_reporte_mensual(self) -> List[Dict]:
+        return await sync_to_async(self._datos_reporte_mensual)()
@@ -0,0 +1,146 @@
+# apps/reportes/infrastructure/jobs.py
+import logging
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.puntualidad.infrastructure.models import Asistencia
+from ..application.services import ReportesService
+from ..domain.entities import semana_de, mes_de
+from .cache import ReporteCacheRepository
+from .django_orm_repository import DjangoReporteRepository
+from .models import ReporteJob
+
+logger = logging.getLogger(__name__)
+
+ESTADOS_ACTIVOS = (ReporteJob.Estado.PENDIENTE, ReporteJob.Estado.EN_PROCESO)
+
+# Avance informado al tomar el job y antes de escribir el archivo final
+PROGRESO_INICIO = 5
+PROGRESO_DETALLE_MAX = 95
+
+ERROR_ABANDONADO = "El worker no terminó el reporte dentro del tiempo límite"
+
+
+def periodo_reporte(tipo: str, fecha: date) -> Tuple[date, date]:
+    return semana_de(fecha) if tipo == ReporteJob.Tipo.SEMANAL else mes_de(fecha)
+
+
+def directorio_reportes() -> Path:
+    return Path(settings.REPORTES_DIR)
+
+
+def ruta_archivo(job: ReporteJob) -> Optional[Path]:
+    return directorio_reportes() / job.archivo if job.archivo else None
+
+
+def marcar_abandonados(**filtros) -> int:
+    """
+    Marca como fallidos los jobs en proceso desde hace más de REPORTES_TIMEOUT_JOB_MINUTOS
+    (su worker se detuvo): dejan de bloquear nuevas solicitudes del mismo periodo
+    """
+    ahora = timezone.now()
+    return ReporteJob.objects.filter(
+        estado=ReporteJob.Estado.EN_PROCESO,
+        iniciado_en__lt=ahora - timedelta(minutes=settings.REPORTES_TIMEOUT_JOB_MINUTOS),
+        **filtros
+    ).update(estado=ReporteJob.Estado.FALLIDO, error=ERROR_ABANDONADO, terminado_en=ahora)
+
+
+def encolar_reporte(tipo: str, fecha: date) -> Tuple[ReporteJob, bool]:
+    """
+    Encola el reporte del periodo que contiene `fecha`. Si ya hay un job
+    pendiente o en proceso (y no abandonado) para el mismo reporte y periodo,
+    retorna ese (creado=False) en lugar de encolar otro
+    """
+    inicio, fin = periodo_reporte(tipo, fecha)
+    activos = ReporteJob.objects.filter(
+        tipo=tipo, periodo_inicio=inicio, periodo_fin=fin, estado__in=ESTADOS_ACTIVOS
+    )
+    try:
+        with transaction.atomic():
+            # Antes de deduplicar, para que la restricción de job activo único no lo cuente
+            marcar_abandonados(tipo=tipo, periodo_inicio=inicio, periodo_fin=fin)
+            existente = activos.select_for_update().first()
+            if existente is not None:
+                return existente, False
+            return ReporteJob.objects.create(tipo=tipo, periodo_inicio=inicio, periodo_fin=fin), True
+    except IntegrityError:
+        # Otra solicitud idéntica creó el job en paralelo
+        return activos.get(), False
+
+
+def tomar_siguiente_job() -> Optional[ReporteJob]:
+    """Marca como en proceso el pendiente más antiguo; el UPDATE condicional evita que dos workers tomen el mismo"""
+    marcar_abandonados()
+    while True:
+        job = ReporteJob.objects.filter(estado=ReporteJob.Estado.PENDIENTE).order_by('creado_en', 'id').first()
+        if job is None:
+            return None
+        ahora = timezone.now()
+        tomado = ReporteJob.objects.filter(id=job.id, estado=ReporteJob.Estado.PENDIENTE).update(
+            estado=ReporteJob.Estado.EN_PROCESO, progreso=PROGRESO_INICIO, iniciado_en=ahora
+        )
+        if tomado:
+            job.estado, job.progreso, job.iniciado_en = ReporteJob.Estado.EN_PROCESO, PROGRESO_INICIO, ahora
+            return job
+
+
+def _actualizar(job: ReporteJob, **valores) -> None:
+    ReporteJob.objects.filter(id=job.id).update(**valores)
+    for campo, valor in valores.items():
+        setattr(job, campo, valor)
+
+
+def procesar_job(job: ReporteJob) -> ReporteJob:
+    """Genera el Excel del job con los mismos generadores que la exportación directa"""
+    service = ReportesService(ReporteCacheRepository(DjangoReporteRepository(hoy=job.periodo_inicio)))
+    generar = (
+        service.generar_reporte_semanal_excel if job.tipo == ReporteJob.Tipo.SEMANAL
+        else service.generar_reporte_mensual_excel
+    )
+    total = Asistencia.objects.filter(fecha__range=(job.periodo_inicio, job.periodo_fin)).count()
+
+    def al_avanzar(filas: int) -> None:
+        progreso = PROGRESO_INICIO + (PROGRESO_DETALLE_MAX - PROGRESO_INICIO) * min(filas, total) // max(total, 1)
+        _actualizar(job, progreso=progreso)
+
+    directorio = directorio_reportes()
+    directorio.mkdir(parents=True, exist_ok=True)
+    nombre = f"reporte_{job.tipo}_{job.periodo_inicio}_{job.periodo_fin}_{job.id}.xlsx"
+    temporal = directorio / f".{nombre}.tmp"
+    try:
+        with open(temporal, 'wb') as archivo:
+            async_to_sync(generar)(archivo, al_avanzar=al_avanzar)
+        # El archivo solo aparece completo: la descarga nunca ve uno a medio escribir
+        os.replace(temporal, directorio / nombre)
+    except Exception as e:
+        logger.error(f"Error al generar el reporte {job.id}: {str(e)}", exc_info=True)
+        temporal.unlink(missing_ok=True)
+        _actualizar(job, estado=ReporteJob.Estado.FALLIDO, error=str(e), terminado_en=timezone.now())
+        return job
+
+    _actualizar(
+        job, estado=ReporteJob.Estado.COMPLETADO, progreso=100, archivo=nombre, terminado_en=timezone.now()
+    )
+    return job
+
+
+def job_to_dict(job: ReporteJob) -> Dict:
+    return {
+        "id": job.id,
+        "tipo": job.tipo,
+        "desde": job.periodo_inicio.isoformat(),
+        "hasta": job.periodo_fin.isoformat(),
+        "estado": job.estado,
+        "progreso": job.progreso,
+        "error": job.error or None,
+        "creado_en": job.creado_en.isoformat(),
+        "terminado_en": job.terminado_en.isoformat() if job.terminado_en else None
+    }
@@ -0,0 +1,47 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ReporteJob(models.Model):
+    """Exportación Excel encolada; la procesa el comando procesar_reportes"""
+    class Tipo(models.TextChoices):
+        SEMANAL = 'semanal', 'Semanal'
+        MENSUAL = 'mensual', 'Mensual'
+
+    class Estado(models.TextChoices):
+        PENDIENTE = 'pendiente', 'Pendiente'
+        EN_PROCESO = 'en_proceso', 'En Proceso'
+        COMPLETADO = 'completado', 'Completado'
+        FALLIDO = 'fallido', 'Fallido'
+
+    tipo = models.CharField(max_length=10, choices=Tipo.choices)
+    periodo_inicio = models.DateField()
+    periodo_fin = models.DateField()
+    estado = models.CharField(max_length=12, choices=Estado.choices, default=Estado.PENDIENTE)
+    progreso = models.PositiveSmallIntegerField(default=0, help_text="Porcentaje de avance (0-100)")
+    archivo = models.CharField(max_length=255, blank=True, help_text="Nombre del archivo dentro de REPORTES_DIR")
+    error = models.TextField(blank=True)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    terminado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "reporte_job"
+        verbose_name = "Reporte en segundo plano"
+        verbose_name_plural = "Reportes en segundo plano"
+        indexes = [
+            # El worker toma el pendiente más antiguo
+            models.Index(fields=['estado', 'creado_en'], name='reporte_job_cola_idx'),
+        ]
+        constraints = [
+            # Un solo job activo por reporte y periodo (MySQL no aplica condiciones:
+            # ahí la deduplicación queda a cargo de encolar_reporte)
+            models.UniqueConstraint(
+                fields=['tipo', 'periodo_inicio', 'periodo_fin'],
+                condition=Q(estado__in=['pendiente', 'en_proceso']),
+                name='reporte_job_activo_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.periodo_inicio} - {self.periodo_fin} ({self.estado})"
@@ -2,6 +2,10 @@
 
 from datetime import date
 
+from rest_framework import serializers
+
+from .models import ReporteJob
+
 def practicante_to_dict(p):
     if p is None:
         return None
@@ -77,3 +81,12 @@ def dashboard_summary_to_dict(item):
         "cumplimiento_porcentaje": item.cumplimiento_porcentaje,
         "horas_faltantes": item.horas_faltantes,
     }
+
+
+class ReporteJobSerializer(serializers.Serializer):
+    """Serializer para encolar una exportación en segundo plano"""
+    tipo = serializers.ChoiceField(choices=ReporteJob.Tipo.choices)
+    fecha = serializers.DateField(
+        required=False,
+        help_text="Cualquier fecha del periodo a reportar; por defecto hoy"
+    )
@@ -1,26 +1,32 @@
 from django.urls import path
 from .views import (
-    DashboardSummaryView,
-    AdvertenciasMesActualView,
-    HistorialAdvertenciasView,
-    PermisosSemanaActualView,
-    ResumenPermisosPracticanteView,
-    ResumenGlobalHorasView,
-    DetalleCumplimientoHorasView,
+    dashboard_summary,
+    advertencias_mes_actual,
+    historial_advertencias,
+    permisos_semana_actual,
+    resumen_permisos_practicante,
+    resumen_global_horas,
+    detalle_cumplimiento_horas,
     export_reporte_semanal,
     export_reporte_mensual,
+    crear_reporte_job,
+    reporte_job,
+    descargar_reporte_job,
 )
 
 app_name = "reportes"
 
 urlpatterns = [
-    path("summary/", DashboardSummaryView.as_view(), name="summary"),
-    path("advertencias/mes/", AdvertenciasMesActualView.as_view(), name="advertencias_mes_actual"),
-    path("advertencias/historico/", HistorialAdvertenciasView.as_view(), name="advertencias_historico"),
-    path("permisos/semana/", PermisosSemanaActualView.as_view(), name="permisos_semana_actual"),
-    path("permisos/practicante/", ResumenPermisosPracticanteView.as_view(), name="permisos_por_practicante"),
-    path("horas/resumen/", ResumenGlobalHorasView.as_view(), name="resumen_global_horas"),
-    path("horas/detalle/", DetalleCumplimientoHorasView.as_view(), name="detalle_cumplimiento_horas"),
+    path("summary/", dashboard_summary, name="summary"),
+    path("advertencias/mes/", advertencias_mes_actual, name="advertencias_mes_actual"),
+    path("advertencias/historico/", historial_advertencias, name="advertencias_historico"),
+    path("permisos/semana/", permisos_semana_actual, name="permisos_semana_actual"),
+    path("permisos/practicante/", resumen_permisos_practicante, name="permisos_por_practicante"),
+    path("horas/resumen/", resumen_global_horas, name="resumen_global_horas"),
+    path("horas/detalle/", detalle_cumplimiento_horas, name="detalle_cumplimiento_horas"),
     path("export/semanal/", export_reporte_semanal, name="export_reporte_semanal"),
     path("export/mensual/", export_reporte_mensual, name="export_reporte_mensual"),
+    path("jobs/", crear_reporte_job, name="crear_reporte_job"),
+    path("jobs/<int:job_id>/", reporte_job, name="reporte_job"),
+    path("jobs/<int:job_id>/download/", descargar_reporte_job, name="descargar_reporte_job"),
 ]
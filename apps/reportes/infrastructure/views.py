@@ -1,99 +1,175 @@
-from rest_framework.views import APIView
+import logging
+import tempfile
+
+from django.http import FileResponse, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.http import HttpResponse
-import asyncio
-from io import BytesIO
-
-from apps.reportes.application.services import (
-    get_dashboard_summary,
-    get_advertencias_mes_actual,
-    get_historial_advertencias,
-    get_detalle_cumplimiento_horas,
-    get_resumen_global_horas,
-    get_permisos_semana_actual,
-    get_resumen_permisos_practicante,
-    generar_reporte_semanal_excel,
-    generar_reporte_mensual_excel,
-)
-
-def run_async(func, *args, **kwargs):
-    return asyncio.run(func(*args, **kwargs))
+
+from apps.reportes.application.services import ReportesService
+from apps.reportes.infrastructure.django_orm_repository import DjangoReporteRepository
+from apps.reportes.infrastructure.cache import ReporteCacheRepository
+from apps.reportes.infrastructure.jobs import encolar_reporte, job_to_dict, ruta_archivo
+from apps.reportes.infrastructure.models import ReporteJob
+from apps.reportes.infrastructure.serializers import ReporteJobSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def get_service() -> ReportesService:
+    # Usa el servicio con el repositorio ORM de Django detrás del cache de reportes
+    return ReportesService(ReporteCacheRepository(DjangoReporteRepository()))
 
 
 # ----------------------------
-#   API JSON (APIView)
+#   API JSON (vistas async nativas)
+#   Corren en el loop del servidor ASGI sin crear un loop por solicitud
 # ----------------------------
 
-class DashboardSummaryView(APIView):
-    def get(self, request):
-        data = run_async(get_dashboard_summary)
-        return Response(data)
+@require_GET
+async def dashboard_summary(request):
+    return JsonResponse(await get_service().get_dashboard_summary(), safe=False)
 
 
-class AdvertenciasMesActualView(APIView):
-    def get(self, request):
-        data = run_async(get_advertencias_mes_actual)
-        return Response(data)
+@require_GET
+async def advertencias_mes_actual(request):
+    return JsonResponse(await get_service().get_advertencias_mes_actual(), safe=False)
 
 
-class HistorialAdvertenciasView(APIView):
-    def get(self, request):
+@require_GET
+async def historial_advertencias(request):
+    try:
         page = int(request.GET.get("page", 1))
         size = int(request.GET.get("size", 20))
-        data = run_async(get_historial_advertencias, page, size)
-        return Response(data)
+    except ValueError:
+        return JsonResponse({"error": "page y size deben ser enteros"}, status=400)
+    return JsonResponse(await get_service().get_historial_advertencias(page, size), safe=False)
 
 
-class DetalleCumplimientoHorasView(APIView):
-    def get(self, request):
-        data = run_async(get_detalle_cumplimiento_horas)
-        return Response(data)
+@require_GET
+async def detalle_cumplimiento_horas(request):
+    return JsonResponse(await get_service().get_detalle_cumplimiento_horas(), safe=False)
 
 
-class ResumenGlobalHorasView(APIView):
-    def get(self, request):
-        data = run_async(get_resumen_global_horas)
-        return Response(data)
+@require_GET
+async def resumen_global_horas(request):
+    return JsonResponse(await get_service().get_resumen_global_horas(), safe=False)
 
 
-class PermisosSemanaActualView(APIView):
-    def get(self, request):
-        data = run_async(get_permisos_semana_actual)
-        return Response(data)
+@require_GET
+async def permisos_semana_actual(request):
+    return JsonResponse(await get_service().get_permisos_semana_actual(), safe=False)
 
 
-class ResumenPermisosPracticanteView(APIView):
-    def get(self, request):
-        data = run_async(get_resumen_permisos_practicante)
-        return Response(data)
+@require_GET
+async def resumen_permisos_practicante(request):
+    return JsonResponse(await get_service().get_resumen_permisos_practicante(), safe=False)
 
 
 # ----------------------------
 #   EXPORTADORES (archivos Excel)
-#   Estos NO deben ser APIView
+#   El libro se escribe en un archivo temporal que pasa a disco al superar
+#   TAMANO_MAX_EXPORTACION_EN_MEMORIA y se envía por bloques con FileResponse
 # ----------------------------
 
-def export_reporte_semanal(request):
-    buffer = BytesIO()
-    run_async(generar_reporte_semanal_excel, buffer)
-    buffer.seek(0)
+TAMANO_MAX_EXPORTACION_EN_MEMORIA = 1024 * 1024
+CONTENT_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-    response = HttpResponse(
-        buffer.read(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response["Content-Disposition"] = 'attachment; filename="Reporte_Semanal.xlsx"'
-    return response
 
+async def _exportar_excel(generar, nombre_archivo):
+    archivo = tempfile.SpooledTemporaryFile(max_size=TAMANO_MAX_EXPORTACION_EN_MEMORIA)
+    try:
+        await generar(archivo)
+    except Exception:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    # FileResponse cierra (y borra) el archivo temporal al terminar de enviarlo
+    return FileResponse(archivo, as_attachment=True, filename=nombre_archivo, content_type=CONTENT_TYPE_XLSX)
+
+
+@require_GET
+async def export_reporte_semanal(request):
+    return await _exportar_excel(get_service().generar_reporte_semanal_excel, "Reporte_Semanal.xlsx")
+
+
+@require_GET
+async def export_reporte_mensual(request):
+    return await _exportar_excel(get_service().generar_reporte_mensual_excel, "Reporte_Mensual.xlsx")
+
+
+# ----------------------------
+#   JOBS (exportaciones en segundo plano, las procesa `manage.py procesar_reportes`)
+# ----------------------------
+
+def _job_con_enlaces(job):
+    datos = job_to_dict(job)
+    datos["estado_url"] = reverse("reportes:reporte_job", args=[job.id])
+    datos["descarga_url"] = (
+        reverse("reportes:descargar_reporte_job", args=[job.id])
+        if job.estado == ReporteJob.Estado.COMPLETADO else None
+    )
+    return datos
+
+
+@api_view(['POST'])
+def crear_reporte_job(request):
+    """
+    Encola un reporte {tipo, fecha?}. Responde 202 con el job nuevo o 200 con
+    el que ya estaba pendiente o en proceso para el mismo reporte y periodo
+    """
+    serializer = ReporteJobSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {"error": "Datos inválidos", "detalles": serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    datos = serializer.validated_data
+    try:
+        job, creado = encolar_reporte(datos['tipo'], datos.get('fecha') or timezone.localdate())
+    except Exception as e:
+        logger.error(f"Error en crear_reporte_job: {str(e)}", exc_info=True)
+        return Response(
+            {"error": "Error al encolar el reporte", "detalle": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    return Response(
+        _job_con_enlaces(job),
+        status=status.HTTP_202_ACCEPTED if creado else status.HTTP_200_OK
+    )
 
-def export_reporte_mensual(request):
-    buffer = BytesIO()
-    run_async(generar_reporte_mensual_excel, buffer)
-    buffer.seek(0)
 
-    response = HttpResponse(
-        buffer.read(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+@require_GET
+async def reporte_job(request, job_id):
+    try:
+        job = await ReporteJob.objects.aget(id=job_id)
+    except ReporteJob.DoesNotExist:
+        return JsonResponse({"error": "Reporte no encontrado"}, status=404)
+    return JsonResponse(_job_con_enlaces(job))
+
+
+@require_GET
+async def descargar_reporte_job(request, job_id):
+    try:
+        job = await ReporteJob.objects.aget(id=job_id)
+    except ReporteJob.DoesNotExist:
+        return JsonResponse({"error": "Reporte no encontrado"}, status=404)
+    if job.estado != ReporteJob.Estado.COMPLETADO:
+        return JsonResponse(
+            {"error": "El reporte aún no está disponible", "estado": job.estado, "progreso": job.progreso},
+            status=409
+        )
+
+    ruta = ruta_archivo(job)
+    if ruta is None or not ruta.exists():
+        return JsonResponse({"error": "El archivo del reporte ya no existe"}, status=410)
+    return FileResponse(
+        open(ruta, 'rb'),
+        as_attachment=True,
+        filename=f"Reporte_{job.tipo.capitalize()}_{job.periodo_inicio}_{job.periodo_fin}.xlsx",
+        content_type=CONTENT_TYPE_XLSX
     )
-    response["Content-Disposition"] = 'attachment; filename="Reporte_Mensual.xlsx"'
-    return response
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reportes.infrastructure.jobs import tomar_siguiente_job, procesar_job
+
+
+class Command(BaseCommand):
+    help = "Worker local de reportes: genera en disco los Excel encolados en /api/reportes/jobs/"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true', help="Procesa los pendientes y termina")
+        parser.add_argument('--intervalo', type=float, default=2.0, help="Segundos entre revisiones de la cola (por defecto 2)")
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo']
+        if intervalo <= 0:
+            raise CommandError("El intervalo debe ser positivo")
+
+        while True:
+            job = tomar_siguiente_job()
+            if job is None:
+                if options['una_vez']:
+                    return
+                time.sleep(intervalo)
+                continue
+
+            procesar_job(job)
+            estilo = self.style.SUCCESS if job.estado == job.Estado.COMPLETADO else self.style.ERROR
+            self.stdout.write(estilo(f"Reporte {job.id} ({job.tipo} {job.periodo_inicio} - {job.periodo_fin}): {job.estado}"))
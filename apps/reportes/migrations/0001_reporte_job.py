@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReporteJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('semanal', 'Semanal'), ('mensual', 'Mensual')], max_length=10)),
+                ('periodo_inicio', models.DateField()),
+                ('periodo_fin', models.DateField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En Proceso'), ('completado', 'Completado'), ('fallido', 'Fallido')], default='pendiente', max_length=12)),
+                ('progreso', models.PositiveSmallIntegerField(default=0, help_text='Porcentaje de avance (0-100)')),
+                ('archivo', models.CharField(blank=True, help_text='Nombre del archivo dentro de REPORTES_DIR', max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('iniciado_en', models.DateTimeField(blank=True, null=True)),
+                ('terminado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Reporte en segundo plano',
+                'verbose_name_plural': 'Reportes en segundo plano',
+                'db_table': 'reporte_job',
+                'indexes': [models.Index(fields=['estado', 'creado_en'], name='reporte_job_cola_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado__in', ['pendiente', 'en_proceso'])), fields=('tipo', 'periodo_inicio', 'periodo_fin'), name='reporte_job_activo_unico')],
+            },
+        ),
+    ]
@@ -1,7 +1,34 @@
+import os
+import tempfile
+import time as time_module
+from datetime import date, time, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient, force_authenticate
-from apps.reportes.infrastructure import views
+from apps.practicantes.infrastructure.models import Practicante
+from apps.puntualidad.domain.entities import EstadoAsistenciaEnum
+from apps.puntualidad.infrastructure.estado_registry import estado_registry
+from apps.puntualidad.infrastructure.django_orm_repository import DjangoAsistenciaRepository
+from apps.puntualidad.infrastructure.models import Asistencia
+from apps.puntualidad.infrastructure.senales import asistencias_escritas_en_lote
+from apps.reportes.application.services import ReportesService
+from apps.reportes.domain.entities import semana_de
+from apps.reportes.infrastructure import views, jobs
+from apps.reportes.infrastructure.models import ReporteJob
+from apps.reportes.infrastructure.cache import (
+    TTL_PERIODO_CERRADO, ReporteCacheRepository, clave_reporte, generacion_actual
+)
+from apps.reportes.infrastructure.django_orm_repository import DjangoReporteRepository
 
 
 class ReportesAPITests(APITestCase):
@@ -54,3 +81,331 @@ class ReportesAPITests(APITestCase):
         url = reverse("reportes:export_reporte_mensual")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class DjangoReporteRepositoryTest(TestCase):
+    # Miércoles: semana del 10 al 16 y mes de noviembre de 2025
+    HOY = date(2025, 11, 12)
+
+    def setUp(self):
+        self.repo = DjangoReporteRepository(hoy=self.HOY)
+        self.ana = self.crear_practicante(1, "Ana")
+        self.beto = self.crear_practicante(2, "Beto")
+        ids = estado_registry.get_ids()
+        self.estados = {estado: ids[estado] for estado in EstadoAsistenciaEnum}
+
+    def crear_practicante(self, numero, nombre, estado='activo'):
+        return Practicante.objects.create(
+            id_discord=5000 + numero, nombre=nombre, apellido=f"Apellido{numero}",
+            correo=f"reporte{numero}@test.com", semestre=2, estado=estado
+        )
+
+    def asistencia(self, practicante, fecha, estado, entrada=None, salida=None, motivo=None):
+        return Asistencia.objects.create(
+            practicante=practicante, fecha=fecha, estado_id=self.estados[estado],
+            hora_entrada=entrada, hora_salida=salida, motivo=motivo
+        )
+
+    def test_horas_semanales_y_cumplimiento_en_una_consulta(self):
+        # 8 h + 7.5 h esta semana; la del lunes anterior queda fuera
+        self.asistencia(self.ana, date(2025, 11, 10), EstadoAsistenciaEnum.PRESENTE, time(8), time(16))
+        self.asistencia(self.ana, date(2025, 11, 11), EstadoAsistenciaEnum.TARDANZA, time(8, 30), time(16))
+        self.asistencia(self.ana, date(2025, 11, 3), EstadoAsistenciaEnum.PRESENTE, time(8), time(18))
+        self.asistencia(self.beto, date(2025, 11, 12), EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        # Salida anterior a la entrada: no resta horas
+        self.asistencia(self.ana, date(2025, 11, 13), EstadoAsistenciaEnum.PRESENTE, time(16), time(8))
+
+        with self.assertNumQueries(1):
+            detalle = self.repo._cumplimiento_semanal()
+        self.assertEqual([fila["practicante"]["nombre"] for fila in detalle], ["Ana", "Beto"])
+        self.assertEqual(detalle[0]["horas_semanales"], 15.5)
+        self.assertEqual(detalle[0]["proyeccion_mensual"], 62.0)
+        self.assertEqual(detalle[0]["estado"], "en_riesgo")
+        self.assertEqual(detalle[1]["horas_semanales"], 0.0)
+        self.assertEqual(detalle[1]["estado"], "critico")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.repo._total_horas(*semana_de(self.HOY)), 15.5)
+        # Mismo cálculo que las horas de puntualidad
+        horas = DjangoAsistenciaRepository().get_horas_por_practicante(*semana_de(self.HOY))
+        self.assertEqual(horas, {self.ana.id: 15.5})
+
+        resumen = async_to_sync(self.repo.get_resumen_global_horas)()
+        self.assertEqual(resumen["total_horas_trabajadas"], 15.5)
+        self.assertEqual(resumen["meta_semanal_total"], 60)
+        self.assertEqual(resumen["practicantes_criticos"], 1)
+        self.assertEqual(resumen["total_practicantes"], 2)
+
+    def test_advertencias_del_mes(self):
+        for dia in (3, 4):
+            self.asistencia(self.beto, date(2025, 11, dia), EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        self.asistencia(self.ana, date(2025, 11, 5), EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        self.asistencia(self.ana, date(2025, 10, 31), EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        self.asistencia(self.ana, date(2025, 11, 6), EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, motivo="Cita")
+
+        with self.assertNumQueries(1):
+            advertencias = self.repo._advertencias_mes()
+        self.assertEqual(
+            [(fila["practicante"]["nombre"], fila["cantidad_advertencias"]) for fila in advertencias],
+            [("Beto", 2), ("Ana", 1)]
+        )
+
+        historial = async_to_sync(self.repo.get_historial_advertencias)(1, 2)
+        self.assertEqual([fila["fecha"] for fila in historial], ["2025-11-05", "2025-11-04"])
+
+    def test_permisos_de_la_semana_y_del_mes(self):
+        self.asistencia(self.ana, date(2025, 11, 11), EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, time(8), time(12), "Cita")
+        self.asistencia(self.ana, date(2025, 11, 4), EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, motivo="Examen")
+        self.asistencia(self.beto, date(2025, 11, 11), EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, motivo="")
+
+        permisos = async_to_sync(self.repo.get_permisos_semana_actual)()
+        self.assertEqual(len(permisos), 1)
+        self.assertEqual(permisos[0]["estado"], "aprobado")
+
+        with self.assertNumQueries(1):
+            resumen = self.repo._permisos_por_practicante()
+        self.assertEqual(resumen, [{
+            "practicante": resumen[0]["practicante"], "aprobados": 1, "total_solicitados": 2
+        }])
+        self.assertEqual(resumen[0]["practicante"]["id"], self.ana.id)
+
+    def test_practicantes_inactivos_no_cuentan(self):
+        carla = self.crear_practicante(3, "Carla", estado='inactivo')
+        self.asistencia(self.ana, date(2025, 11, 10), EstadoAsistenciaEnum.PRESENTE, time(8), time(16))
+        self.asistencia(carla, date(2025, 11, 4), EstadoAsistenciaEnum.AUSENTE_JUSTIFICADO, motivo="Examen")
+
+        detalle = self.repo._cumplimiento_semanal()
+        self.assertEqual([fila["practicante"]["nombre"] for fila in detalle], ["Ana", "Beto"])
+
+        resumen = async_to_sync(self.repo.get_resumen_global_horas)()
+        self.assertEqual(resumen["meta_semanal_total"], 60)
+        self.assertEqual(resumen["total_practicantes"], 2)
+        self.assertEqual(resumen["practicantes_criticos"], 2)
+
+        self.assertEqual(self.repo._permisos_por_practicante(), [])
+
+    def test_servicio_usa_la_interfaz(self):
+        self.asistencia(self.ana, date(2025, 11, 10), EstadoAsistenciaEnum.PRESENTE, time(8), time(14))
+        summary = async_to_sync(ReportesService(self.repo).get_dashboard_summary)()
+        self.assertEqual(summary, {
+            "total_horas": 6.0,
+            "meta_semanal": 60,
+            "cumplimiento_porcentaje": 10.0,
+            "horas_faltantes": 54.0
+        })
+
+    def test_detalle_diario_se_lee_en_una_consulta(self):
+        self.asistencia(self.ana, date(2025, 11, 10), EstadoAsistenciaEnum.PRESENTE, time(8), time(16))
+        self.asistencia(self.beto, date(2025, 11, 10), EstadoAsistenciaEnum.AUSENTE_SIN_JUSTIFICAR)
+        self.asistencia(self.ana, date(2025, 11, 17), EstadoAsistenciaEnum.PRESENTE, time(8), time(16))
+
+        with self.assertNumQueries(1):
+            filas = list(self.repo.iterar_detalle_asistencias(*semana_de(self.HOY)))
+        self.assertEqual(filas, [
+            (date(2025, 11, 10), "Ana", "Apellido1", "Presente", time(8), time(16), None),
+            (date(2025, 11, 10), "Beto", "Apellido2", "Ausente Sin Justificar", None, None, None),
+        ])
+
+
+class ExportacionExcelTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        ids = estado_registry.get_ids()
+        hoy = timezone.localdate()
+        for numero in range(3):
+            practicante = Practicante.objects.create(
+                id_discord=6000 + numero, nombre=f"Nombre{numero}", apellido=f"Apellido{numero}",
+                correo=f"export{numero}@test.com", semestre=1
+            )
+            Asistencia.objects.create(
+                practicante=practicante, fecha=hoy, estado_id=ids[EstadoAsistenciaEnum.PRESENTE],
+                hora_entrada=time(8), hora_salida=time(12, 30)
+            )
+
+    def descargar(self, nombre_url):
+        response = self.client.get(reverse(f"reportes:{nombre_url}"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        return load_workbook(BytesIO(b"".join(response.streaming_content)), read_only=True)
+
+    def test_exportaciones_incluyen_detalle_diario(self):
+        for nombre_url, hoja in (("export_reporte_semanal", "Reporte Semanal"), ("export_reporte_mensual", "Reporte Mensual")):
+            wb = self.descargar(nombre_url)
+            self.assertEqual(wb.sheetnames, [hoja, "Detalle diario"])
+            filas = list(wb["Detalle diario"].iter_rows(values_only=True))
+            self.assertEqual(len(filas), 4)
+            self.assertEqual(filas[1][1], "Nombre0 Apellido0")
+            self.assertEqual(filas[1][5], 4.5)
+            wb.close()
+
+
+# Las escrituras confirmadas emiten eventos de puntualidad: sin Redis, la capa en memoria los recibe
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class ReporteCacheTest(TestCase):
+    HOY = date(2025, 11, 12)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.practicante = Practicante.objects.create(
+            id_discord=7000, nombre="Ana", apellido="Cache", correo="cache@test.com", semestre=1
+        )
+        self.presente_id = estado_registry.get_ids()[EstadoAsistenciaEnum.PRESENTE]
+
+    def repo(self, hoy=HOY):
+        return ReporteCacheRepository(DjangoReporteRepository(hoy=hoy))
+
+    def registrar(self, fecha, salida):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Asistencia.objects.create(
+                practicante=self.practicante, fecha=fecha, estado_id=self.presente_id,
+                hora_entrada=time(8), hora_salida=salida
+            )
+
+    def resumen(self, repo=None):
+        return async_to_sync((repo or self.repo()).get_resumen_global_horas)()
+
+    def test_reporte_cacheado_no_consulta(self):
+        self.registrar(date(2025, 11, 10), time(12))
+        self.assertEqual(self.resumen()["total_horas_trabajadas"], 4.0)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.resumen()["total_horas_trabajadas"], 4.0)
+
+    def test_escritura_en_el_periodo_invalida(self):
+        asistencia = self.registrar(date(2025, 11, 10), time(12))
+        self.resumen()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            asistencia.hora_salida = time(14)
+            asistencia.save()
+        self.assertEqual(self.resumen()["total_horas_trabajadas"], 6.0)
+
+    def test_escritura_fuera_del_periodo_conserva_el_cache(self):
+        self.resumen()
+        self.registrar(date(2025, 11, 17), time(12))
+        with self.assertNumQueries(0):
+            self.resumen()
+
+    def test_escritura_en_lote_invalida(self):
+        self.resumen()
+        clave = clave_reporte('resumen_global', *semana_de(self.HOY), generacion_actual())
+        self.assertIsNotNone(caches['default'].get(clave))
+        with self.captureOnCommitCallbacks(execute=True):
+            asistencias_escritas_en_lote.send(sender=Asistencia, fechas={date(2025, 11, 14)})
+        self.assertIsNone(caches['default'].get(clave))
+
+    def test_periodo_cerrado_vence(self):
+        self.resumen(self.repo(hoy=date(2020, 1, 8)))
+        cache = caches['default']
+        cerrado = cache.make_key(
+            clave_reporte('resumen_global', date(2020, 1, 6), date(2020, 1, 12), generacion_actual())
+        )
+        self.assertAlmostEqual(cache._expire_info[cerrado], time_module.time() + TTL_PERIODO_CERRADO, delta=60)
+
+        with mock.patch('apps.reportes.infrastructure.cache.timezone.localdate', return_value=self.HOY):
+            async_to_sync(self.repo().get_advertencias_mes_actual)()
+        vigente = cache.make_key(
+            clave_reporte('advertencias_mes', date(2025, 11, 1), date(2025, 11, 30), generacion_actual())
+        )
+        self.assertLess(cache._expire_info[vigente], cache._expire_info[cerrado])
+
+    def test_cambio_de_practicante_invalida_todos_los_periodos(self):
+        cerrado = self.repo(hoy=date(2020, 1, 8))
+        self.assertEqual(self.resumen(cerrado)["total_practicantes"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Practicante.objects.create(
+                id_discord=7001, nombre="Beto", apellido="Cache", correo="beto@test.com", semestre=1
+            )
+        self.assertEqual(self.resumen(cerrado)["total_practicantes"], 2)
+
+
+class ReporteJobTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = override_settings(REPORTES_DIR=directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        practicante = Practicante.objects.create(
+            id_discord=8000, nombre="Ana", apellido="Job", correo="job@test.com", semestre=1
+        )
+        presente_id = estado_registry.get_ids()[EstadoAsistenciaEnum.PRESENTE]
+        for dia in (3, 4, 5):
+            Asistencia.objects.create(
+                practicante=practicante, fecha=date(2025, 11, dia), estado_id=presente_id,
+                hora_entrada=time(8), hora_salida=time(12)
+            )
+
+    def encolar(self, tipo="mensual", fecha="2025-11-20"):
+        return self.client.post(
+            reverse("reportes:crear_reporte_job"), {"tipo": tipo, "fecha": fecha}, content_type="application/json"
+        )
+
+    def procesar(self):
+        call_command("procesar_reportes", "--una-vez", stdout=StringIO())
+
+    def test_solicitudes_identicas_comparten_el_job(self):
+        primera = self.encolar()
+        self.assertEqual(primera.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual((primera.json()["desde"], primera.json()["hasta"]), ("2025-11-01", "2025-11-30"))
+
+        repetida = self.encolar(fecha="2025-11-02")
+        self.assertEqual(repetida.status_code, status.HTTP_200_OK)
+        self.assertEqual(repetida.json()["id"], primera.json()["id"])
+
+        self.assertEqual(self.encolar(tipo="semanal").status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(ReporteJob.objects.count(), 2)
+
+    def test_job_abandonado_no_bloquea_nuevas_solicitudes(self):
+        primera = self.encolar().json()["id"]
+        jobs.tomar_siguiente_job()
+        self.assertEqual(self.encolar().json()["id"], primera)
+
+        # El worker se detuvo con el job en proceso más allá del tiempo límite
+        ReporteJob.objects.filter(id=primera).update(
+            iniciado_en=timezone.now() - timedelta(minutes=settings.REPORTES_TIMEOUT_JOB_MINUTOS + 1)
+        )
+        nueva = self.encolar()
+        self.assertEqual(nueva.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(nueva.json()["id"], primera)
+        abandonado = ReporteJob.objects.get(id=primera)
+        self.assertEqual((abandonado.estado, abandonado.error), ("fallido", jobs.ERROR_ABANDONADO))
+
+    def test_worker_genera_el_archivo_y_la_descarga(self):
+        job_id = self.encolar().json()["id"]
+        descarga = reverse("reportes:descargar_reporte_job", args=[job_id])
+        self.assertEqual(self.client.get(descarga).status_code, 409)
+
+        self.procesar()
+
+        estado = self.client.get(reverse("reportes:reporte_job", args=[job_id])).json()
+        self.assertEqual((estado["estado"], estado["progreso"]), ("completado", 100))
+        self.assertEqual(estado["descarga_url"], descarga)
+
+        response = self.client.get(descarga)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        wb = load_workbook(BytesIO(b"".join(response.streaming_content)), read_only=True)
+        self.assertEqual(len(list(wb["Detalle diario"].iter_rows(values_only=True))), 4)
+        wb.close()
+
+        # Terminado el job, una nueva solicitud vuelve a encolar
+        self.assertEqual(self.encolar().status_code, status.HTTP_202_ACCEPTED)
+
+    def test_worker_informa_avance(self):
+        self.encolar()
+        with mock.patch("apps.reportes.application.services.FILAS_POR_AVANCE", 1), \
+                mock.patch.object(jobs, "_actualizar", wraps=jobs._actualizar) as actualizar:
+            self.procesar()
+        avances = [llamada.kwargs["progreso"] for llamada in actualizar.call_args_list]
+        self.assertEqual(avances, [35, 65, 95, 100])
+
+    def test_error_al_generar_marca_el_job_fallido(self):
+        job_id = self.encolar().json()["id"]
+        with mock.patch.object(ReportesService, "generar_reporte_mensual_excel", side_effect=ValueError("sin disco")), \
+                self.assertLogs("apps.reportes.infrastructure.jobs", "ERROR"):
+            self.procesar()
+        job = ReporteJob.objects.get(id=job_id)
+        self.assertEqual((job.estado, job.error), ("fallido", "sin disco"))
+        self.assertEqual(os.listdir(settings.REPORTES_DIR), [])
@@ -1,16 +1,26 @@
 import os
 from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-import apps.bot_discord.infrastructure.routing
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+# Inicializa Django antes de importar consumidores que usan modelos
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+import apps.bot_discord.infrastructure.routing  # noqa: E402
+import apps.puntualidad.infrastructure.routing  # noqa: E402
+from apps.comun.infrastructure.ciclo_de_vida import lifespan  # noqa: E402
+
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(
             apps.bot_discord.infrastructure.routing.websocket_urlpatterns
+            + apps.puntualidad.infrastructure.routing.websocket_urlpatterns
         )
     ),
+    # Cierra las conexiones y el pool de la base de datos al apagar
+    # (servidores con soporte lifespan, p. ej. uvicorn; Daphne las suelta al salir)
+    "lifespan": lifespan,
 })
@@ -41,11 +41,13 @@ INSTALLED_APPS = [
     'rest_framework',
     'channels',
     'corsheaders',
+    'apps.comun',
     'apps.practicantes',
     'apps.bot_discord',
     # Conflicto resuelto: Incluyendo ambas aplicaciones
     'apps.gestion', 
     'apps.puntualidad',
+    'apps.reportes',
 ]
 
 MIDDLEWARE = [
@@ -96,6 +98,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Sin conexiones persistentes: bajo ASGI cada sync_to_async puede correr en otro
+        # hilo, que no reutiliza la conexión y la deja abierta (ticket Django #33497).
+        # Para reutilizar conexiones se usa el pool del motor (PostgreSQL: OPTIONS['pool'])
+        'CONN_MAX_AGE': 0,
+
+        # Configuración para PostgreSQL con pool de conexiones (psycopg[pool]): las
+        # conexiones quedan abiertas y se reutilizan entre solicitudes e hilos, y el
+        # handler lifespan de config/asgi.py cierra el pool al apagar
+        # 'ENGINE': 'django.db.backends.postgresql',
+        # 'NAME': 'bot_asistencia',
+        # 'USER': 'postgres',
+        # 'PASSWORD': 'postgres',
+        # 'HOST': 'localhost',
+        # 'PORT': '5432',
+        # 'OPTIONS': {'pool': {'min_size': 1, 'max_size': 10}},
 
         # Configuración para MySQL
         # 'ENGINE': 'django.db.backends.mysql',
@@ -108,6 +125,22 @@ DATABASES = {
 }
 
 
+# Cache (reportes agregados). Con varios procesos conviene un backend compartido,
+# p. ej. 'django.core.cache.backends.filebased.FileBasedCache' con LOCATION a un directorio
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'reportes',
+    }
+}
+
+# Directorio donde el worker de reportes (procesar_reportes) deja los Excel generados
+REPORTES_DIR = BASE_DIR / 'reportes_generados'
+
+# Minutos que un job puede seguir en proceso antes de darlo por abandonado (worker detenido)
+REPORTES_TIMEOUT_JOB_MINUTOS = 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 